@@ -40,6 +40,22 @@ from tabs.ha_tab import HATab
 from tabs.notifications_tab import NotificationsTab
 from tabs.task_log_tab import TaskLogTab
 from tabs.vm_details_tab import VmDetailsTab
+from tabs.bulk_restore_tab import BulkRestoreTab
+from tabs.backup_retention_tab import BackupRetentionTab
+from tabs.backup_analytics_tab import BackupAnalyticsTab
+from tabs.snapshot_retention_tab import SnapshotRetentionTab
+from tabs.replication_status_tab import ReplicationStatusTab
+from tabs.firewall_sync_tab import FirewallSyncTab
+from tabs.ipset_import_tab import IPSetImportTab
+from tabs.ip_lookup_tab import IPLookupTab
+from tabs.firewall_search_tab import FirewallSearchTab
+from tabs.firewall_log_tab import FirewallLogTab
+from tabs.pool_usage_tab import PoolUsageTab
+from tabs.ha_capacity_tab import HACapacityTab
+from tabs.node_drain_tab import NodeDrainTab
+from tabs.rebalance_tab import RebalanceTab
+from tabs.migration_monitor_tab import MigrationMonitorTab
+from tabs.batch_clone_tab import BatchCloneTab
 
 class ProxmoxGUI(QWidget):
     def __init__(self):
@@ -112,6 +128,23 @@ class ProxmoxGUI(QWidget):
 
         self.vnc_tab = VNCTab(self.proxmox)              # 23
 
+        self.bulk_restore_tab = BulkRestoreTab(self.proxmox)  # 24
+        self.backup_retention_tab = BackupRetentionTab(self.proxmox)  # 25
+        self.backup_analytics_tab = BackupAnalyticsTab(self.proxmox)  # 26
+        self.snapshot_retention_tab = SnapshotRetentionTab(self.proxmox)  # 27
+        self.replication_status_tab = ReplicationStatusTab(self.proxmox)  # 28
+        self.firewall_sync_tab = FirewallSyncTab(self.proxmox)  # 29
+        self.ipset_import_tab = IPSetImportTab(self.proxmox)  # 30
+        self.ip_lookup_tab = IPLookupTab(self.proxmox)  # 31
+        self.firewall_search_tab = FirewallSearchTab(self.proxmox)  # 32
+        self.firewall_log_tab = FirewallLogTab(self.proxmox)  # 33
+        self.pool_usage_tab = PoolUsageTab(self.proxmox)  # 34
+        self.ha_capacity_tab = HACapacityTab(self.proxmox)  # 35
+        self.node_drain_tab = NodeDrainTab(self.proxmox)  # 36
+        self.rebalance_tab = RebalanceTab(self.proxmox)  # 37
+        self.migration_monitor_tab = MigrationMonitorTab(self.proxmox)  # 38
+        self.batch_clone_tab = BatchCloneTab(self.proxmox)  # 39
+
         # Add pages to the stacked widget in a logical order
         self.pages.addWidget(self.vm_tab)          # index 0
         self.pages.addWidget(self.create_vm_tab)   # index 1
@@ -143,6 +176,23 @@ class ProxmoxGUI(QWidget):
 
         self.pages.addWidget(self.vnc_tab)          # index 23
 
+        self.pages.addWidget(self.bulk_restore_tab) # index 24
+        self.pages.addWidget(self.backup_retention_tab) # index 25
+        self.pages.addWidget(self.backup_analytics_tab) # index 26
+        self.pages.addWidget(self.snapshot_retention_tab) # index 27
+        self.pages.addWidget(self.replication_status_tab) # index 28
+        self.pages.addWidget(self.firewall_sync_tab) # index 29
+        self.pages.addWidget(self.ipset_import_tab) # index 30
+        self.pages.addWidget(self.ip_lookup_tab) # index 31
+        self.pages.addWidget(self.firewall_search_tab) # index 32
+        self.pages.addWidget(self.firewall_log_tab) # index 33
+        self.pages.addWidget(self.pool_usage_tab) # index 34
+        self.pages.addWidget(self.ha_capacity_tab) # index 35
+        self.pages.addWidget(self.node_drain_tab) # index 36
+        self.pages.addWidget(self.rebalance_tab) # index 37
+        self.pages.addWidget(self.migration_monitor_tab) # index 38
+        self.pages.addWidget(self.batch_clone_tab) # index 39
+
         # Now let's define categories and sub-items
         # We'll create "header" items for each category that are NOT clickable,
         # then real sub-items for each page.
@@ -152,6 +202,7 @@ class ProxmoxGUI(QWidget):
         # - subitems
         self.add_sidebar_item("VMs", 0)
         self.add_sidebar_item("Create VM", 1)
+        self.add_sidebar_item("Batch Clone", 39)
         self.add_sidebar_item("VM Details (Advanced)", 2)
         self.add_sidebar_item("Monitoring", 3)
         self.add_sidebar_item("Performance", 4)
@@ -161,24 +212,39 @@ class ProxmoxGUI(QWidget):
         self.add_category("==== Storage & Backup ====")
         self.add_sidebar_item("Storage", 6)
         self.add_sidebar_item("Snapshots", 7)
+        self.add_sidebar_item("Snapshot Retention", 27)
         self.add_sidebar_item("Backup", 8)
+        self.add_sidebar_item("Bulk Restore", 24)
+        self.add_sidebar_item("Backup Retention", 25)
+        self.add_sidebar_item("Backup Analytics", 26)
 
         # Category 3: Network & Security
         self.add_category("==== Network & Security ====")
         self.add_sidebar_item("Network", 9)
         self.add_sidebar_item("Firewall (Rules)", 10)
         self.add_sidebar_item("Firewall (IPSet)", 11)
+        self.add_sidebar_item("Firewall (IPSet Import)", 30)
+        self.add_sidebar_item("Firewall (IP Lookup)", 31)
+        self.add_sidebar_item("Firewall (Rule Search)", 32)
+        self.add_sidebar_item("Firewall (Log)", 33)
         self.add_sidebar_item("Firewall (Options)", 12)
+        self.add_sidebar_item("Firewall (Sync)", 29)
 
         # Category 4: Cluster
         self.add_category("==== Cluster ====")
         self.add_sidebar_item("Logs", 13)
         self.add_sidebar_item("Node Summary", 14)
-        self.add_sidebar_item("Scheduler", 15)
+        self.add_sidebar_item("Node Drain", 36)
+        self.add_sidebar_item("Rebalance", 37)
+        self.add_sidebar_item("Migration Monitor", 38)
+        self.add_sidebar_item("Backup Jobs", 15)
         self.add_sidebar_item("Ceph", 16)
         self.add_sidebar_item("Replication", 17)
+        self.add_sidebar_item("Replication Status", 28)
         self.add_sidebar_item("Pools", 18)
+        self.add_sidebar_item("Pool Usage", 34)
         self.add_sidebar_item("HA", 19)
+        self.add_sidebar_item("HA Capacity", 35)
 
         # Category 5: Users & Tools
         self.add_category("==== Users & Tools ====")
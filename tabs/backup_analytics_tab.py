@@ -0,0 +1,150 @@
+# proxmox_manager/tabs/backup_analytics_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox,
+    QSpinBox, QTableWidget, QTableWidgetItem, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.local_store import get_local_store
+from tabs.task_queue import read_task_log
+from tabs.vzdump_stats import parse_vzdump_log, aggregate
+
+GROUP_KEYS = {"VM": "vmid", "Node": "node", "Storage": "storage"}
+
+class BackupAnalyticsTab(QWidget):
+    """
+    Backup throughput and size analytics.
+    Reads the vzdump task logs of the last N days from every node (in
+    parallel, cached locally by UPID) and summarizes duration, transfer rate,
+    size and compression per VM, node or storage.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.store = get_local_store()
+        self.records = []
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Last days:"))
+        self.days_spin = QSpinBox()
+        self.days_spin.setRange(1, 365)
+        self.days_spin.setValue(14)
+        top_layout.addWidget(self.days_spin)
+
+        self.load_btn = QPushButton("Load Backup Logs")
+        self.load_btn.clicked.connect(self.load_logs)
+        top_layout.addWidget(self.load_btn)
+
+        top_layout.addWidget(QLabel("Group by:"))
+        self.group_combo = QComboBox()
+        self.group_combo.addItems(list(GROUP_KEYS))
+        self.group_combo.currentTextChanged.connect(self.show_summary)
+        top_layout.addWidget(self.group_combo)
+        layout.addLayout(top_layout)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(9)
+        self.table.setHorizontalHeaderLabels([
+            "Group", "Backups", "Total Time (min)", "Avg Time (s)", "P95 Time (s)",
+            "Avg Rate (MiB/s)", "Avg Size (GB)", "Compression", "Trend (s/day)"
+        ])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def load_logs(self):
+        """
+        GET /nodes/{node}/tasks?typefilter=vzdump&since=...  (every node, in parallel)
+        GET /nodes/{node}/tasks/{upid}/log                   (only logs not cached yet)
+        """
+        since = int(time.time()) - self.days_spin.value() * 86400
+        try:
+            nodes = self.resources.node_names(online_only=True)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list nodes: {e}")
+            return
+
+        def list_tasks(node):
+            return self.proxmox.nodes(node).tasks.get(typefilter='vzdump', since=since, source='all', limit=10000)
+
+        tasks = []
+        errors = []
+        for node, result, error in run_parallel(list_tasks, nodes):
+            if error is not None:
+                errors.append(f"{node}: {error}")
+                continue
+            tasks.extend(t for t in result if t.get('endtime'))
+
+        logs = self.store.get_task_logs(t['upid'] for t in tasks)
+        missing = [t['upid'] for t in tasks if t['upid'] not in logs]
+        fetched = {}
+        for upid, lines, error in run_parallel(lambda upid: read_task_log(self.proxmox, upid), missing):
+            if error is not None:
+                errors.append(f"{upid}: {error}")
+                continue
+            fetched[upid] = lines
+        if fetched:
+            self.store.put_task_logs(fetched)
+        logs.update(fetched)
+
+        self.records = []
+        for t in tasks:
+            lines = logs.get(t['upid'])
+            if lines is None:
+                continue
+            for rec in parse_vzdump_log(lines, node=t.get('node'), upid=t['upid']):
+                if rec['starttime'] is None:
+                    rec['starttime'] = t.get('starttime')
+                self.records.append(rec)
+
+        self.show_summary()
+        ok = sum(1 for r in self.records if r['ok'])
+        self.summary_label.setText(
+            f"{len(tasks)} vzdump task(s) on {len(nodes)} node(s), {ok} guest backup(s) "
+            f"({len(self.records) - ok} failed). Fetched {len(fetched)} log(s), "
+            f"{len(tasks) - len(missing)} from cache."
+        )
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some logs could not be loaded:\n" + "\n".join(errors[:20]))
+
+    def show_summary(self):
+        key = GROUP_KEYS[self.group_combo.currentText()]
+        summaries = aggregate(self.records, key)
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        for s in summaries:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            values = [
+                s['count'],
+                round(s['total_duration'] / 60.0, 1),
+                round(s['avg_duration'], 1),
+                s['p95_duration'],
+                round(s['avg_rate'] / 1024**2, 1),
+                round(s['avg_size'] / 1024**3, 2),
+                round(s['avg_ratio'], 2),
+                round(s['duration_trend'], 1),
+            ]
+            self.table.setItem(row, 0, QTableWidgetItem(str(s['key'])))
+            for col, value in enumerate(values, start=1):
+                item = QTableWidgetItem()
+                # Numeric display data so sorting by column is numeric, not alphabetical
+                item.setData(Qt.ItemDataRole.DisplayRole, value)
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
@@ -0,0 +1,262 @@
+# proxmox_manager/tabs/backup_retention_tab.py
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
+    QSpinBox, QListWidget, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import QTimer, QDateTime
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.task_queue import QueueJob, TaskQueue
+
+KEEP_OPTIONS = ("keep-last", "keep-hourly", "keep-daily", "keep-weekly", "keep-monthly", "keep-yearly")
+
+class BackupRetentionTab(QWidget):
+    """
+    Retention engine for backup storages.
+    A dry run (GET .../prunebackups) shows which archives a keep-* policy
+    would remove and how much space that frees; Prune then applies the same
+    policy with one DELETE .../prunebackups per storage instead of one
+    DELETE per archive.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.targets = {}  # display name -> (node, storage)
+        self.dry_run = None  # {"params": ..., "targets": ..., "volumes": [...]}
+        self.queue = None
+        self.setup_ui()
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_queue)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        storage_layout = QHBoxLayout()
+        storage_layout.addWidget(QLabel("Backup storages:"))
+        self.storage_list = QListWidget()
+        self.storage_list.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
+        self.storage_list.setMaximumHeight(100)
+        storage_layout.addWidget(self.storage_list)
+
+        self.refresh_btn = QPushButton("Refresh Storages")
+        self.refresh_btn.clicked.connect(self.refresh_storages)
+        storage_layout.addWidget(self.refresh_btn)
+        layout.addLayout(storage_layout)
+
+        # keep-* policy
+        policy_layout = QHBoxLayout()
+        self.keep_spins = {}
+        defaults = {"keep-last": 3, "keep-daily": 7, "keep-weekly": 4, "keep-monthly": 6}
+        for option in KEEP_OPTIONS:
+            policy_layout.addWidget(QLabel(f"{option}:"))
+            spin = QSpinBox()
+            spin.setRange(0, 1000)
+            spin.setValue(defaults.get(option, 0))
+            policy_layout.addWidget(spin)
+            self.keep_spins[option] = spin
+        layout.addLayout(policy_layout)
+
+        filter_layout = QHBoxLayout()
+        self.vmid_input = QLineEdit()
+        self.vmid_input.setPlaceholderText("Only this VMID (optional)")
+        filter_layout.addWidget(self.vmid_input)
+
+        self.dry_run_btn = QPushButton("Dry Run")
+        self.dry_run_btn.clicked.connect(self.run_dry_run)
+        filter_layout.addWidget(self.dry_run_btn)
+
+        self.prune_btn = QPushButton("Prune")
+        self.prune_btn.clicked.connect(self.run_prune)
+        filter_layout.addWidget(self.prune_btn)
+        layout.addLayout(filter_layout)
+
+        self.result_table = QTableWidget()
+        self.result_table.setColumnCount(6)
+        self.result_table.setHorizontalHeaderLabels(["Storage", "Volume", "VMID", "Date", "Size (GB)", "Action"])
+        self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.result_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def refresh_storages(self):
+        """Backup storages from /cluster/resources; shared storages are listed once."""
+        self.storage_list.clear()
+        self.targets = {}
+        try:
+            self.resources.refresh(force=True)
+            for st in self.resources.storages(content='backup'):
+                if st.get('status', 'available') != 'available':
+                    continue
+                if int(st.get('shared', 0)):
+                    name = st['storage']
+                else:
+                    name = f"{st['node']}/{st['storage']}"
+                self.targets.setdefault(name, (st['node'], st['storage']))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list storages: {e}")
+            return
+        for name in sorted(self.targets):
+            self.storage_list.addItem(name)
+
+    def prune_params(self):
+        """
+        The policy as PVE expects it, e.g. {'prune-backups': 'keep-last=3,keep-daily=7'}.
+        Returns None if no keep option is set (PVE would then keep everything).
+        """
+        options = [f"{o}={s.value()}" for o, s in self.keep_spins.items() if s.value() > 0]
+        if not options:
+            return None
+        params = {"prune-backups": ",".join(options)}
+        vmid = self.vmid_input.text().strip()
+        if vmid:
+            params["vmid"] = int(vmid)
+        return params
+
+    def run_dry_run(self):
+        """
+        GET /nodes/{node}/storage/{storage}/prunebackups  (what would be removed)
+        GET /nodes/{node}/storage/{storage}/content       (archive sizes)
+        for every selected storage, all in parallel.
+        """
+        vmid = self.vmid_input.text().strip()
+        if vmid and not vmid.isdigit():
+            QMessageBox.warning(self, "Warning", "VMID must be a number.")
+            return
+        params = self.prune_params()
+        if params is None:
+            QMessageBox.warning(self, "Warning", "Set at least one keep option.")
+            return
+        names = [i.text() for i in self.storage_list.selectedItems()]
+        if not names:
+            QMessageBox.warning(self, "Warning", "Select one or more storages.")
+            return
+
+        def fetch(name):
+            node, storage = self.targets[name]
+            api = self.proxmox.nodes(node).storage(storage)
+            marks = api.prunebackups.get(**params)
+            content_params = {"content": "backup"}
+            if "vmid" in params:
+                content_params["vmid"] = params["vmid"]
+            sizes = {c['volid']: int(c.get('size', 0) or 0) for c in api.content.get(**content_params)}
+            return marks, sizes
+
+        volumes = []
+        errors = []
+        for name, result, error in run_parallel(fetch, names):
+            if error is not None:
+                errors.append(f"{name}: {error}")
+                continue
+            marks, sizes = result
+            for m in marks:
+                m['storage'] = name
+                m['size'] = sizes.get(m.get('volid'), 0)
+                volumes.append(m)
+
+        volumes.sort(key=lambda v: (v['storage'], int(v.get('vmid', 0) or 0), -int(v.get('ctime', 0) or 0)))
+        self.dry_run = {
+            "params": params,
+            "targets": [n for n in names if not any(e.startswith(f"{n}:") for e in errors)],
+            "volumes": volumes,
+        }
+        self.show_volumes(volumes)
+
+        to_remove = [v for v in volumes if v.get('mark') == 'remove']
+        reclaim = sum(v['size'] for v in to_remove)
+        self.summary_label.setText(
+            f"Dry run: {len(to_remove)} of {len(volumes)} archive(s) would be removed, "
+            f"reclaiming {reclaim / 1024**3:.2f} GB."
+        )
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some storages failed:\n" + "\n".join(errors))
+
+    def show_volumes(self, volumes):
+        self.result_table.setRowCount(0)
+        for v in volumes:
+            row = self.result_table.rowCount()
+            self.result_table.insertRow(row)
+            ctime = v.get('ctime')
+            date_str = QDateTime.fromSecsSinceEpoch(int(ctime)).toString() if ctime else ""
+            self.result_table.setItem(row, 0, QTableWidgetItem(v['storage']))
+            self.result_table.setItem(row, 1, QTableWidgetItem(v.get('volid', '')))
+            self.result_table.setItem(row, 2, QTableWidgetItem(str(v.get('vmid', ''))))
+            self.result_table.setItem(row, 3, QTableWidgetItem(date_str))
+            self.result_table.setItem(row, 4, QTableWidgetItem(f"{v['size'] / 1024**3:.2f}"))
+            self.result_table.setItem(row, 5, QTableWidgetItem(v.get('mark', '')))
+
+    def run_prune(self):
+        """
+        DELETE /nodes/{node}/storage/{storage}/prunebackups
+        One call per storage, using exactly the policy of the last dry run.
+        """
+        if not self.dry_run:
+            QMessageBox.warning(self, "Warning", "Run a dry run first.")
+            return
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "A prune is still running.")
+            return
+        to_remove = [v for v in self.dry_run['volumes'] if v.get('mark') == 'remove']
+        if not to_remove:
+            QMessageBox.information(self, "Prune", "Nothing to prune.")
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Remove {len(to_remove)} archive(s) from {len(self.dry_run['targets'])} storage(s)? "
+            "This cannot be undone.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        params = self.dry_run['params']
+        self.queue = TaskQueue(self.proxmox, on_change=self.update_status)
+        for name in self.dry_run['targets']:
+            node, storage = self.targets[name]
+            self.queue.add(QueueJob(
+                label=name,
+                start=lambda node=node, storage=storage: (
+                    self.proxmox.nodes(node).storage(storage).prunebackups.delete(**params)
+                ),
+                data=name,
+            ))
+        self.queue.poll()
+        self.poll_timer.start(2000)
+
+    def poll_queue(self):
+        if not self.queue:
+            return
+        self.queue.poll()
+        if not self.queue.is_idle():
+            return
+        self.poll_timer.stop()
+
+        pruned = {j.data for j in self.queue.jobs if j.state == 'ok'}
+        failed = [f"{j.data}: {j.error}" for j in self.queue.jobs if j.state == 'failed']
+        reclaimed = sum(
+            v['size'] for v in self.dry_run['volumes']
+            if v.get('mark') == 'remove' and v['storage'] in pruned
+        )
+        self.dry_run = None
+        message = f"Pruned {len(pruned)} storage(s), reclaimed {reclaimed / 1024**3:.2f} GB."
+        self.summary_label.setText(message)
+        if failed:
+            QMessageBox.warning(self, "Prune", message + "\nFailed:\n" + "\n".join(failed))
+        else:
+            QMessageBox.information(self, "Prune", message)
+
+    def update_status(self):
+        counts = self.queue.counts()
+        self.summary_label.setText(
+            f"Pruning: running {counts.get('running', 0) + counts.get('pending', 0)}, "
+            f"done {counts.get('ok', 0)}, failed {counts.get('failed', 0)}"
+        )
@@ -1,6 +1,38 @@
 # proxmox_manager/tabs/backup_tab.py
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QHBoxLayout, QPushButton, QListWidget, QMessageBox
 
+def backup_kind(volid, subtype=None):
+    """
+    'qemu' or 'lxc' for a backup volume.
+    Storage content listings carry 'subtype'; otherwise parse the volid, e.g.
+    'local:backup/vzdump-lxc-105-...' or 'pbs:backup/vm/101/2024-...'.
+    """
+    if subtype in ("qemu", "lxc"):
+        return subtype
+    name = volid.split(":", 1)[-1]
+    if "vzdump-lxc-" in name or name.startswith("backup/ct/") or name.startswith("ct/"):
+        return "lxc"
+    return "qemu"
+
+def restore_archive(proxmox, node, volid, vmid, storage, kind="qemu", bwlimit=None, live_restore=False, unique=False):
+    """
+    Restore a backup archive as guest vmid on node.
+    POST /nodes/{node}/qemu   archive=..., vmid=...
+    POST /nodes/{node}/lxc    ostemplate=..., restore=1, vmid=...
+    bwlimit is in KiB/s. live-restore only applies to VMs (PBS archives).
+    Returns the UPID of the restore task.
+    """
+    params = {"vmid": vmid, "storage": storage}
+    if bwlimit:
+        params["bwlimit"] = bwlimit
+    if unique:
+        params["unique"] = 1
+    if kind == "lxc":
+        return proxmox.nodes(node).lxc.post(ostemplate=volid, restore=1, **params)
+    if live_restore:
+        params["live-restore"] = 1
+    return proxmox.nodes(node).qemu.post(archive=volid, **params)
+
 class BackupTab(QWidget):
     def __init__(self, proxmox):
         super().__init__()
@@ -81,11 +113,7 @@ class BackupTab(QWidget):
                 return
             new_vmid = int(new_vmid_str)
             node = "pve"
-            self.proxmox.nodes(node).storage("local").restore.post(
-                vmid=new_vmid,
-                volid=volid,
-                storage="local"
-            )
+            restore_archive(self.proxmox, node, volid, new_vmid, "local", backup_kind(volid))
             QMessageBox.information(self, "Restored", f"Restore job started for backup {volid}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to restore backup: {e}")
@@ -0,0 +1,396 @@
+# proxmox_manager/tabs/batch_clone_tab.py
+
+from urllib.parse import quote
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox,
+    QSpinBox, QCheckBox, QLineEdit, QListWidget, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt, QTimer
+
+from tabs.cluster_resources import get_cluster_resources, config_storages
+from tabs.migration_plan import node_loads
+from tabs.task_queue import QueueJob, TaskQueue
+from tabs.vmid_allocator import get_vmid_allocator
+
+SAME_STORAGE = "(same as template)"
+NO_POOL = "(none)"
+
+def expand_pattern(pattern, n, vmid):
+    """'ci-{n:03}' with n=7 -> 'ci-007'; {vmid} is the clone's VMID."""
+    return pattern.format(n=n, vmid=vmid)
+
+class BatchCloneTab(QWidget):
+    """
+    Mass provisioning from a template: N linked or full clones with
+    generated names, VMIDs allocated up front, spread over target nodes by
+    free memory and cloned concurrently within a per-node limit. Clones of
+    one template can be serialized where PVE locks the template. Each clone
+    then gets its own cloud-init settings and is optionally started.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.allocator = get_vmid_allocator(proxmox)
+        self.templates = []
+        self.pools = []
+        self.plan = []
+        self.queue = None
+        self.setup_ui()
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_queue)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        template_layout = QHBoxLayout()
+        template_layout.addWidget(QLabel("Template:"))
+        self.template_combo = QComboBox()
+        template_layout.addWidget(self.template_combo)
+        self.refresh_btn = QPushButton("Refresh")
+        self.refresh_btn.clicked.connect(self.refresh)
+        template_layout.addWidget(self.refresh_btn)
+
+        template_layout.addWidget(QLabel("Count:"))
+        self.count_spin = QSpinBox()
+        self.count_spin.setRange(1, 1000)
+        self.count_spin.setValue(10)
+        template_layout.addWidget(self.count_spin)
+
+        template_layout.addWidget(QLabel("Name pattern:"))
+        self.name_input = QLineEdit("clone-{n:03}")
+        self.name_input.setToolTip("{n} is the clone number, {vmid} its VMID")
+        template_layout.addWidget(self.name_input)
+
+        template_layout.addWidget(QLabel("First n:"))
+        self.first_spin = QSpinBox()
+        self.first_spin.setRange(0, 100000)
+        self.first_spin.setValue(1)
+        template_layout.addWidget(self.first_spin)
+        layout.addLayout(template_layout)
+
+        target_layout = QHBoxLayout()
+        target_layout.addWidget(QLabel("Target nodes (none selected = template node):"))
+        self.node_list = QListWidget()
+        self.node_list.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
+        self.node_list.setMaximumHeight(90)
+        target_layout.addWidget(self.node_list)
+
+        target_layout.addWidget(QLabel("Storage (full clones):"))
+        self.storage_combo = QComboBox()
+        target_layout.addWidget(self.storage_combo)
+
+        self.full_cb = QCheckBox("Full clone")
+        target_layout.addWidget(self.full_cb)
+
+        target_layout.addWidget(QLabel("Pool / VMID range:"))
+        self.pool_combo = QComboBox()
+        target_layout.addWidget(self.pool_combo)
+        layout.addLayout(target_layout)
+
+        ci_layout = QHBoxLayout()
+        ci_layout.addWidget(QLabel("Cloud-init user:"))
+        self.ciuser_input = QLineEdit()
+        ci_layout.addWidget(self.ciuser_input)
+        ci_layout.addWidget(QLabel("SSH key:"))
+        self.sshkey_input = QLineEdit()
+        ci_layout.addWidget(self.sshkey_input)
+        ci_layout.addWidget(QLabel("ipconfig0:"))
+        self.ipconfig_input = QLineEdit()
+        self.ipconfig_input.setPlaceholderText("ip=10.0.0.{n}/24,gw=10.0.0.1 or ip=dhcp")
+        ci_layout.addWidget(self.ipconfig_input)
+        layout.addLayout(ci_layout)
+
+        limits_layout = QHBoxLayout()
+        limits_layout.addWidget(QLabel("Parallel per node:"))
+        self.per_node_spin = QSpinBox()
+        self.per_node_spin.setRange(1, 32)
+        self.per_node_spin.setValue(4)
+        limits_layout.addWidget(self.per_node_spin)
+
+        self.serialize_cb = QCheckBox("One clone at a time per template")
+        limits_layout.addWidget(self.serialize_cb)
+
+        self.start_cb = QCheckBox("Start clones")
+        limits_layout.addWidget(self.start_cb)
+        layout.addLayout(limits_layout)
+
+        btn_layout = QHBoxLayout()
+        self.plan_btn = QPushButton("Build Plan")
+        self.plan_btn.clicked.connect(self.build_plan)
+        btn_layout.addWidget(self.plan_btn)
+
+        self.start_btn = QPushButton("Start Cloning")
+        self.start_btn.clicked.connect(self.start_cloning)
+        btn_layout.addWidget(self.start_btn)
+
+        self.cancel_btn = QPushButton("Cancel Pending")
+        self.cancel_btn.clicked.connect(self.cancel_pending)
+        btn_layout.addWidget(self.cancel_btn)
+        layout.addLayout(btn_layout)
+
+        self.plan_table = QTableWidget()
+        self.plan_table.setColumnCount(5)
+        self.plan_table.setHorizontalHeaderLabels(["VMID", "Name", "Node", "ipconfig0", "Status"])
+        self.plan_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.plan_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        """Templates, online nodes and image storages from /cluster/resources."""
+        try:
+            self.resources.refresh(force=True)
+            self.templates = sorted(
+                (g for g in self.resources.guests() if g.get('type') == 'qemu' and int(g.get('template', 0) or 0)),
+                key=lambda g: int(g['vmid'])
+            )
+            nodes = self.resources.node_names(online_only=True)
+            storages = sorted({st['storage'] for st in self.resources.storages(content='images')})
+            self.pools = sorted(r['pool'] for r in self.resources.of_type('pool'))
+        except Exception as e:
+            print(f"Failed to load templates: {e}")
+            return
+
+        current = self.template_combo.currentText()
+        self.template_combo.clear()
+        for t in self.templates:
+            self.template_combo.addItem(f"{t['vmid']} {t.get('name', '')} ({t['node']})")
+        if current:
+            self.template_combo.setCurrentText(current)
+
+        selected = {i.text() for i in self.node_list.selectedItems()}
+        self.node_list.clear()
+        for name in nodes:
+            self.node_list.addItem(name)
+            if name in selected:
+                self.node_list.item(self.node_list.count() - 1).setSelected(True)
+
+        self.storage_combo.clear()
+        self.storage_combo.addItem(SAME_STORAGE)
+        self.storage_combo.addItems(storages)
+
+        current = self.pool_combo.currentText()
+        self.pool_combo.clear()
+        self.pool_combo.addItem(NO_POOL)
+        self.pool_combo.addItems(sorted(set(self.pools) | set(self.allocator.ranges())))
+        if current:
+            self.pool_combo.setCurrentText(current)
+
+    def build_plan(self):
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "Cloning is still running.")
+            return
+        index = self.template_combo.currentIndex()
+        if index < 0:
+            QMessageBox.warning(self, "Warning", "Select a template.")
+            return
+        template = self.templates[index]
+        full = self.full_cb.isChecked()
+        pool = self.pool_combo.currentText() if self.pool_combo.currentText() != NO_POOL else None
+        pattern = self.name_input.text().strip()
+        ipconfig = self.ipconfig_input.text().strip()
+        try:
+            expand_pattern(pattern, 0, 0)
+            expand_pattern(ipconfig, 0, 0)
+        except (KeyError, IndexError, ValueError) as e:
+            QMessageBox.warning(self, "Warning", f"Invalid pattern: {e}")
+            return
+
+        nodes = [i.text() for i in self.node_list.selectedItems()] or [template['node']]
+        self.release_unused()
+        self.plan = []
+        try:
+            self.resources.refresh(force=True)
+            config = self.proxmox.nodes(template['node']).qemu(template['vmid']).config.get()
+            vmids = self.allocator.allocate(self.count_spin.value(), scope=pool)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to prepare clones: {e}")
+            return
+
+        # PVE only clones to another node (target=...) when every template
+        # disk is on shared storage, and for full clones the target storage
+        # must be shared too; otherwise all clones stay on the template's node.
+        shared = {st['storage'] for st in self.resources.storages(node=template['node']) if int(st.get('shared', 0) or 0)}
+        storage = self.storage_combo.currentText() if full else SAME_STORAGE
+        if nodes != [template['node']]:
+            reason = None
+            if not config_storages(config) <= shared:
+                reason = "The template has disks on local storage"
+            elif storage != SAME_STORAGE and storage not in shared:
+                reason = f"Storage {storage} is not shared"
+            if reason:
+                QMessageBox.warning(
+                    self, "Warning",
+                    f"{reason}; PVE cannot clone to another node, so all clones stay on {template['node']}."
+                )
+                nodes = [template['node']]
+
+        online = {n['node']: n for n in self.resources.nodes(online_only=True)}
+        loads = node_loads({n: online[n] for n in nodes if n in online})
+        if not loads:
+            self.allocator.release(vmids)
+            QMessageBox.warning(self, "Warning", "No target node is online.")
+            return
+        mem = int(template.get('maxmem', 0) or 0)
+
+        for i, vmid in enumerate(vmids):
+            n = self.first_spin.value() + i
+            node = min(loads, key=lambda name: (loads[name][0] + mem) / (loads[name][1] or 1))
+            loads[node][0] += mem
+            self.plan.append({
+                "vmid": vmid,
+                "name": expand_pattern(pattern, n, vmid),
+                "node": node,
+                "ipconfig": expand_pattern(ipconfig, n, vmid) if ipconfig else "",
+                "template": template,
+                "full": full,
+                "storage": storage,
+                "pool": pool if pool in self.pools else None,
+                "status": "planned",
+            })
+        self.show_plan()
+
+    def show_plan(self):
+        self.plan_table.setRowCount(0)
+        for p in self.plan:
+            row = self.plan_table.rowCount()
+            self.plan_table.insertRow(row)
+            # Numeric display data so sorting by column is numeric, not alphabetical
+            item = QTableWidgetItem()
+            item.setData(Qt.ItemDataRole.DisplayRole, p['vmid'])
+            self.plan_table.setItem(row, 0, item)
+            self.plan_table.setItem(row, 1, QTableWidgetItem(p['name']))
+            self.plan_table.setItem(row, 2, QTableWidgetItem(p['node']))
+            self.plan_table.setItem(row, 3, QTableWidgetItem(p['ipconfig']))
+            self.plan_table.setItem(row, 4, QTableWidgetItem(p['status']))
+
+    def clone(self, p):
+        """POST /nodes/{node}/qemu/{template}/clone"""
+        template = p['template']
+        params = {"newid": p['vmid'], "name": p['name'], "full": int(p['full'])}
+        if p['node'] != template['node']:
+            params['target'] = p['node']
+        if p['full'] and p['storage'] != SAME_STORAGE:
+            params['storage'] = p['storage']
+        if p['pool']:
+            params['pool'] = p['pool']
+        return self.proxmox.nodes(template['node']).qemu(template['vmid']).clone.post(**params)
+
+    def cloud_init(self, p):
+        """Cloud-init settings for one clone (PUT .../config), {} if none are set."""
+        config = {}
+        if self.ciuser_input.text().strip():
+            config['ciuser'] = self.ciuser_input.text().strip()
+        if self.sshkey_input.text().strip():
+            # PVE expects the keys URL-encoded
+            config['sshkeys'] = quote(self.sshkey_input.text().strip(), safe="")
+        if p['ipconfig']:
+            config['ipconfig0'] = p['ipconfig']
+        return config
+
+    def setup_clone(self, p):
+        """
+        PUT /nodes/{node}/qemu/{vmid}/config with the clone's cloud-init,
+        then POST .../status/start if requested (returns its UPID).
+        """
+        api = self.proxmox.nodes(p['node']).qemu(p['vmid'])
+        config = self.cloud_init(p)
+        if config:
+            api.config.put(**config)
+        if self.start_cb.isChecked():
+            return api.status.start.post()
+        return None
+
+    def release_unused(self):
+        """Release the VMIDs of plan entries that never ran."""
+        self.allocator.release(p['vmid'] for p in self.plan if not p.get('job') or p['job'].state == "cancelled")
+
+    def clone_done(self, job):
+        p = job.data
+        if job.state == "failed":
+            self.allocator.release([p['vmid']])
+        if job.state != "ok" or not (self.cloud_init(p) or self.start_cb.isChecked()):
+            return
+        p['setup_job'] = self.queue.add(QueueJob(
+            label=f"{p['vmid']} setup",
+            start=lambda p=p: self.setup_clone(p),
+            slots=[f"node:{p['node']}"],
+            serial=f"vm:{p['vmid']}",
+            data=p,
+        ))
+
+    def start_cloning(self):
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "Cloning is still running.")
+            return
+        # Entries that already ran keep their VMIDs; only unrun ones are cloned
+        todo = [p for p in self.plan if not p.get('job')]
+        if not todo:
+            QMessageBox.warning(self, "Warning", "Nothing left to clone; build a new plan first.")
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Create {len(todo)} clone(s) of template {todo[0]['template']['vmid']}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        self.queue = TaskQueue(self.proxmox, on_change=self.update_status)
+        serialize = self.serialize_cb.isChecked()
+        for p in todo:
+            node_key = f"node:{p['node']}"
+            self.queue.set_limit(node_key, self.per_node_spin.value())
+            p['job'] = self.queue.add(QueueJob(
+                label=p['name'],
+                start=lambda p=p: self.clone(p),
+                slots=[node_key],
+                serial=f"template:{p['template']['vmid']}" if serialize else None,
+                data=p,
+                on_done=self.clone_done,
+            ))
+        self.queue.poll()
+        self.poll_timer.start(3000)
+
+    def poll_queue(self):
+        if not self.queue:
+            return
+        self.queue.poll()
+        if self.queue.is_idle():
+            self.poll_timer.stop()
+            self.resources.invalidate()
+            ok = sum(1 for p in self.plan if p['status'] == "ok")
+            failed = sum(1 for p in self.plan if p['status'].startswith("failed"))
+            QMessageBox.information(self, "Batch Clone", f"Batch clone finished: {ok} ok, {failed} failed.")
+
+    def cancel_pending(self):
+        if self.queue:
+            self.queue.cancel_pending()
+            self.release_unused()
+
+    def update_status(self):
+        for row, p in enumerate(self.plan):
+            job = p.get('setup_job') or p.get('job')
+            if not job:
+                continue
+            status = job.state
+            if job is p.get('setup_job') and job.state in ("pending", "running"):
+                status = "configuring"
+            if job.error:
+                status = f"{status}: {job.error}"
+            p['status'] = status
+            self.plan_table.setItem(row, 4, QTableWidgetItem(status))
+        counts = self.queue.counts()
+        self.summary_label.setText(
+            f"pending {counts.get('pending', 0)}, running {counts.get('running', 0)}, "
+            f"ok {counts.get('ok', 0)}, failed {counts.get('failed', 0)}, cancelled {counts.get('cancelled', 0)}"
+        )
@@ -0,0 +1,405 @@
+# proxmox_manager/tabs/bulk_restore_tab.py
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox,
+    QSpinBox, QCheckBox, QListWidget, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import QTimer, QDateTime
+
+from tabs.backup_tab import backup_kind, restore_archive
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.task_queue import QueueJob, TaskQueue
+from tabs.vmid_allocator import get_vmid_allocator
+
+class BulkRestoreTab(QWidget):
+    """
+    Bulk restore planner for DR drills.
+    Pick many backup archives, spread them over target nodes, then restore
+    them concurrently within per-node and per-storage limits. The storage
+    throughput cap is split evenly over the restores sharing that storage
+    and passed to PVE as bwlimit.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.allocator = get_vmid_allocator(proxmox)
+        self.backups = []  # content dicts, same order as backup_table rows
+        self.plan = []     # plan dicts, same order as plan_table rows
+        self.queue = None
+        self.setup_ui()
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_queue)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Backup archives (select the ones to restore):"))
+        self.refresh_btn = QPushButton("Refresh Backups")
+        self.refresh_btn.clicked.connect(self.refresh_backups)
+        top_layout.addWidget(self.refresh_btn)
+        layout.addLayout(top_layout)
+
+        self.backup_table = QTableWidget()
+        self.backup_table.setColumnCount(7)
+        self.backup_table.setHorizontalHeaderLabels(["Volume", "Type", "VMID", "Size (GB)", "Date", "Storage", "Node"])
+        self.backup_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.backup_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.backup_table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        layout.addWidget(self.backup_table)
+
+        # Targets
+        target_layout = QHBoxLayout()
+        target_layout.addWidget(QLabel("Target nodes:"))
+        self.node_list = QListWidget()
+        self.node_list.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
+        self.node_list.setMaximumHeight(90)
+        target_layout.addWidget(self.node_list)
+
+        target_layout.addWidget(QLabel("Target storage:"))
+        self.storage_combo = QComboBox()
+        target_layout.addWidget(self.storage_combo)
+        layout.addLayout(target_layout)
+
+        # Limits
+        limits_layout = QHBoxLayout()
+        limits_layout.addWidget(QLabel("Parallel per storage:"))
+        self.per_storage_spin = QSpinBox()
+        self.per_storage_spin.setRange(1, 32)
+        self.per_storage_spin.setValue(2)
+        limits_layout.addWidget(self.per_storage_spin)
+
+        limits_layout.addWidget(QLabel("Parallel per node:"))
+        self.per_node_spin = QSpinBox()
+        self.per_node_spin.setRange(1, 32)
+        self.per_node_spin.setValue(2)
+        limits_layout.addWidget(self.per_node_spin)
+
+        limits_layout.addWidget(QLabel("Storage cap (MiB/s, 0 = none):"))
+        self.storage_cap_spin = QSpinBox()
+        self.storage_cap_spin.setRange(0, 100000)
+        self.storage_cap_spin.setValue(0)
+        limits_layout.addWidget(self.storage_cap_spin)
+        layout.addLayout(limits_layout)
+
+        options_layout = QHBoxLayout()
+        self.keep_vmid_cb = QCheckBox("Keep original VMIDs when free")
+        self.keep_vmid_cb.setChecked(True)
+        options_layout.addWidget(self.keep_vmid_cb)
+
+        self.unique_cb = QCheckBox("Unique (new MAC addresses)")
+        options_layout.addWidget(self.unique_cb)
+
+        self.live_restore_cb = QCheckBox("Live-restore VMs (PBS archives only)")
+        options_layout.addWidget(self.live_restore_cb)
+        layout.addLayout(options_layout)
+
+        btn_layout = QHBoxLayout()
+        self.plan_btn = QPushButton("Build Plan")
+        self.plan_btn.clicked.connect(self.build_plan)
+        btn_layout.addWidget(self.plan_btn)
+
+        self.start_btn = QPushButton("Start Restore")
+        self.start_btn.clicked.connect(self.start_restore)
+        btn_layout.addWidget(self.start_btn)
+
+        self.cancel_btn = QPushButton("Cancel Pending")
+        self.cancel_btn.clicked.connect(self.cancel_pending)
+        btn_layout.addWidget(self.cancel_btn)
+        layout.addLayout(btn_layout)
+
+        self.plan_table = QTableWidget()
+        self.plan_table.setColumnCount(6)
+        self.plan_table.setHorizontalHeaderLabels(["Archive", "Type", "New VMID", "Target Node", "Target Storage", "Status"])
+        self.plan_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.plan_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def refresh_backups(self):
+        """
+        GET /nodes/{node}/storage/{storage}/content?content=backup
+        for every backup storage, in parallel. Shared storages are listed once;
+        archives on a node's own storage remember that node, the only one
+        that can restore them.
+        """
+        self.backups = []
+        self.backup_table.setRowCount(0)
+        try:
+            self.resources.refresh(force=True)
+            targets = {}
+            for st in self.resources.storages(content='backup'):
+                if st.get('status', 'available') != 'available':
+                    continue
+                key = st['storage'] if int(st.get('shared', 0)) else f"{st['node']}/{st['storage']}"
+                targets.setdefault(key, (st['node'], st['storage'], bool(int(st.get('shared', 0)))))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list storages: {e}")
+            return
+
+        def list_content(target):
+            node, storage, _ = target
+            return self.proxmox.nodes(node).storage(storage).content.get(content='backup')
+
+        errors = []
+        for (node, storage, shared), content, error in run_parallel(list_content, targets.values()):
+            if error is not None:
+                errors.append(f"{node}/{storage}: {error}")
+                continue
+            for item in content:
+                item['storage'] = storage
+                # None for shared storage: any node can read the archive
+                item['node'] = None if shared else node
+                self.backups.append(item)
+        self.backups.sort(key=lambda b: (int(b.get('vmid', 0) or 0), -int(b.get('ctime', 0) or 0)))
+
+        for b in self.backups:
+            row = self.backup_table.rowCount()
+            self.backup_table.insertRow(row)
+            ctime = b.get('ctime')
+            date_str = QDateTime.fromSecsSinceEpoch(int(ctime)).toString() if ctime else ""
+            self.backup_table.setItem(row, 0, QTableWidgetItem(b.get('volid', '')))
+            self.backup_table.setItem(row, 1, QTableWidgetItem(backup_kind(b.get('volid', ''), b.get('subtype'))))
+            self.backup_table.setItem(row, 2, QTableWidgetItem(str(b.get('vmid', ''))))
+            self.backup_table.setItem(row, 3, QTableWidgetItem(f"{int(b.get('size', 0)) / 1024**3:.2f}"))
+            self.backup_table.setItem(row, 4, QTableWidgetItem(date_str))
+            self.backup_table.setItem(row, 5, QTableWidgetItem(b['storage']))
+            self.backup_table.setItem(row, 6, QTableWidgetItem(b['node'] or "(shared)"))
+
+        self.populate_targets()
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some storages could not be listed:\n" + "\n".join(errors))
+
+    def populate_targets(self):
+        """Fill the node list and the storages that can hold guest disks."""
+        selected = {i.text() for i in self.node_list.selectedItems()}
+        self.node_list.clear()
+        for name in self.resources.node_names(online_only=True):
+            self.node_list.addItem(name)
+            if name in selected:
+                self.node_list.item(self.node_list.count() - 1).setSelected(True)
+
+        current = self.storage_combo.currentText()
+        self.storage_combo.clear()
+        names = {st['storage'] for st in self.resources.storages(content='images')}
+        names |= {st['storage'] for st in self.resources.storages(content='rootdir')}
+        self.storage_combo.addItems(sorted(names))
+        if current:
+            self.storage_combo.setCurrentText(current)
+
+    def allocate_vmids(self, archives):
+        """
+        Pick a VMID for every archive: the original one if requested and free,
+        otherwise the next free ID from the shared allocator. All of them stay
+        reserved until their restore fails or the plan is replaced.
+        """
+        vmids = [None] * len(archives)
+        if self.keep_vmid_cb.isChecked():
+            # Reserve original IDs first so new IDs never take one of them.
+            for i, b in enumerate(archives):
+                original = int(b.get('vmid', 0) or 0)
+                if original and self.allocator.reserve(original):
+                    vmids[i] = original
+        missing = [i for i, vmid in enumerate(vmids) if vmid is None]
+        try:
+            new_ids = self.allocator.allocate(len(missing)) if missing else []
+        except Exception:
+            self.allocator.release(vmid for vmid in vmids if vmid is not None)
+            raise
+        for i, vmid in zip(missing, new_ids):
+            vmids[i] = vmid
+        return vmids
+
+    def build_plan(self):
+        """
+        Assign every selected archive a VMID and a target node. Archives on
+        a node's own backup storage are restored on that node (and left out
+        if it is not a selected target); archives on shared storage are
+        placed largest first on the node with the fewest planned bytes, so
+        the restore work ends up evenly spread.
+        """
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "A restore is still running.")
+            return
+        rows = sorted({i.row() for i in self.backup_table.selectedIndexes()})
+        if not rows:
+            QMessageBox.warning(self, "Warning", "Select one or more backups.")
+            return
+        nodes = [i.text() for i in self.node_list.selectedItems()]
+        if not nodes:
+            QMessageBox.warning(self, "Warning", "Select at least one target node.")
+            return
+        storage = self.storage_combo.currentText()
+        if not storage:
+            QMessageBox.warning(self, "Warning", "Select a target storage.")
+            return
+
+        archives = [self.backups[r] for r in rows]
+        skipped = [b for b in archives if b['node'] and b['node'] not in nodes]
+        archives = [b for b in archives if not b['node'] or b['node'] in nodes]
+        if skipped:
+            QMessageBox.warning(
+                self, "Warning",
+                "These archives are on a node's local storage and that node is not a selected target:\n"
+                + "\n".join(f"{b['volid']} (on {b['node']})" for b in skipped[:20])
+            )
+        if not archives:
+            return
+        self.release_unused()
+        try:
+            self.resources.refresh(force=True)
+            vmids = self.allocate_vmids(archives)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to allocate VMIDs: {e}")
+            return
+
+        node_storages = {n: {st['storage']: st for st in self.resources.storages(node=n)} for n in nodes}
+        planned_bytes = {n: 0 for n in nodes}
+        # Pinned archives first, so shared ones fill up around them
+        order = sorted(range(len(archives)), key=lambda i: (not archives[i]['node'], -int(archives[i].get('size', 0) or 0)))
+
+        self.plan = [None] * len(archives)
+        for i in order:
+            b = archives[i]
+            node = b['node'] or min(nodes, key=lambda n: (storage not in node_storages[n], planned_bytes[n]))
+            planned_bytes[node] += int(b.get('size', 0) or 0)
+            st = node_storages[node].get(storage)
+            self.plan[i] = {
+                "volid": b['volid'],
+                "kind": backup_kind(b['volid'], b.get('subtype')),
+                "vmid": vmids[i],
+                "node": node,
+                "storage": storage,
+                "shared": bool(st and int(st.get('shared', 0))),
+                "status": "planned" if st else f"storage {storage} not on {node}",
+            }
+        self.show_plan()
+
+    def release_unused(self):
+        """Release the VMIDs of plan entries that never ran."""
+        self.allocator.release(p['vmid'] for p in self.plan if not p.get('job'))
+
+    def restore_done(self, job):
+        if job.state == "failed":
+            self.allocator.release([job.data['vmid']])
+
+    def show_plan(self):
+        self.plan_table.setRowCount(0)
+        for p in self.plan:
+            row = self.plan_table.rowCount()
+            self.plan_table.insertRow(row)
+            self.plan_table.setItem(row, 0, QTableWidgetItem(p['volid']))
+            self.plan_table.setItem(row, 1, QTableWidgetItem(p['kind']))
+            self.plan_table.setItem(row, 2, QTableWidgetItem(str(p['vmid'])))
+            self.plan_table.setItem(row, 3, QTableWidgetItem(p['node']))
+            self.plan_table.setItem(row, 4, QTableWidgetItem(p['storage']))
+            self.plan_table.setItem(row, 5, QTableWidgetItem(p['status']))
+
+    def storage_key(self, p):
+        # A shared storage is one bottleneck for the whole cluster, a local one is per node.
+        if p['shared']:
+            return f"storage:{p['storage']}"
+        return f"storage:{p['node']}/{p['storage']}"
+
+    def start_restore(self):
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "A restore is still running.")
+            return
+        # Entries that were queued once carry their job state, so they never run twice
+        runnable = [p for p in self.plan if p['status'] == 'planned' and not p.get('job')]
+        if not runnable:
+            QMessageBox.warning(self, "Warning", "Nothing left to restore; build a new plan first.")
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Restore {len(runnable)} archive(s)?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        per_storage = self.per_storage_spin.value()
+        per_node = self.per_node_spin.value()
+        cap = self.storage_cap_spin.value()
+        # KiB/s per restore, so restores sharing a storage never exceed the cap together.
+        bwlimit = (cap * 1024) // per_storage if cap else None
+        live_restore = self.live_restore_cb.isChecked()
+        unique = self.unique_cb.isChecked()
+
+        self.queue = TaskQueue(self.proxmox, on_change=self.update_status)
+        for p in runnable:
+            storage_key = self.storage_key(p)
+            node_key = f"node:{p['node']}"
+            self.queue.set_limit(storage_key, per_storage)
+            self.queue.set_limit(node_key, per_node)
+            p['job'] = self.queue.add(QueueJob(
+                label=p['volid'],
+                start=lambda p=p: restore_archive(
+                    self.proxmox, p['node'], p['volid'], p['vmid'], p['storage'], p['kind'],
+                    bwlimit=bwlimit, live_restore=live_restore, unique=unique
+                ),
+                slots=[storage_key, node_key],
+                serial=f"vm:{p['vmid']}",
+                recover=lambda p=p: self.find_restore_task(p),
+                data=p,
+                on_done=self.restore_done,
+            ))
+        self.queue.poll()
+        self.poll_timer.start(3000)
+
+    def find_restore_task(self, p):
+        """
+        The restore request failed (e.g. timed out on a busy API) - look for a
+        restore task for this VMID that the node started anyway.
+        GET /nodes/{node}/tasks?vmid=...&typefilter=...
+        """
+        typefilter = "vzrestore" if p['kind'] == "lxc" else "qmrestore"
+        tasks = self.proxmox.nodes(p['node']).tasks.get(vmid=p['vmid'], typefilter=typefilter, source='all', limit=1)
+        started_at = p['job'].started_at or 0
+        for t in tasks:
+            if int(t.get('starttime', 0)) >= started_at - 120:
+                return t['upid']
+        return None
+
+    def poll_queue(self):
+        if not self.queue:
+            return
+        self.queue.poll()
+        if self.queue.is_idle():
+            self.poll_timer.stop()
+            self.resources.invalidate()
+            counts = self.queue.counts()
+            QMessageBox.information(
+                self, "Restore",
+                f"Bulk restore finished: {counts.get('ok', 0)} ok, {counts.get('failed', 0)} failed."
+            )
+
+    def cancel_pending(self):
+        if self.queue:
+            self.queue.cancel_pending()
+            self.allocator.release(p['vmid'] for p in self.plan if p.get('job') and p['job'].state == "cancelled")
+
+    def update_status(self):
+        for row, p in enumerate(self.plan):
+            job = p.get('job')
+            if not job:
+                continue
+            status = job.state
+            if job.error:
+                status = f"{status}: {job.error}"
+            p['status'] = status
+            self.plan_table.setItem(row, 5, QTableWidgetItem(status))
+        counts = self.queue.counts()
+        self.summary_label.setText(
+            f"pending {counts.get('pending', 0)}, running {counts.get('running', 0)}, "
+            f"ok {counts.get('ok', 0)}, failed {counts.get('failed', 0)}, cancelled {counts.get('cancelled', 0)}"
+        )
@@ -0,0 +1,113 @@
+# proxmox_manager/tabs/cluster_resources.py
+
+import time
+import threading
+
+class ClusterResources:
+    """
+    A short-lived cache of GET /cluster/resources.
+    One call returns every node, guest, storage and pool in the cluster,
+    which replaces the per-node qemu/lxc scans (find_vm_node) used elsewhere.
+    """
+    def __init__(self, proxmox, ttl=10):
+        self.proxmox = proxmox
+        self.ttl = ttl
+        self.resources = []
+        self.fetched_at = 0
+        self.lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Re-fetch /cluster/resources if the cached copy is older than ttl seconds."""
+        with self.lock:
+            if force or time.time() - self.fetched_at > self.ttl:
+                self.resources = self.proxmox.cluster.resources.get()
+                self.fetched_at = time.time()
+            return self.resources
+
+    def invalidate(self):
+        with self.lock:
+            self.fetched_at = 0
+
+    def of_type(self, *types):
+        return [r for r in self.refresh() if r.get('type') in types]
+
+    def nodes(self, online_only=False):
+        nodes = self.of_type('node')
+        if online_only:
+            nodes = [n for n in nodes if n.get('status') == 'online']
+        return nodes
+
+    def node_names(self, online_only=False):
+        return sorted(n['node'] for n in self.nodes(online_only))
+
+    def guests(self, include_templates=True):
+        """All qemu VMs and lxc containers ('type' is 'qemu' or 'lxc')."""
+        guests = self.of_type('qemu', 'lxc')
+        if not include_templates:
+            guests = [g for g in guests if not int(g.get('template', 0))]
+        return guests
+
+    def find_guest(self, vmid):
+        """Return the resource dict for vmid (with 'node' and 'type'), or None."""
+        vmid = int(vmid)
+        for g in self.guests():
+            if int(g.get('vmid', -1)) == vmid:
+                return g
+        return None
+
+    def used_vmids(self):
+        return {int(g['vmid']) for g in self.guests() if 'vmid' in g}
+
+    def storages(self, node=None, content=None):
+        """
+        Storage resources, one entry per (node, storage).
+        content filters on the storage's content types (e.g. 'images', 'backup').
+        """
+        result = []
+        for st in self.of_type('storage'):
+            if node and st.get('node') != node:
+                continue
+            if content and content not in st.get('content', '').split(","):
+                continue
+            result.append(st)
+        return result
+
+_shared = {}
+
+def get_cluster_resources(proxmox):
+    """Return the ClusterResources cache shared by every tab using this connection."""
+    key = id(proxmox)
+    if key not in _shared:
+        _shared[key] = ClusterResources(proxmox)
+    return _shared[key]
+
+def guest_api(proxmox, guest):
+    """
+    The API endpoint of a guest resource dict, i.e.
+    /nodes/{node}/qemu/{vmid} or /nodes/{node}/lxc/{vmid}.
+    """
+    node_api = proxmox.nodes(guest['node'])
+    if guest.get('type') == 'lxc':
+        return node_api.lxc(guest['vmid'])
+    return node_api.qemu(guest['vmid'])
+
+DISK_KEY_PREFIXES = ("scsi", "virtio", "sata", "ide", "efidisk", "tpmstate", "rootfs", "mp", "unused")
+
+def config_storages(config):
+    """
+    Storage IDs used by the disks in a guest config (GET .../config), e.g.
+    {'scsi0': 'ceph:vm-101-disk-0,size=32G', 'ide2': 'none,media=cdrom'} -> {'ceph'}.
+    CD-ROM drives and bind mounts are ignored.
+    """
+    storages = set()
+    for key, value in config.items():
+        if key != "rootfs" and not (key.startswith(DISK_KEY_PREFIXES) and key[-1].isdigit()):
+            continue
+        value = str(value)
+        if "media=cdrom" in value:
+            continue
+        volume = value.split(",")[0]
+        if ":" not in volume or volume.startswith("/"):
+            continue
+        storages.add(volume.split(":")[0])
+    return storages
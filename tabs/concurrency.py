@@ -0,0 +1,30 @@
+# proxmox_manager/tabs/concurrency.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 8
+
+def run_parallel(func, items, max_workers=DEFAULT_WORKERS):
+    """
+    Call func(item) for every item on a thread pool and wait for all of them.
+    Returns a list of (item, result, error) tuples in the same order as items.
+    Exactly one of result/error is meaningful: error is None on success.
+
+    Proxmox API calls are I/O bound, so this turns N sequential round trips
+    into roughly N / max_workers of them.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def call(item):
+        try:
+            return (item, func(item), None)
+        except Exception as e:
+            return (item, None, e)
+
+    if len(items) == 1 or max_workers <= 1:
+        return [call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(call, items))
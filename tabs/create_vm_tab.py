@@ -11,16 +11,94 @@ from PyQt6.QtWidgets import (
     QCheckBox,
     QHBoxLayout
 )
+from urllib.parse import quote
+from PyQt6.QtCore import QTimer
+
+from tabs.batch_clone_tab import expand_pattern
+from tabs.local_store import get_local_store
+from tabs.task_queue import QueueJob, TaskQueue
+from tabs.vmid_allocator import get_vmid_allocator
+
+NO_ISO = "(none)"
+# Saved presets live in the local store under this key, next to the built-in ones
+PRESETS_SETTING = "vm_presets"
+BUILTIN_PRESETS = {
+    "small": {"memory": 2048, "cores": 2, "cpu": "host", "bios": "seabios", "machine": "q35", "disk": 20},
+    "medium": {"memory": 8192, "cores": 4, "cpu": "host", "bios": "seabios", "machine": "q35", "disk": 50},
+    "large": {"memory": 32768, "cores": 8, "cpu": "host", "bios": "ovmf", "machine": "q35", "disk": 200},
+}
+
+def vm_create_params(vmid, name, spec):
+    """
+    Everything for POST /nodes/{node}/qemu in one request: the disk is
+    allocated with 'storage:size', the ISO is attached as a CD-ROM, an EFI
+    disk is added for OVMF and a cloud-init drive when requested.
+    spec keys: memory, cores, cpu, bios, machine, disk (GB), storage, iso,
+    bridge, cloudinit, ciuser, sshkeys, ipconfig0.
+    """
+    storage = spec['storage']
+    params = {
+        "vmid": vmid,
+        "name": name,
+        "memory": spec['memory'],
+        "cores": spec['cores'],
+        "cpu": spec['cpu'],
+        "bios": spec['bios'],
+        "machine": spec['machine'],
+        "scsihw": "virtio-scsi-pci",
+        "scsi0": f"{storage}:{spec['disk']},cache=writeback",
+        "net0": f"virtio,bridge={spec['bridge']}",
+    }
+    boot = ["scsi0"]
+    if spec.get('iso'):
+        params['ide2'] = f"{spec['iso']},media=cdrom"
+        boot.append("ide2")
+    boot.append("net0")
+    params['boot'] = "order=" + ";".join(boot)
+    if spec['bios'] == "ovmf":
+        params['efidisk0'] = f"{storage}:1,efitype=4m"
+    if spec.get('cloudinit'):
+        params['ide0'] = f"{storage}:cloudinit"
+        if spec.get('ciuser'):
+            params['ciuser'] = spec['ciuser']
+        if spec.get('sshkeys'):
+            # PVE expects the keys URL-encoded
+            params['sshkeys'] = quote(spec['sshkeys'], safe="")
+        if spec.get('ipconfig0'):
+            params['ipconfig0'] = spec['ipconfig0']
+    return params
 
 class CreateVMTab(QWidget):
     def __init__(self, proxmox):
         super().__init__()
         self.proxmox = proxmox
+        self.store = get_local_store()
+        self.allocator = get_vmid_allocator(proxmox)
+        self.queue = None
         self.setup_ui()
 
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_queue)
+
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
+        # Hardware presets
+        preset_layout = QHBoxLayout()
+        preset_layout.addWidget(QLabel("Preset"))
+        self.preset_combo = QComboBox()
+        preset_layout.addWidget(self.preset_combo)
+        self.apply_preset_btn = QPushButton("Apply Preset")
+        self.apply_preset_btn.clicked.connect(self.apply_preset)
+        preset_layout.addWidget(self.apply_preset_btn)
+        self.preset_name_input = QLineEdit()
+        self.preset_name_input.setPlaceholderText("New preset name")
+        preset_layout.addWidget(self.preset_name_input)
+        self.save_preset_btn = QPushButton("Save as Preset")
+        self.save_preset_btn.clicked.connect(self.save_preset)
+        preset_layout.addWidget(self.save_preset_btn)
+        layout.addLayout(preset_layout)
+
         # Node selection
         self.node_label = QLabel("Select Node")
         layout.addWidget(self.node_label)
@@ -33,7 +111,7 @@ class CreateVMTab(QWidget):
         layout.addWidget(self.node_combo)
 
         # VM Name
-        self.vm_name_label = QLabel("VM Name")
+        self.vm_name_label = QLabel("VM Name ({n} is replaced by the number in bulk mode)")
         layout.addWidget(self.vm_name_label)
         self.vm_name_input = QLineEdit()
         layout.addWidget(self.vm_name_input)
@@ -108,12 +186,84 @@ class CreateVMTab(QWidget):
         self.net_combo.addItems(["vmbr0", "vmbr1"])
         layout.addWidget(self.net_combo)
 
+        # Cloud-init
+        ci_layout = QHBoxLayout()
+        self.cloudinit_cb = QCheckBox("Cloud-init drive")
+        ci_layout.addWidget(self.cloudinit_cb)
+        self.ciuser_input = QLineEdit()
+        self.ciuser_input.setPlaceholderText("User")
+        ci_layout.addWidget(self.ciuser_input)
+        self.sshkey_input = QLineEdit()
+        self.sshkey_input.setPlaceholderText("SSH public key")
+        ci_layout.addWidget(self.sshkey_input)
+        self.ipconfig_input = QLineEdit()
+        self.ipconfig_input.setPlaceholderText("ipconfig0, e.g. ip=10.0.0.{n}/24,gw=10.0.0.1")
+        ci_layout.addWidget(self.ipconfig_input)
+        layout.addLayout(ci_layout)
+
         # Create button
         self.create_vm_button = QPushButton("Create VM")
         self.create_vm_button.clicked.connect(self.create_vm)
         layout.addWidget(self.create_vm_button)
 
+        # Bulk mode
+        bulk_layout = QHBoxLayout()
+        bulk_layout.addWidget(QLabel("Bulk count"))
+        self.bulk_count_spin = QSpinBox()
+        self.bulk_count_spin.setRange(1, 1000)
+        self.bulk_count_spin.setValue(10)
+        bulk_layout.addWidget(self.bulk_count_spin)
+        bulk_layout.addWidget(QLabel("Parallel"))
+        self.bulk_parallel_spin = QSpinBox()
+        self.bulk_parallel_spin.setRange(1, 32)
+        self.bulk_parallel_spin.setValue(4)
+        bulk_layout.addWidget(self.bulk_parallel_spin)
+        self.bulk_create_btn = QPushButton("Create N VMs")
+        self.bulk_create_btn.clicked.connect(self.bulk_create)
+        bulk_layout.addWidget(self.bulk_create_btn)
+        layout.addLayout(bulk_layout)
+
+        self.bulk_status_label = QLabel("")
+        layout.addWidget(self.bulk_status_label)
+
         self.setLayout(layout)
+        self.populate_presets()
+
+    def presets(self):
+        presets = dict(BUILTIN_PRESETS)
+        presets.update(self.store.get_setting(PRESETS_SETTING, {}))
+        return presets
+
+    def populate_presets(self):
+        self.preset_combo.clear()
+        self.preset_combo.addItems(sorted(self.presets()))
+
+    def apply_preset(self):
+        preset = self.presets().get(self.preset_combo.currentText())
+        if not preset:
+            return
+        self.vm_memory_spin.setValue(preset['memory'])
+        self.vm_cpu_spin.setValue(preset['cores'])
+        self.cpu_type_combo.setCurrentText(preset['cpu'])
+        self.bios_combo.setCurrentText(preset['bios'])
+        self.machine_combo.setCurrentText(preset['machine'])
+        self.vm_disk_spin.setValue(preset['disk'])
+        if preset.get('storage'):
+            self.storage_combo.setCurrentText(preset['storage'])
+        if preset.get('bridge'):
+            self.net_combo.setCurrentText(preset['bridge'])
+
+    def save_preset(self):
+        name = self.preset_name_input.text().strip()
+        if not name:
+            QMessageBox.warning(self, "Warning", "Enter a preset name.")
+            return
+        saved = self.store.get_setting(PRESETS_SETTING, {})
+        spec = self.vm_spec()
+        saved[name] = {key: spec[key] for key in ("memory", "cores", "cpu", "bios", "machine", "disk", "storage", "bridge")}
+        self.store.put_setting(PRESETS_SETTING, saved)
+        self.populate_presets()
+        self.preset_combo.setCurrentText(name)
 
     def populate_storage_combo(self):
         self.storage_combo.clear()
@@ -128,6 +278,7 @@ class CreateVMTab(QWidget):
 
     def populate_iso_combo(self):
         self.iso_combo.clear()
+        self.iso_combo.addItem(NO_ISO)
         node = self.node_combo.currentText() or "pve"
         try:
             storages = self.proxmox.nodes(node).storage.get()
@@ -140,78 +291,130 @@ class CreateVMTab(QWidget):
                         if item.get('content') == 'iso':
                             iso_list.append((storage_name, item['volid']))
             for storage_name, volid in iso_list:
-                self.iso_combo.addItem(f"{storage_name}:{volid}")
+                # volid already reads 'storage:iso/name.iso'
+                self.iso_combo.addItem(volid)
         except Exception as e:
             print(f"Failed to populate ISO combo: {e}")
 
+    def vm_spec(self, n=None, vmid=None):
+        """The form as a vm_create_params spec; {n}/{vmid} in ipconfig0 are expanded when given."""
+        ipconfig = self.ipconfig_input.text().strip()
+        if ipconfig and n is not None:
+            ipconfig = expand_pattern(ipconfig, n, vmid)
+        return {
+            "memory": self.vm_memory_spin.value(),
+            "cores": self.vm_cpu_spin.value(),
+            "cpu": self.cpu_type_combo.currentText(),
+            "bios": self.bios_combo.currentText(),  # 'seabios' or 'ovmf'
+            "machine": self.machine_combo.currentText(),  # 'pc' or 'q35'
+            "disk": self.vm_disk_spin.value(),
+            "storage": self.storage_combo.currentText(),
+            "iso": "" if self.iso_combo.currentText() == NO_ISO else self.iso_combo.currentText(),
+            "bridge": self.net_combo.currentText(),  # e.g. vmbr0
+            "cloudinit": self.cloudinit_cb.isChecked(),
+            "ciuser": self.ciuser_input.text().strip(),
+            "sshkeys": self.sshkey_input.text().strip(),
+            "ipconfig0": ipconfig,
+        }
+
     def create_vm(self):
+        """POST /nodes/{node}/qemu with disks, network, boot order and cloud-init in one request."""
         node = self.node_combo.currentText() or "pve"
         vm_name = self.vm_name_input.text().strip()
-        vm_memory = self.vm_memory_spin.value()
-        vm_cpu = self.vm_cpu_spin.value()
-        cpu_type = self.cpu_type_combo.currentText()
-        bios_type = self.bios_combo.currentText()  # 'seabios' or 'ovmf'
-        machine_type = self.machine_combo.currentText()  # 'pc' or 'q35'
-
-        vm_disk_size = self.vm_disk_spin.value()
-        storage_name = self.storage_combo.currentText()
-        iso_volid = self.iso_combo.currentText()
-
-        bridge_name = self.net_combo.currentText()  # e.g. vmbr0
-
         if not vm_name:
             QMessageBox.warning(self, "Warning", "Please specify a VM name.")
             return
+        if not self.storage_combo.currentText():
+            QMessageBox.warning(self, "Warning", "Please select a storage for the disk.")
+            return
 
-        # generate a naive new VM ID
-        new_vmid = 100 + len(self.list_vms())
         try:
-            # Step 1: create the base VM config
-            self.proxmox.nodes(node).qemu.post(
-                vmid=new_vmid,
-                name=vm_name,
-                memory=vm_memory,
-                cores=vm_cpu,
-                cpu=cpu_type,  # advanced CPU type
-                bios=bios_type,
-                machine=machine_type,
-                scsihw="virtio-scsi-pci",
-                sata0=f"{storage_name}:iso/{iso_volid}",
-                boot="cdrom",
-                bootdisk="scsi0"
-            )
-
-            # Step 2: Allocate disk
-            disk_params = {
-                "vmid": new_vmid,
-                "size": f"{vm_disk_size}G",
-                "storage": storage_name,
-                "disk": "scsi0",
-                "cache": "writeback"
-            }
-            self.proxmox.nodes(node).qemu.post(**disk_params)
-
-            # Step 3: Configure net0 bridging, using virtio model
-            net_params = {
-                "net0": f"virtio,bridge={bridge_name}"
-            }
-            self.proxmox.nodes(node).qemu(new_vmid).config.put(**net_params)
-
+            new_vmid = self.allocator.allocate()[0]
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to allocate a VMID: {e}")
+            return
+        try:
+            params = vm_create_params(new_vmid, vm_name, self.vm_spec(n=1, vmid=new_vmid))
+            self.proxmox.nodes(node).qemu.post(**params)
             QMessageBox.information(self, "Success", f"Created VM {vm_name} with ID {new_vmid}")
         except Exception as e:
+            self.allocator.release([new_vmid])
             QMessageBox.critical(self, "Error", f"Failed to create VM: {e}")
 
-    def list_vms(self):
+    def bulk_create(self):
         """
-        Helper to count existing VMs for new_vmid calc.
+        N VMs from the current form (e.g. after applying a preset), one
+        POST /nodes/{node}/qemu each, run concurrently and tracked as tasks.
         """
-        vm_list = []
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "A bulk creation is still running.")
+            return
+        node = self.node_combo.currentText() or "pve"
+        pattern = self.vm_name_input.text().strip()
+        if not pattern:
+            QMessageBox.warning(self, "Warning", "Please specify a VM name, e.g. web-{n:02}.")
+            return
+        if not self.storage_combo.currentText():
+            QMessageBox.warning(self, "Warning", "Please select a storage for the disk.")
+            return
+        count = self.bulk_count_spin.value()
+        try:
+            expand_pattern(pattern, 0, 0)
+            self.vm_spec(n=0, vmid=0)
+        except (KeyError, IndexError, ValueError) as e:
+            QMessageBox.warning(self, "Warning", f"Invalid pattern: {e}")
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Create {count} VM(s) on {node}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
         try:
-            for node_info in self.proxmox.nodes.get():
-                node_name = node_info['node']
-                qemus = self.proxmox.nodes(node_name).qemu.get()
-                for vm in qemus:
-                    vm_list.append(vm)
-        except:
-            pass
-        return vm_list
+            vmids = self.allocator.allocate(count)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to allocate VMIDs: {e}")
+            return
+
+        self.queue = TaskQueue(self.proxmox, on_change=self.update_bulk_status)
+        node_key = f"node:{node}"
+        self.queue.set_limit(node_key, self.bulk_parallel_spin.value())
+        for n, vmid in enumerate(vmids, start=1):
+            params = vm_create_params(vmid, expand_pattern(pattern, n, vmid), self.vm_spec(n=n, vmid=vmid))
+            self.queue.add(QueueJob(
+                label=params['name'],
+                start=lambda params=params: self.proxmox.nodes(node).qemu.post(**params),
+                slots=[node_key],
+                serial=f"vm:{vmid}",
+                data=vmid,
+                on_done=self.bulk_done,
+            ))
+        self.queue.poll()
+        self.poll_timer.start(3000)
+
+    def bulk_done(self, job):
+        if job.state == "failed":
+            self.allocator.release([job.data])
+
+    def poll_queue(self):
+        if not self.queue:
+            return
+        self.queue.poll()
+        if self.queue.is_idle() and self.poll_timer.isActive():
+            self.poll_timer.stop()
+            counts = self.queue.counts()
+            failed = [f"{j.label}: {j.error}" for j in self.queue.jobs if j.state == "failed"]
+            message = f"Created {counts.get('ok', 0)} VM(s), {len(failed)} failed."
+            if failed:
+                QMessageBox.warning(self, "Bulk Create", message + "\n" + "\n".join(failed[:20]))
+            else:
+                QMessageBox.information(self, "Bulk Create", message)
+
+    def update_bulk_status(self):
+        counts = self.queue.counts()
+        self.bulk_status_label.setText(
+            f"pending {counts.get('pending', 0)}, running {counts.get('running', 0)}, "
+            f"ok {counts.get('ok', 0)}, failed {counts.get('failed', 0)}"
+        )
@@ -0,0 +1,176 @@
+# proxmox_manager/tabs/firewall_index.py
+
+import ipaddress
+
+# Ports opened by the macros most often used in rules (macro=SSH etc.)
+MACRO_PORTS = {
+    "SSH": ("tcp", "22"), "RDP": ("tcp", "3389"), "HTTP": ("tcp", "80"), "HTTPS": ("tcp", "443"),
+    "Web": ("tcp", "80,443"), "DNS": (None, "53"), "SMTP": ("tcp", "25"), "MySQL": ("tcp", "3306"),
+    "PostgreSQL": ("tcp", "5432"), "Telnet": ("tcp", "23"), "FTP": ("tcp", "21"), "SMB": (None, "139,445"),
+    "VNC": ("tcp", "5900:5999"), "NTP": ("udp", "123"), "SNMP": ("udp", "161:162"), "Ping": ("icmp", ""),
+}
+
+INDEXED_FIELDS = ("level", "firewall", "type", "action", "proto", "enable")
+
+def parse_ports(value):
+    """
+    '22', '80,443', '1000:2000' -> ([22, 80, 443], [(1000, 2000)]).
+    Service names (e.g. 'ssh') cannot be resolved here and are ignored.
+    """
+    singles, ranges = [], []
+    for part in str(value or "").split(","):
+        part = part.strip()
+        if ":" in part:
+            low, high = part.split(":", 1)
+            if low.isdigit() and high.isdigit():
+                ranges.append((int(low), int(high)))
+        elif part.isdigit():
+            singles.append(int(part))
+    return singles, ranges
+
+def address_covers(rule_value, query):
+    """
+    Whether a rule's source/dest admits the query network: an empty value
+    means any address, CIDRs must contain the query, and alias/ipset names
+    only match when queried by the same name.
+    """
+    if not rule_value:
+        return True
+    try:
+        wanted = ipaddress.ip_network(query, strict=False)
+    except ValueError:
+        wanted = None
+    for item in str(rule_value).split(","):
+        item = item.strip()
+        if item == query:
+            return True
+        if wanted is None:
+            continue
+        try:
+            network = ipaddress.ip_network(item, strict=False)
+        except ValueError:
+            continue
+        if network.version == wanted.version and wanted.subnet_of(network):
+            return True
+    return False
+
+class RuleIndex:
+    """
+    In-memory index of the firewall rules of the whole cluster: cluster,
+    node, guest and security group rule lists. Rules are posted by level,
+    firewall, direction, action, protocol and enable state, and by
+    destination port (single ports in a dict, ranges checked separately),
+    so a search only touches the rules that can match.
+
+    Each firewall's rules are added and removed as a unit, so a refresh only
+    re-indexes firewalls whose config digest changed.
+    """
+    def __init__(self):
+        self.rules = {}
+        self.next_id = 0
+        self.by_firewall = {}
+        self.digests = {}
+        self.postings = {field: {} for field in INDEXED_FIELDS}
+        self.port_postings = {}
+        self.port_ranges = {}
+        self.any_port = set()
+
+    def __len__(self):
+        return len(self.rules)
+
+    def set_firewall(self, firewall, level, digest, rules):
+        """Replace the indexed rules of one firewall (GET .../firewall/rules output)."""
+        self.remove_firewall(firewall)
+        ids = []
+        for rule in rules:
+            record = {
+                "firewall": firewall,
+                "level": level,
+                "pos": int(rule.get('pos', 0)),
+                "type": rule.get('type', ''),
+                "action": rule.get('action', ''),
+                "macro": rule.get('macro', ''),
+                "proto": rule.get('proto', ''),
+                "dport": str(rule.get('dport', '')),
+                "source": rule.get('source', ''),
+                "dest": rule.get('dest', ''),
+                "iface": rule.get('iface', ''),
+                "enable": int(rule.get('enable', 0) or 0),
+                "comment": rule.get('comment', ''),
+            }
+            macro = MACRO_PORTS.get(record['macro'])
+            if macro:
+                record['proto'] = record['proto'] or (macro[0] or '')
+                record['dport'] = record['dport'] or macro[1]
+            rule_id = self.next_id
+            self.next_id += 1
+            self.rules[rule_id] = record
+            ids.append(rule_id)
+            for field in INDEXED_FIELDS:
+                self.postings[field].setdefault(record[field], set()).add(rule_id)
+            singles, ranges = parse_ports(record['dport'])
+            if not record['dport']:
+                self.any_port.add(rule_id)
+            for port in singles:
+                self.port_postings.setdefault(port, set()).add(rule_id)
+            if ranges:
+                self.port_ranges[rule_id] = ranges
+        self.by_firewall[firewall] = ids
+        self.digests[firewall] = digest
+
+    def remove_firewall(self, firewall):
+        for rule_id in self.by_firewall.pop(firewall, []):
+            record = self.rules.pop(rule_id)
+            for field in INDEXED_FIELDS:
+                ids = self.postings[field].get(record[field])
+                ids.discard(rule_id)
+                if not ids:
+                    del self.postings[field][record[field]]
+            for port in parse_ports(record['dport'])[0]:
+                ids = self.port_postings.get(port)
+                ids.discard(rule_id)
+                if not ids:
+                    del self.port_postings[port]
+            self.port_ranges.pop(rule_id, None)
+            self.any_port.discard(rule_id)
+        self.digests.pop(firewall, None)
+
+    def port_ids(self, port):
+        ids = set(self.any_port) | self.port_postings.get(port, set())
+        ids |= {rule_id for rule_id, ranges in self.port_ranges.items()
+                if any(low <= port <= high for low, high in ranges)}
+        return ids
+
+    def search(self, port=None, source=None, dest=None, **fields):
+        """
+        Rules matching every given criterion, e.g.
+        search(level='guest', type='in', action='ACCEPT', proto='tcp', port=3389, source='0.0.0.0/0').
+        A rule with no proto or port matches any protocol or port.
+        """
+        candidates = None
+        for field, value in fields.items():
+            if value is None:
+                continue
+            ids = set(self.postings[field].get(value, set()))
+            if field == "proto":
+                ids |= self.postings['proto'].get('', set())
+            candidates = ids if candidates is None else candidates & ids
+        if port is not None:
+            ids = self.port_ids(port)
+            candidates = ids if candidates is None else candidates & ids
+        if candidates is None:
+            candidates = set(self.rules)
+        result = []
+        for rule_id in candidates:
+            record = self.rules[rule_id]
+            if source is not None and not address_covers(record['source'], source):
+                continue
+            if dest is not None and not address_covers(record['dest'], dest):
+                continue
+            result.append(record)
+        return sorted(result, key=lambda r: (r['firewall'], r['pos']))
+
+    def group_users(self, group, enabled_only=True):
+        """Rules (type 'group') that include security group 'group'."""
+        ids = self.postings['type'].get('group', set()) & self.postings['action'].get(group, set())
+        return [self.rules[i] for i in ids if self.rules[i]['enable'] or not enabled_only]
@@ -0,0 +1,110 @@
+# proxmox_manager/tabs/firewall_log.py
+
+import re
+from datetime import datetime
+
+# "101 6 tap101i0-IN 14/Oct/2024:10:00:01 +0200 policy DROP: IN=fwbr101i0 ... SRC=1.2.3.4 DST=... PROTO=TCP SPT=5 DPT=22"
+LOG_LINE = re.compile(r"^(\d+) (\d+) (\S+) (\d+/\w+/\d+:\d+:\d+:\d+ [+-]\d{4}) (.*?): ?(.*)$")
+
+def parse_firewall_log_line(text):
+    """
+    A structured record of one /nodes/{node}/firewall/log line, or None for
+    lines that are not packet logs (e.g. 'Start logging').
+    """
+    m = LOG_LINE.match(text)
+    if not m:
+        return None
+    vmid, level, chain, stamp, prefix, rest = m.groups()
+    try:
+        ts = int(datetime.strptime(stamp, "%d/%b/%Y:%H:%M:%S %z").timestamp())
+    except ValueError:
+        return None
+    fields = dict(tok.split("=", 1) for tok in rest.split() if "=" in tok)
+    if "SRC" not in fields:
+        return None
+    action = prefix.split()[-1] if prefix else ""
+    return {
+        "vmid": int(vmid),
+        "level": int(level),
+        "chain": chain,
+        "time": ts,
+        "rule": f"{chain} {prefix}",
+        "action": action,
+        "src": fields.get("SRC", ""),
+        "dst": fields.get("DST", ""),
+        "proto": fields.get("PROTO", "").lower(),
+        "spt": fields.get("SPT", ""),
+        "dpt": fields.get("DPT", ""),
+        "in": fields.get("IN", ""),
+        "out": fields.get("OUT", ""),
+    }
+
+class SpaceSaving:
+    """
+    Approximate top-k counter in fixed memory (Metwally et al., "Space-Saving").
+    At most capacity keys are tracked; a new key replaces the smallest one and
+    inherits its count as error bound. Keys with more than N/capacity hits
+    are guaranteed to be kept.
+    """
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, key, count=1):
+        if key in self.counts:
+            self.counts[key] += count
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+            return
+        smallest = min(self.counts, key=self.counts.get)
+        floor = self.counts.pop(smallest)
+        self.errors.pop(smallest)
+        self.counts[key] = floor + count
+        self.errors[key] = floor
+
+    def top(self, n=10):
+        """[(key, count, error)] with the highest counts first."""
+        items = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
+        return [(key, count, self.errors[key]) for key, count in items]
+
+class WindowedTopK:
+    """
+    Top-k per dimension over sliding windows (e.g. 1m, 15m, 1h) in fixed memory:
+    a ring of per-minute SpaceSaving summaries, merged on query. Memory is
+    bounded by buckets * dimensions * capacity, however many packets arrive.
+    """
+    def __init__(self, dimensions, bucket_seconds=60, buckets=60, capacity=64):
+        self.dimensions = dimensions
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self.ring = [None] * buckets
+        self.latest = 0
+
+    def add(self, ts, values):
+        """Count one event at ts; values maps dimension -> key."""
+        slot = ts // self.bucket_seconds
+        if slot <= self.latest - len(self.ring):
+            return  # older than the longest window
+        self.latest = max(self.latest, slot)
+        bucket = self.ring[slot % len(self.ring)]
+        if bucket is None or bucket[0] != slot:
+            bucket = (slot, {d: SpaceSaving(self.capacity) for d in self.dimensions})
+            self.ring[slot % len(self.ring)] = bucket
+        for dimension, key in values.items():
+            if key:
+                bucket[1][dimension].add(key)
+
+    def top(self, dimension, window_seconds, n=10, now=None):
+        """[(key, count)] over the last window_seconds (ending at now, default the newest event)."""
+        newest = now // self.bucket_seconds if now is not None else self.latest
+        oldest = newest - max(1, window_seconds // self.bucket_seconds) + 1
+        totals = {}
+        for bucket in self.ring:
+            if bucket is None or not oldest <= bucket[0] <= newest:
+                continue
+            for key, count, error in bucket[1][dimension].top(self.capacity):
+                totals[key] = totals.get(key, 0) + count
+        return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:n]
@@ -0,0 +1,187 @@
+# proxmox_manager/tabs/firewall_log_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox,
+    QSpinBox, QPlainTextEdit, QTableWidget, QTableWidgetItem, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt, QTimer
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.firewall_log import parse_firewall_log_line, WindowedTopK
+
+PAGE_SIZE = 1000
+# Lines read per node and poll; an attack can log faster than we want to download.
+MAX_LINES_PER_POLL = 20000
+WINDOWS = {"1 min": 60, "15 min": 900, "1 hour": 3600}
+DIMENSIONS = {"src": "Top Sources", "port": "Top Ports", "rule": "Top Rules"}
+
+class FirewallLogTab(QWidget):
+    """
+    Tail of /nodes/{node}/firewall/log for one or all nodes. Each poll asks
+    only for lines since the newest one already seen (paging with start/limit),
+    parses them, and feeds dropped/rejected packets into fixed-size top-k
+    counters of sources, ports and rules over 1m, 15m and 1h windows.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.reset_state()
+        self.setup_ui()
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def reset_state(self):
+        # node -> {'since': epoch of the newest line, 'seen': lines already read at that second}
+        self.tails = {}
+        self.counters = WindowedTopK(tuple(DIMENSIONS))
+        self.dropped = 0
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Node:"))
+        self.node_combo = QComboBox()
+        self.node_combo.addItem("All nodes")
+        try:
+            self.node_combo.addItems(self.resources.node_names())
+        except Exception as e:
+            print(f"Failed to populate node combo: {e}")
+        self.node_combo.currentTextChanged.connect(self.restart)
+        top_layout.addWidget(self.node_combo)
+
+        top_layout.addWidget(QLabel("Poll every (s):"))
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(1, 300)
+        self.interval_spin.setValue(5)
+        top_layout.addWidget(self.interval_spin)
+
+        self.tail_btn = QPushButton("Start Tail")
+        self.tail_btn.clicked.connect(self.toggle_tail)
+        top_layout.addWidget(self.tail_btn)
+
+        top_layout.addWidget(QLabel("Window:"))
+        self.window_combo = QComboBox()
+        self.window_combo.addItems(list(WINDOWS))
+        self.window_combo.currentTextChanged.connect(self.show_top)
+        top_layout.addWidget(self.window_combo)
+        layout.addLayout(top_layout)
+
+        tables_layout = QHBoxLayout()
+        self.top_tables = {}
+        for dimension, title in DIMENSIONS.items():
+            table = QTableWidget()
+            table.setColumnCount(2)
+            table.setHorizontalHeaderLabels([title, "Dropped"])
+            table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+            tables_layout.addWidget(table)
+            self.top_tables[dimension] = table
+        layout.addLayout(tables_layout)
+
+        self.log_view = QPlainTextEdit()
+        self.log_view.setReadOnly(True)
+        # Keep only the newest lines; the counters above hold the long-term picture.
+        self.log_view.setMaximumBlockCount(2000)
+        layout.addWidget(self.log_view)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def nodes(self):
+        if self.node_combo.currentIndex() == 0:
+            return self.resources.node_names(online_only=True)
+        return [self.node_combo.currentText()]
+
+    def toggle_tail(self):
+        if self.poll_timer.isActive():
+            self.poll_timer.stop()
+            self.tail_btn.setText("Start Tail")
+            return
+        self.poll()
+        self.poll_timer.start(self.interval_spin.value() * 1000)
+        self.tail_btn.setText("Stop Tail")
+
+    def restart(self):
+        self.reset_state()
+        self.log_view.clear()
+        self.show_top()
+
+    def read_new_lines(self, node):
+        """
+        GET /nodes/{node}/firewall/log?since=...&start=...&limit=...
+        The first poll starts an hour back so the 1h window has data.
+        """
+        tail = self.tails.get(node) or {"since": int(time.time()) - 3600, "seen": set()}
+        lines = []
+        start = 0
+        while len(lines) < MAX_LINES_PER_POLL:
+            page = self.proxmox.nodes(node).firewall.log.get(since=tail['since'], start=start, limit=PAGE_SIZE)
+            lines.extend(entry['t'] for entry in page)
+            if len(page) < PAGE_SIZE:
+                break
+            start += PAGE_SIZE
+        return tail, lines
+
+    def poll(self):
+        try:
+            nodes = self.nodes()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list nodes: {e}")
+            return
+
+        errors = []
+        new_lines = 0
+        for node, result, error in run_parallel(self.read_new_lines, nodes):
+            if error is not None:
+                errors.append(f"{node}: {error}")
+                continue
+            tail, lines = result
+            newest = tail['since']
+            seen_at_newest = set(tail['seen'])
+            for text in lines:
+                # 'since' is inclusive at one-second resolution, so the last
+                # second of the previous poll comes back again.
+                if text in tail['seen']:
+                    continue
+                new_lines += 1
+                prefix = f"[{node}] " if len(nodes) > 1 else ""
+                self.log_view.appendPlainText(prefix + text)
+                record = parse_firewall_log_line(text)
+                if record is None:
+                    continue
+                if record['time'] > newest:
+                    newest = record['time']
+                    seen_at_newest = set()
+                if record['time'] == newest:
+                    seen_at_newest.add(text)
+                if record['action'] in ("DROP", "REJECT"):
+                    self.dropped += 1
+                    port = f"{record['proto']}/{record['dpt']}" if record['dpt'] else record['proto']
+                    self.counters.add(record['time'], {"src": record['src'], "port": port, "rule": record['rule']})
+            self.tails[node] = {"since": newest, "seen": seen_at_newest}
+
+        self.show_top()
+        self.summary_label.setText(
+            f"{new_lines} new line(s) from {len(nodes)} node(s); {self.dropped} dropped packet(s) counted."
+            + (f" Errors: {'; '.join(errors)}" if errors else "")
+        )
+
+    def show_top(self):
+        window = WINDOWS[self.window_combo.currentText()]
+        for dimension, table in self.top_tables.items():
+            top = self.counters.top(dimension, window, n=20, now=int(time.time()))
+            table.setRowCount(0)
+            for key, count in top:
+                row = table.rowCount()
+                table.insertRow(row)
+                table.setItem(row, 0, QTableWidgetItem(key))
+                item = QTableWidgetItem()
+                item.setData(Qt.ItemDataRole.DisplayRole, count)
+                table.setItem(row, 1, item)
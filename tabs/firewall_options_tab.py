@@ -2,13 +2,33 @@
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QComboBox, QCheckBox, QMessageBox
+    QComboBox, QCheckBox, QMessageBox, QListWidget, QSpinBox,
+    QTableWidget, QTableWidgetItem
 )
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.firewall_targets import firewall_targets, populate_target_list, checked_targets
+
+# Node firewall options offered in the bulk matrix (PUT /nodes/{node}/firewall/options)
+BULK_OPTIONS = [
+    "enable", "log_level_in", "log_level_out", "tcp_flags_log_level", "smurf_log_level",
+    "nosmurfs", "tcpflags", "protection_synflood", "nf_conntrack_max",
+    "nf_conntrack_tcp_timeout_established", "nf_conntrack_allow_invalid", "log_nf_conntrack", "ndp",
+]
+
+def options_diff(current, desired):
+    """The desired options whose value differs from the node's current ones."""
+    return {key: value for key, value in desired.items() if str(current.get(key, "")) != value}
 
 class FirewallOptionsTab(QWidget):
     def __init__(self, proxmox):
         super().__init__()
         self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.node_options = {}
         self.setup_ui()
 
     def setup_ui(self):
@@ -59,6 +79,41 @@ class FirewallOptionsTab(QWidget):
         self.save_btn.clicked.connect(self.save_options)
         layout.addWidget(self.save_btn)
 
+        # Bulk mode: compare and apply one options set across many nodes
+        layout.addWidget(QLabel("Bulk apply to nodes (leave Desired empty to keep a node's value):"))
+        bulk_layout = QHBoxLayout()
+        self.bulk_nodes_list = QListWidget()
+        self.bulk_nodes_list.setMaximumWidth(200)
+        bulk_layout.addWidget(self.bulk_nodes_list)
+
+        self.matrix = QTableWidget()
+        self.matrix.setRowCount(len(BULK_OPTIONS))
+        self.matrix.setVerticalHeaderLabels(BULK_OPTIONS)
+        self.matrix.setColumnCount(1)
+        self.matrix.setHorizontalHeaderLabels(["Desired"])
+        self.matrix.itemChanged.connect(self.highlight_diffs)
+        bulk_layout.addWidget(self.matrix)
+        layout.addLayout(bulk_layout)
+
+        bulk_btn_layout = QHBoxLayout()
+        self.read_all_btn = QPushButton("Read All Nodes")
+        self.read_all_btn.clicked.connect(self.read_all_nodes)
+        bulk_btn_layout.addWidget(self.read_all_btn)
+
+        bulk_btn_layout.addWidget(QLabel("Retries:"))
+        self.retries_spin = QSpinBox()
+        self.retries_spin.setRange(0, 10)
+        self.retries_spin.setValue(3)
+        bulk_btn_layout.addWidget(self.retries_spin)
+
+        self.bulk_apply_btn = QPushButton("Apply to Checked Nodes")
+        self.bulk_apply_btn.clicked.connect(self.bulk_apply)
+        bulk_btn_layout.addWidget(self.bulk_apply_btn)
+        layout.addLayout(bulk_btn_layout)
+
+        self.bulk_status_label = QLabel("")
+        layout.addWidget(self.bulk_status_label)
+
         self.setLayout(layout)
 
     def load_options(self):
@@ -102,3 +157,119 @@ class FirewallOptionsTab(QWidget):
             QMessageBox.information(self, "Saved", "Firewall options saved.")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save options: {e}")
+
+    def read_all_nodes(self):
+        """GET /nodes/{node}/firewall/options for every node, in parallel, into the diff matrix."""
+        try:
+            self.resources.refresh(force=True)
+            nodes = self.resources.node_names()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list nodes: {e}")
+            return
+        checked = {t['node'] for t in checked_targets(self.bulk_nodes_list)}
+        populate_target_list(self.bulk_nodes_list, firewall_targets(self.resources, levels=("node",)))
+        for i in range(self.bulk_nodes_list.count()):
+            item = self.bulk_nodes_list.item(i)
+            if not checked or item.data(Qt.ItemDataRole.UserRole)['node'] in checked:
+                item.setCheckState(Qt.CheckState.Checked)
+
+        errors = []
+        self.node_options = {}
+        for node, opts, error in run_parallel(lambda n: self.proxmox.nodes(n).firewall.options.get(), nodes):
+            if error is not None:
+                errors.append(f"{node}: {error}")
+                continue
+            self.node_options[node] = opts
+        self.show_matrix()
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some nodes could not be read:\n" + "\n".join(errors))
+
+    def desired_options(self):
+        desired = {}
+        for row, key in enumerate(BULK_OPTIONS):
+            item = self.matrix.item(row, 0)
+            if item and item.text().strip():
+                desired[key] = item.text().strip()
+        return desired
+
+    def show_matrix(self):
+        desired = [self.matrix.item(row, 0) for row in range(len(BULK_OPTIONS))]
+        desired = [item.text() if item else "" for item in desired]
+        nodes = sorted(self.node_options)
+        self.matrix.blockSignals(True)
+        self.matrix.setColumnCount(1 + len(nodes))
+        self.matrix.setHorizontalHeaderLabels(["Desired"] + nodes)
+        for row, key in enumerate(BULK_OPTIONS):
+            self.matrix.setItem(row, 0, QTableWidgetItem(desired[row]))
+            for col, node in enumerate(nodes, start=1):
+                value = self.node_options[node].get(key)
+                item = QTableWidgetItem("(default)" if value is None else str(value))
+                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.matrix.setItem(row, col, item)
+        self.matrix.blockSignals(False)
+        self.highlight_diffs()
+
+    def highlight_diffs(self):
+        """Color the node cells that the desired value would change."""
+        desired = self.desired_options()
+        nodes = sorted(self.node_options)
+        self.matrix.blockSignals(True)
+        for row, key in enumerate(BULK_OPTIONS):
+            for col, node in enumerate(nodes, start=1):
+                item = self.matrix.item(row, col)
+                if item is None:
+                    continue
+                differs = key in options_diff(self.node_options[node], desired)
+                item.setBackground(QColor(255, 220, 200) if differs else QColor(0, 0, 0, 0))
+        self.matrix.blockSignals(False)
+        changes = sum(1 for node in nodes if options_diff(self.node_options[node], desired))
+        self.bulk_status_label.setText(f"{changes} of {len(nodes)} node(s) differ from the desired options.")
+
+    def bulk_apply(self):
+        """
+        PUT /nodes/{node}/firewall/options with only the differing options, on
+        every checked node in parallel. Failed nodes are retried with a growing
+        pause (scheduled on a timer, so the window stays responsive), then
+        everything is read back.
+        """
+        desired = self.desired_options()
+        if not desired:
+            QMessageBox.warning(self, "Warning", "Enter at least one desired option value.")
+            return
+        nodes = [t['node'] for t in checked_targets(self.bulk_nodes_list)]
+        changes = {n: options_diff(self.node_options.get(n, {}), desired) for n in nodes}
+        changes = {n: c for n, c in changes.items() if c}
+        if not changes:
+            QMessageBox.information(self, "Firewall Options", "All checked nodes already match.")
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Change firewall options on {len(changes)} node(s)?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        self.bulk_apply_btn.setEnabled(False)
+        self.apply_round(changes, list(changes), 0)
+
+    def apply_round(self, changes, pending, attempt):
+        """One parallel PUT round; failed nodes are retried after a timer, not a sleep."""
+        errors = {}
+        for node, _, error in run_parallel(lambda n: self.proxmox.nodes(n).firewall.options.put(**changes[n]), pending):
+            if error is not None:
+                errors[node] = error
+        if errors and attempt < self.retries_spin.value():
+            self.bulk_status_label.setText(f"{len(errors)} node(s) failed, retry {attempt + 1} in {2 * (attempt + 1)}s...")
+            QTimer.singleShot(2000 * (attempt + 1), lambda: self.apply_round(changes, list(errors), attempt + 1))
+            return
+        self.bulk_apply_btn.setEnabled(True)
+
+        self.read_all_nodes()
+        message = f"Applied options to {len(changes) - len(errors)} of {len(changes)} node(s)."
+        self.bulk_status_label.setText(message)
+        if errors:
+            QMessageBox.warning(self, "Warning", message + "\n" + "\n".join(f"{n}: {e}" for n, e in errors.items()))
+        else:
+            QMessageBox.information(self, "Firewall Options", message)
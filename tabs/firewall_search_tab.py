@@ -0,0 +1,181 @@
+# proxmox_manager/tabs/firewall_search_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
+    QComboBox, QCheckBox, QTableWidget, QTableWidgetItem, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.firewall_index import RuleIndex
+from tabs.firewall_targets import firewall_targets, firewall_api
+
+LEVELS = {"Any level": None, "Cluster": "cluster", "Node": "node", "Guest": "guest", "Security group": "group"}
+
+class FirewallSearchTab(QWidget):
+    """
+    Search every firewall rule in the cluster at once, e.g. "which guests
+    accept tcp/3389 from anywhere". All rule lists (cluster, nodes, guests
+    and security groups) are fetched concurrently into an in-memory index;
+    refreshing re-indexes only the firewalls whose rules changed.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.index = RuleIndex()
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self.refresh_btn = QPushButton("Build / Refresh Index")
+        self.refresh_btn.clicked.connect(self.refresh_index)
+        top_layout.addWidget(self.refresh_btn)
+        self.index_label = QLabel("Index not built")
+        top_layout.addWidget(self.index_label)
+        layout.addLayout(top_layout)
+
+        filter_layout = QHBoxLayout()
+        self.level_combo = QComboBox()
+        self.level_combo.addItems(list(LEVELS))
+        filter_layout.addWidget(self.level_combo)
+
+        self.direction_combo = QComboBox()
+        self.direction_combo.addItems(["Any direction", "in", "out"])
+        filter_layout.addWidget(self.direction_combo)
+
+        self.action_combo = QComboBox()
+        self.action_combo.addItems(["Any action", "ACCEPT", "DROP", "REJECT"])
+        filter_layout.addWidget(self.action_combo)
+
+        self.proto_input = QLineEdit()
+        self.proto_input.setPlaceholderText("Proto (tcp)")
+        filter_layout.addWidget(self.proto_input)
+
+        self.port_input = QLineEdit()
+        self.port_input.setPlaceholderText("Dest port (3389)")
+        filter_layout.addWidget(self.port_input)
+
+        self.source_input = QLineEdit()
+        self.source_input.setPlaceholderText("Source (0.0.0.0/0)")
+        filter_layout.addWidget(self.source_input)
+
+        self.dest_input = QLineEdit()
+        self.dest_input.setPlaceholderText("Dest")
+        filter_layout.addWidget(self.dest_input)
+        layout.addLayout(filter_layout)
+
+        option_layout = QHBoxLayout()
+        self.enabled_check = QCheckBox("Enabled rules only")
+        self.enabled_check.setChecked(True)
+        option_layout.addWidget(self.enabled_check)
+
+        self.groups_check = QCheckBox("Include rules inherited from security groups")
+        self.groups_check.setChecked(True)
+        option_layout.addWidget(self.groups_check)
+
+        self.search_btn = QPushButton("Search")
+        self.search_btn.clicked.connect(self.search)
+        option_layout.addWidget(self.search_btn)
+        layout.addLayout(option_layout)
+
+        self.result_table = QTableWidget()
+        self.result_table.setColumnCount(11)
+        self.result_table.setHorizontalHeaderLabels([
+            "Firewall", "Pos", "Direction", "Action", "Proto", "Dest Port",
+            "Source", "Dest", "Enabled", "Via Group", "Comment"
+        ])
+        self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.result_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def sources(self):
+        """(label, level, rules endpoint) of every firewall with a rule list."""
+        self.resources.refresh(force=True)
+        sources = [
+            (t['label'], t['level'], firewall_api(self.proxmox, t).rules)
+            for t in firewall_targets(self.resources)
+        ]
+        for group in self.proxmox.cluster.firewall.groups.get():
+            name = group['group']
+            sources.append((f"Group {name}", "group", self.proxmox.cluster.firewall.groups(name)))
+        return sources
+
+    def refresh_index(self):
+        """GET every rule list in parallel; re-index those whose digest changed."""
+        started = time.time()
+        try:
+            sources = self.sources()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list firewalls: {e}")
+            return
+
+        errors = []
+        changed = 0
+        for (label, level, endpoint), rules, error in run_parallel(lambda s: s[2].get(), sources, max_workers=16):
+            if error is not None:
+                errors.append(f"{label}: {error}")
+                continue
+            digest = rules[0].get('digest') if rules else ""
+            if label in self.index.digests and self.index.digests[label] == digest:
+                continue
+            self.index.set_firewall(label, level, digest, rules)
+            changed += 1
+        current = {s[0] for s in sources}
+        for label in set(self.index.digests) - current:
+            self.index.remove_firewall(label)
+
+        self.index_label.setText(
+            f"{len(self.index)} rule(s) in {len(self.index.digests)} firewall(s); "
+            f"{changed} re-indexed in {time.time() - started:.1f}s"
+        )
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some rule lists could not be read:\n" + "\n".join(errors[:20]))
+
+    def search(self):
+        port = self.port_input.text().strip()
+        if port and not port.isdigit():
+            QMessageBox.warning(self, "Warning", "Dest port must be a number.")
+            return
+        level = LEVELS[self.level_combo.currentText()]
+        criteria = {
+            "type": self.direction_combo.currentText() if self.direction_combo.currentIndex() else None,
+            "action": self.action_combo.currentText() if self.action_combo.currentIndex() else None,
+            "proto": self.proto_input.text().strip() or None,
+            "enable": 1 if self.enabled_check.isChecked() else None,
+            "port": int(port) if port else None,
+            "source": self.source_input.text().strip() or None,
+            "dest": self.dest_input.text().strip() or None,
+        }
+
+        started = time.perf_counter()
+        rows = [(r, "") for r in self.index.search(level=level, **criteria)]
+        if self.groups_check.isChecked() and level != "group":
+            # A group's rules apply wherever the group is included (a rule of type 'group').
+            for rule in self.index.search(level="group", **criteria):
+                group = rule['firewall'][len("Group "):]
+                for user in self.index.group_users(group, enabled_only=self.enabled_check.isChecked()):
+                    if level is None or user['level'] == level:
+                        rows.append((dict(rule, firewall=user['firewall'], pos=user['pos']), group))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.result_table.setRowCount(0)
+        for rule, via in rows:
+            row = self.result_table.rowCount()
+            self.result_table.insertRow(row)
+            cells = [
+                rule['firewall'], rule['pos'], rule['type'], rule['action'] or rule['macro'],
+                rule['proto'] or "any", rule['dport'] or "any", rule['source'] or "any",
+                rule['dest'] or "any", "yes" if rule['enable'] else "no", via, rule['comment'],
+            ]
+            for col, value in enumerate(cells):
+                self.result_table.setItem(row, col, QTableWidgetItem(str(value)))
+        self.summary_label.setText(f"{len(rows)} matching rule(s) in {elapsed_ms:.2f} ms.")
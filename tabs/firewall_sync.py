@@ -0,0 +1,160 @@
+# proxmox_manager/tabs/firewall_sync.py
+
+import json
+import bisect
+
+try:
+    import yaml
+except ImportError:  # YAML rule files are optional, JSON always works
+    yaml = None
+
+RULE_FIELDS = (
+    "type", "action", "macro", "proto", "source", "dest", "sport", "dport",
+    "iface", "icmp-type", "log", "enable", "comment"
+)
+# Fields that can change in place (PUT) without the rule becoming a different rule
+MUTABLE_FIELDS = ("enable", "comment", "log")
+
+def normalize_rule(rule):
+    """
+    The comparable part of a firewall rule: known fields only, as strings,
+    without empty values or defaults. GET .../firewall/rules also returns
+    pos, digest and ipversion, which are not part of the rule itself.
+    """
+    norm = {}
+    for field in RULE_FIELDS:
+        value = rule.get(field)
+        if value is None or value == "":
+            continue
+        norm[field] = str(value)
+    norm['enable'] = "1" if norm.get('enable', "0") not in ("0", "") else "0"
+    if norm.get('log') == "nolog":
+        del norm['log']
+    return norm
+
+def rule_identity(rule):
+    return tuple((f, rule[f]) for f in RULE_FIELDS if f in rule and f not in MUTABLE_FIELDS)
+
+def load_rule_set(path):
+    """
+    Rules from a JSON or YAML file: a list of rule dicts using the API field
+    names, or {'rules': [...]}. Rules without 'enable' are enabled.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.lower().endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise ValueError("PyYAML is not installed; use a JSON rule file or pip install pyyaml.")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get('rules')
+    if not isinstance(data, list):
+        raise ValueError("Expected a list of rules or {'rules': [...]}.")
+    rules = []
+    for i, rule in enumerate(data, start=1):
+        if not isinstance(rule, dict) or not rule.get('type') or not (rule.get('action') or rule.get('macro')):
+            raise ValueError(f"Rule {i}: needs at least 'type' and 'action'.")
+        unknown = set(rule) - set(RULE_FIELDS)
+        if unknown:
+            raise ValueError(f"Rule {i}: unknown field(s) {', '.join(sorted(unknown))}.")
+        rule = dict(rule)
+        rule.setdefault('enable', 1)
+        rules.append(normalize_rule(rule))
+    return rules
+
+def longest_increasing(seq):
+    """Indexes into seq of one longest strictly increasing subsequence (O(n log n))."""
+    tails, tail_idx, prev = [], [], [None] * len(seq)
+    for i, x in enumerate(seq):
+        j = bisect.bisect_left(tails, x)
+        if j == len(tails):
+            tails.append(x)
+            tail_idx.append(i)
+        else:
+            tails[j] = x
+            tail_idx[j] = i
+        prev[i] = tail_idx[j - 1] if j else None
+    result = []
+    i = tail_idx[-1] if tail_idx else None
+    while i is not None:
+        result.append(i)
+        i = prev[i]
+    return result[::-1]
+
+def plan_rule_sync(current, desired):
+    """
+    The operations that turn the current rule list (GET .../firewall/rules)
+    into the desired one, in the order they must be applied:
+
+      {'op': 'delete', 'pos': p}
+      {'op': 'insert', 'rule': {...}}                       POST, lands at pos 0
+      {'op': 'move', 'pos': p, 'moveto': m}                 PUT moveto
+      {'op': 'update', 'pos': p, 'params': {...}, 'delete': [...]}
+
+    Unchanged rules are matched first, then rules differing only in
+    enable/comment/log become updates. Every other current rule is deleted,
+    every other desired rule inserted. Rules forming the longest run already
+    in the right order stay put, so only the rest is moved. Positions in each
+    operation are those at the time it runs.
+    """
+    current = [normalize_rule(r) for r in sorted(current, key=lambda r: int(r.get('pos', 0)))]
+    desired = [normalize_rule(r) for r in desired]
+
+    match = [None] * len(desired)
+    matched = set()
+    for key in (lambda r: tuple(sorted(r.items())), rule_identity):
+        candidates = {}
+        for c, rule in enumerate(current):
+            if c not in matched:
+                candidates.setdefault(key(rule), []).append(c)
+        for d, rule in enumerate(desired):
+            if match[d] is None and candidates.get(key(rule)):
+                match[d] = candidates[key(rule)].pop(0)
+                matched.add(match[d])
+    unmatched = set(range(len(current))) - matched
+
+    ops = [{'op': 'delete', 'pos': c} for c in sorted(unmatched, reverse=True)]
+
+    # The simulated list holds desired indexes; deleted rules are already gone.
+    matched_at = {c: d for d, c in enumerate(match) if c is not None}
+    sim = [matched_at[c] for c in range(len(current)) if c in matched_at]
+    settled = {sim[i] for i in longest_increasing(sim)}
+
+    for d in range(len(desired)):
+        if d in settled:
+            continue
+        if match[d] is None:
+            ops.append({'op': 'insert', 'rule': desired[d]})
+            sim.insert(0, d)
+        p = sim.index(d)
+        m = sim.index(d - 1) + 1 if d else 0
+        if p != m:
+            ops.append({'op': 'move', 'pos': p, 'moveto': m})
+            sim.pop(p)
+            sim.insert(m if m < p else m - 1, d)
+        settled.add(d)
+
+    for d, c in enumerate(match):
+        if c is None or current[c] == desired[d]:
+            continue
+        params = {f: v for f, v in desired[d].items() if current[c].get(f) != v}
+        removed = [f for f in current[c] if f not in desired[d]]
+        ops.append({'op': 'update', 'pos': d, 'params': params, 'delete': removed})
+    return ops
+
+def apply_rule_ops(rules_api, ops):
+    """Run plan_rule_sync operations against a .../firewall/rules endpoint, one by one."""
+    for op in ops:
+        if op['op'] == 'delete':
+            rules_api(op['pos']).delete()
+        elif op['op'] == 'insert':
+            rules_api.post(**op['rule'])
+        elif op['op'] == 'move':
+            rules_api(op['pos']).put(moveto=op['moveto'])
+        else:
+            params = dict(op['params'])
+            if op['delete']:
+                params['delete'] = ",".join(op['delete'])
+            rules_api(op['pos']).put(**params)
@@ -0,0 +1,207 @@
+# proxmox_manager/tabs/firewall_sync_tab.py
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget,
+    QLineEdit, QTableWidget, QTableWidgetItem, QMessageBox, QFileDialog
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.firewall_sync import load_rule_set, plan_rule_sync, apply_rule_ops
+from tabs.firewall_targets import firewall_targets, firewall_api, populate_target_list, checked_targets
+
+OP_NAMES = ("delete", "insert", "move", "update")
+
+class FirewallSyncTab(QWidget):
+    """
+    Declarative firewall rules: load a rule set from a JSON/YAML file and make
+    the rule list of each chosen cluster, node or guest firewall match it.
+    Only the differences are sent (delete, insert, move, update), and the
+    targets are synced concurrently.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.rules = []
+        self.plans = {}
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        file_layout = QHBoxLayout()
+        self.load_btn = QPushButton("Load Rule File")
+        self.load_btn.clicked.connect(self.load_file)
+        file_layout.addWidget(self.load_btn)
+        self.file_label = QLabel("No rule file loaded")
+        file_layout.addWidget(self.file_label)
+        layout.addLayout(file_layout)
+
+        target_layout = QHBoxLayout()
+        self.refresh_targets_btn = QPushButton("Refresh Targets")
+        self.refresh_targets_btn.clicked.connect(self.refresh_targets)
+        target_layout.addWidget(self.refresh_targets_btn)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter targets...")
+        self.filter_input.textChanged.connect(self.filter_targets)
+        target_layout.addWidget(self.filter_input)
+
+        self.check_shown_btn = QPushButton("Check Shown")
+        self.check_shown_btn.clicked.connect(lambda: self.set_shown_checked(True))
+        target_layout.addWidget(self.check_shown_btn)
+
+        self.uncheck_shown_btn = QPushButton("Uncheck Shown")
+        self.uncheck_shown_btn.clicked.connect(lambda: self.set_shown_checked(False))
+        target_layout.addWidget(self.uncheck_shown_btn)
+        layout.addLayout(target_layout)
+
+        self.target_list = QListWidget()
+        layout.addWidget(self.target_list)
+
+        action_layout = QHBoxLayout()
+        self.preview_btn = QPushButton("Preview Diff")
+        self.preview_btn.clicked.connect(self.preview)
+        action_layout.addWidget(self.preview_btn)
+
+        self.apply_btn = QPushButton("Apply to Targets")
+        self.apply_btn.clicked.connect(self.apply)
+        action_layout.addWidget(self.apply_btn)
+        layout.addLayout(action_layout)
+
+        self.diff_table = QTableWidget()
+        self.diff_table.setColumnCount(7)
+        self.diff_table.setHorizontalHeaderLabels(
+            ["Target", "Current Rules", "Delete", "Insert", "Move", "Update", "Status"]
+        )
+        self.diff_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.diff_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def load_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Select rule file", "", "Rule files (*.json *.yaml *.yml);;All files (*)"
+        )
+        if not path:
+            return
+        try:
+            self.rules = load_rule_set(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load rules: {e}")
+            return
+        self.plans = {}
+        self.file_label.setText(f"{path}: {len(self.rules)} rule(s)")
+
+    def refresh_targets(self):
+        try:
+            self.resources.refresh(force=True)
+            populate_target_list(self.target_list, firewall_targets(self.resources))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list targets: {e}")
+        self.filter_targets()
+
+    def filter_targets(self):
+        text = self.filter_input.text().strip().lower()
+        for i in range(self.target_list.count()):
+            item = self.target_list.item(i)
+            item.setHidden(bool(text) and text not in item.text().lower())
+
+    def set_shown_checked(self, checked):
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        for i in range(self.target_list.count()):
+            item = self.target_list.item(i)
+            if not item.isHidden():
+                item.setCheckState(state)
+
+    def preview(self):
+        """GET .../firewall/rules of every checked target, in parallel, and diff each against the file."""
+        if not self.rules:
+            QMessageBox.warning(self, "Warning", "Load a rule file first.")
+            return
+        targets = checked_targets(self.target_list)
+        if not targets:
+            QMessageBox.warning(self, "Warning", "Check at least one target.")
+            return
+
+        def fetch(i):
+            return firewall_api(self.proxmox, targets[i]).rules.get()
+
+        self.plans = {}
+        self.diff_table.setRowCount(0)
+        for i, current, error in run_parallel(fetch, range(len(targets)), max_workers=16):
+            target = targets[i]
+            if error is not None:
+                self.add_diff_row(target, None, None, f"read failed: {error}")
+                continue
+            ops = plan_rule_sync(current, self.rules)
+            self.plans[target['label']] = (target, ops)
+            self.add_diff_row(target, len(current), ops, "in sync" if not ops else "pending")
+
+        changes = sum(len(ops) for target, ops in self.plans.values())
+        out_of_sync = sum(1 for target, ops in self.plans.values() if ops)
+        self.summary_label.setText(
+            f"{out_of_sync} of {len(targets)} target(s) differ, {changes} rule change(s) in total."
+        )
+
+    def add_diff_row(self, target, current_count, ops, status):
+        row = self.diff_table.rowCount()
+        self.diff_table.insertRow(row)
+        counts = {name: sum(1 for op in ops if op['op'] == name) for name in OP_NAMES} if ops is not None else {}
+        cells = [target['label'], "" if current_count is None else str(current_count)]
+        cells += [str(counts[name]) if counts else "" for name in OP_NAMES]
+        cells.append(status)
+        for col, text in enumerate(cells):
+            self.diff_table.setItem(row, col, QTableWidgetItem(text))
+
+    def apply(self):
+        """
+        Sync each target that differed at preview time, re-reading its rules
+        first; operations on one target run in order, targets in parallel.
+        """
+        pending = {label: plan for label, plan in self.plans.items() if plan[1]}
+        if not pending:
+            QMessageBox.warning(self, "Warning", "Nothing to apply - preview first.")
+            return
+        changes = sum(len(ops) for target, ops in pending.values())
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Apply {changes} rule change(s) to {len(pending)} target(s)?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        def sync(label):
+            # Operations are by position, so plan again from the rules as they
+            # are now; a target edited since the preview must not get stale ops.
+            target, _ = pending[label]
+            rules_api = firewall_api(self.proxmox, target).rules
+            ops = plan_rule_sync(rules_api.get(), self.rules)
+            apply_rule_ops(rules_api, ops)
+            return len(ops)
+
+        errors = []
+        for label, applied, error in run_parallel(sync, pending, max_workers=8):
+            status = f"applied {applied} change(s)" if error is None else f"failed: {error}"
+            if error is not None:
+                errors.append(f"{label}: {error}")
+            for row in range(self.diff_table.rowCount()):
+                if self.diff_table.item(row, 0).text() == label:
+                    self.diff_table.setItem(row, 6, QTableWidgetItem(status))
+        self.plans = {}
+
+        message = f"Synced {len(pending) - len(errors)} of {len(pending)} target(s)."
+        self.summary_label.setText(message)
+        if errors:
+            # A failed target is left part-way; previewing again diffs from wherever it stopped.
+            QMessageBox.warning(self, "Warning", message + "\n" + "\n".join(errors[:20]))
+        else:
+            QMessageBox.information(self, "Firewall Sync", message)
@@ -2,7 +2,7 @@
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QPushButton,
-    QLabel, QLineEdit, QMessageBox, QComboBox
+    QLabel, QLineEdit, QMessageBox, QComboBox, QListWidgetItem
 )
 from PyQt6.QtCore import Qt
 
@@ -101,8 +101,8 @@ class FirewallTab(QWidget):
                 dport = r.get('dport', '')
                 enable = r.get('enable', 1)
                 display = f"{pos}: {direction} {action} proto={proto} dport={dport}, enable={enable}"
-                item = f"{display}"
-                # You might store the rule object or pos in item data for reference
+                item = QListWidgetItem(display)
+                item.setData(Qt.ItemDataRole.UserRole, pos)
                 self.rules_list.addItem(item)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to list firewall rules: {e}")
@@ -136,16 +136,15 @@ class FirewallTab(QWidget):
     def remove_rule(self):
         """
         DELETE /api2/json/nodes/{node}/firewall/rules/{pos}
-        We need to parse the 'pos' from the selected item text.
+        The pos is stored on the item; the list is reloaded after every
+        delete because the positions of the following rules shift.
         """
         node = self.node_combo.currentText()
         sel_item = self.rules_list.currentItem()
         if not sel_item:
             QMessageBox.warning(self, "Warning", "Select a rule first.")
             return
-        text = sel_item.text()  # e.g. "0: in ACCEPT proto=tcp dport=22..."
-        pos_str = text.split(":")[0]
-        pos_str = pos_str.strip()
+        pos_str = str(sel_item.data(Qt.ItemDataRole.UserRole))
         try:
             self.proxmox.nodes(node).firewall.rules(pos_str).delete()
             QMessageBox.information(self, "Removed", f"Removed rule at pos={pos_str}")
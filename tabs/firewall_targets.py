@@ -0,0 +1,52 @@
+# proxmox_manager/tabs/firewall_targets.py
+
+from PyQt6.QtWidgets import QListWidgetItem
+from PyQt6.QtCore import Qt
+
+from tabs.cluster_resources import guest_api
+
+def firewall_targets(resources, levels=("cluster", "node", "guest")):
+    """
+    Every firewall the cluster has at the given levels, as target dicts:
+    {'level': 'cluster'}, {'level': 'node', 'node': ...} or
+    {'level': 'guest', 'guest': <resource dict>}, each with a 'label'.
+    """
+    targets = []
+    if "cluster" in levels:
+        targets.append({"level": "cluster", "label": "Cluster"})
+    if "node" in levels:
+        for node in resources.node_names():
+            targets.append({"level": "node", "node": node, "label": f"Node {node}"})
+    if "guest" in levels:
+        for g in sorted(resources.guests(include_templates=False), key=lambda g: int(g['vmid'])):
+            targets.append({
+                "level": "guest", "guest": g,
+                "label": f"{g['type']} {g['vmid']} ({g.get('name', '')}) on {g['node']}"
+            })
+    return targets
+
+def firewall_api(proxmox, target):
+    """
+    The firewall endpoint of a target, i.e. /cluster/firewall,
+    /nodes/{node}/firewall or /nodes/{node}/{qemu|lxc}/{vmid}/firewall.
+    """
+    if target['level'] == "cluster":
+        return proxmox.cluster.firewall
+    if target['level'] == "node":
+        return proxmox.nodes(target['node']).firewall
+    return guest_api(proxmox, target['guest']).firewall
+
+def populate_target_list(list_widget, targets):
+    """Fill a QListWidget with one checkable item per target."""
+    list_widget.clear()
+    for target in targets:
+        item = QListWidgetItem(target['label'])
+        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        item.setCheckState(Qt.CheckState.Unchecked)
+        item.setData(Qt.ItemDataRole.UserRole, target)
+        list_widget.addItem(item)
+
+def checked_targets(list_widget):
+    items = [list_widget.item(i) for i in range(list_widget.count())]
+    return [item.data(Qt.ItemDataRole.UserRole) for item in items
+            if item.checkState() == Qt.CheckState.Checked]
@@ -0,0 +1,151 @@
+# proxmox_manager/tabs/ha_capacity_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox,
+    QSpinBox, QTableWidget, QTableWidgetItem, QMessageBox, QAbstractItemView
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.ha_simulation import FailoverModel, ha_services
+
+class HACapacityTab(QWidget):
+    """
+    What-if analysis of HA failover: for every combination of one or two
+    failed nodes, place their HA resources the way the CRM would (group
+    priorities, restricted groups, basic or static scheduler) and report
+    which surviving nodes end up with more memory than they have.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.results = []
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Scheduler:"))
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["basic", "static"])
+        top_layout.addWidget(self.mode_combo)
+
+        top_layout.addWidget(QLabel("Failed nodes up to:"))
+        self.failures_spin = QSpinBox()
+        self.failures_spin.setRange(1, 2)
+        self.failures_spin.setValue(2)
+        top_layout.addWidget(self.failures_spin)
+
+        self.simulate_btn = QPushButton("Simulate Failures")
+        self.simulate_btn.clicked.connect(self.simulate)
+        top_layout.addWidget(self.simulate_btn)
+        layout.addLayout(top_layout)
+
+        self.scenario_table = QTableWidget()
+        self.scenario_table.setColumnCount(5)
+        self.scenario_table.setHorizontalHeaderLabels(
+            ["Failed Nodes", "Worst Node", "Worst Mem %", "Overcommitted Nodes", "Unplaced"]
+        )
+        self.scenario_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.scenario_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.scenario_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.scenario_table.itemSelectionChanged.connect(self.show_scenario)
+        layout.addWidget(self.scenario_table)
+
+        layout.addWidget(QLabel("Projected load of the selected scenario (recovered guests at their configured memory):"))
+        self.node_table = QTableWidget()
+        self.node_table.setColumnCount(3)
+        self.node_table.setHorizontalHeaderLabels(["Node", "Mem %", "CPU %"])
+        self.node_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.node_table.setMaximumHeight(250)
+        layout.addWidget(self.node_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def fetch(self):
+        """
+        GET /cluster/resources, /cluster/ha/resources and /cluster/ha/groups
+        (fetched in parallel)
+        """
+        calls = {
+            "resources": lambda: self.resources.refresh(force=True),
+            "ha": lambda: self.proxmox.cluster.ha.resources.get(),
+            "groups": lambda: self.proxmox.cluster.ha.groups.get(),
+        }
+        results = {}
+        for name, result, error in run_parallel(lambda name: calls[name](), calls):
+            if error is not None:
+                raise RuntimeError(f"{name}: {error}")
+            results[name] = result
+        return results
+
+    def simulate(self):
+        try:
+            data = self.fetch()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to read cluster state: {e}")
+            return
+
+        nodes = {n['node']: n for n in self.resources.nodes(online_only=True)}
+        services = ha_services(data['ha'], self.resources.guests())
+        groups = {g['group']: g for g in data['groups']}
+
+        started = time.perf_counter()
+        model = FailoverModel(nodes, services, groups, mode=self.mode_combo.currentText())
+        self.results = model.analyze(max_failures=self.failures_spin.value())
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.show_results()
+        bad = sum(1 for r in self.results if r['overcommitted'] or r['unplaced'])
+        self.summary_label.setText(
+            f"{len(self.results)} scenario(s) over {len(nodes)} online node(s) and {len(services)} "
+            f"HA resource(s) in {elapsed_ms:.0f} ms; {bad} overcommit or leave resources unplaced."
+        )
+
+    def show_results(self):
+        self.scenario_table.setSortingEnabled(False)
+        self.scenario_table.setRowCount(0)
+        for index, r in enumerate(self.results):
+            row = self.scenario_table.rowCount()
+            self.scenario_table.insertRow(row)
+            over = ", ".join(f"{n} {ratio * 100:.0f}%" for n, ratio in sorted(r['overcommitted'].items()))
+            first = QTableWidgetItem(", ".join(r['failed']))
+            first.setData(Qt.ItemDataRole.UserRole, index)
+            self.scenario_table.setItem(row, 0, first)
+            self.scenario_table.setItem(row, 1, QTableWidgetItem(r['worst_node'] or ""))
+            # Numeric display data so sorting by column is numeric, not alphabetical
+            worst = QTableWidgetItem()
+            worst.setData(Qt.ItemDataRole.DisplayRole, round(r['worst_mem_ratio'] * 100, 1))
+            self.scenario_table.setItem(row, 2, worst)
+            self.scenario_table.setItem(row, 3, QTableWidgetItem(over))
+            self.scenario_table.setItem(row, 4, QTableWidgetItem(", ".join(r['unplaced'])))
+            if r['overcommitted'] or r['unplaced']:
+                for col in range(5):
+                    self.scenario_table.item(row, col).setBackground(QColor(255, 200, 200))
+        self.scenario_table.setSortingEnabled(True)
+
+    def show_scenario(self):
+        rows = {index.row() for index in self.scenario_table.selectedIndexes()}
+        self.node_table.setRowCount(0)
+        if not rows:
+            return
+        r = self.results[self.scenario_table.item(min(rows), 0).data(Qt.ItemDataRole.UserRole)]
+        for node in sorted(r['mem_ratio']):
+            row = self.node_table.rowCount()
+            self.node_table.insertRow(row)
+            self.node_table.setItem(row, 0, QTableWidgetItem(node))
+            for col, ratio in ((1, r['mem_ratio'][node]), (2, r['cpu_ratio'].get(node, 0.0))):
+                item = QTableWidgetItem()
+                item.setData(Qt.ItemDataRole.DisplayRole, round(ratio * 100, 1))
+                if ratio > 1.0:
+                    item.setBackground(QColor(255, 200, 200))
+                self.node_table.setItem(row, col, item)
@@ -0,0 +1,151 @@
+# proxmox_manager/tabs/ha_simulation.py
+
+from itertools import combinations
+
+def parse_group_nodes(nodes):
+    """HA group 'nodes' value 'a:2,b:2,c' -> [('a', 2), ('b', 2), ('c', 0)]."""
+    result = []
+    for part in str(nodes or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, priority = part.partition(":")
+        result.append((name, int(priority) if priority.isdigit() else 0))
+    return result
+
+def ha_services(ha_resources, guests):
+    """
+    Join /cluster/ha/resources with the guests of /cluster/resources into the
+    services the CRM would recover: those requested 'started' (or 'enabled').
+    """
+    by_sid = {}
+    for g in guests:
+        prefix = "ct" if g.get('type') == 'lxc' else "vm"
+        by_sid[f"{prefix}:{g.get('vmid')}"] = g
+    services = []
+    for r in ha_resources:
+        if r.get('state', 'started') not in ("started", "enabled"):
+            continue
+        guest = by_sid.get(r['sid'])
+        if guest is None:
+            continue
+        services.append({
+            "sid": r['sid'],
+            "node": guest.get('node'),
+            "mem": int(guest.get('maxmem', 0) or 0),
+            "cpu": float(guest.get('cpu', 0) or 0) * int(guest.get('maxcpu', 0) or 0),
+            "group": r.get('group', ''),
+        })
+    return services
+
+class FailoverModel:
+    """
+    What-if model of the HA manager's recovery placement.
+
+    nodes:    {name: {'maxmem', 'mem', 'maxcpu', 'cpu'}} of the online nodes
+              (cluster resources; mem/cpu are current usage incl. all guests)
+    services: [{'sid', 'node', 'mem', 'cpu', 'group'}] of HA resources that
+              would be started elsewhere; mem is their configured memory,
+              cpu the cores they currently use
+    groups:   {name: {'nodes': 'a:2,b:1', 'restricted': 0/1}}
+
+    Like the CRM, a recovered service goes to the online nodes of its group
+    with the highest priority (any online node if none is left and the group
+    is not restricted). Among those, 'basic' picks the node with the fewest
+    HA services, 'static' the one with the lowest resulting memory/CPU load,
+    mirroring the two CRM schedulers.
+    """
+    def __init__(self, nodes, services, groups, mode="basic"):
+        self.names = sorted(nodes)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.maxmem = [int(nodes[n].get('maxmem', 0) or 0) for n in self.names]
+        self.mem = [int(nodes[n].get('mem', 0) or 0) for n in self.names]
+        self.maxcpu = [int(nodes[n].get('maxcpu', 0) or 0) for n in self.names]
+        self.cpu = [float(nodes[n].get('cpu', 0) or 0) * self.maxcpu[i] for i, n in enumerate(self.names)]
+        self.mode = mode
+        self.count = [0] * len(self.names)
+        self.by_node = [[] for _ in self.names]
+        for s in sorted(services, key=lambda s: s['sid']):
+            i = self.index.get(s['node'])
+            if i is None:
+                continue
+            self.count[i] += 1
+            group = groups.get(s.get('group') or "")
+            # Priority tiers of node indexes, highest first, computed once per service
+            tiers = {}
+            for name, priority in parse_group_nodes(group['nodes']) if group else []:
+                if name in self.index:
+                    tiers.setdefault(priority, []).append(self.index[name])
+            restricted = bool(int(group.get('restricted', 0) or 0)) if group else False
+            self.by_node[i].append({
+                "sid": s['sid'],
+                "mem": int(s.get('mem', 0) or 0),
+                "cpu": float(s.get('cpu', 0) or 0),
+                "tiers": [tiers[p] for p in sorted(tiers, reverse=True)],
+                "fallback": not restricted,
+            })
+
+    def simulate(self, failed):
+        """
+        Place every service of the failed node indexes. Returns
+        (mem per node, cpu per node, unplaced sids); failed nodes keep 0 load.
+        """
+        failed = set(failed)
+        mem = list(self.mem)
+        cpu = list(self.cpu)
+        count = list(self.count)
+        alive = [i for i in range(len(self.names)) if i not in failed]
+        unplaced = []
+        for f in sorted(failed):
+            mem[f] = cpu[f] = count[f] = 0
+        for f in sorted(failed):
+            for s in self.by_node[f]:
+                candidates = []
+                for tier in s['tiers']:
+                    candidates = [i for i in tier if i not in failed]
+                    if candidates:
+                        break
+                # Restricted groups never fall back, even when none of their
+                # nodes is known; the CRM leaves such a service stopped.
+                if not candidates and s['fallback']:
+                    candidates = alive
+                if not candidates:
+                    unplaced.append(s['sid'])
+                    continue
+                if self.mode == "static":
+                    target = min(candidates, key=lambda i: (
+                        (mem[i] + s['mem']) / (self.maxmem[i] or 1),
+                        (cpu[i] + s['cpu']) / (self.maxcpu[i] or 1), i))
+                else:
+                    target = min(candidates, key=lambda i: (count[i], i))
+                mem[target] += s['mem']
+                cpu[target] += s['cpu']
+                count[target] += 1
+        return mem, cpu, unplaced
+
+    def analyze(self, max_failures=2):
+        """
+        Every combination of up to max_failures failed nodes, worst first:
+        [{'failed': names, 'worst_node', 'worst_mem_ratio', 'overcommitted':
+        {node: mem ratio}, 'cpu_ratio': {node: ratio}, 'unplaced': sids}].
+        """
+        results = []
+        n = len(self.names)
+        for k in range(1, min(max_failures, n - 1) + 1):
+            for failed in combinations(range(n), k):
+                mem, cpu, unplaced = self.simulate(failed)
+                ratios = {self.names[i]: mem[i] / self.maxmem[i]
+                          for i in range(n) if i not in failed and self.maxmem[i]}
+                worst = max(ratios, key=ratios.get) if ratios else None
+                results.append({
+                    "failed": [self.names[i] for i in failed],
+                    "worst_node": worst,
+                    "worst_mem_ratio": ratios.get(worst, 0.0),
+                    "overcommitted": {node: r for node, r in ratios.items() if r > 1.0},
+                    "mem_ratio": ratios,
+                    "cpu_ratio": {self.names[i]: cpu[i] / self.maxcpu[i]
+                                  for i in range(n) if i not in failed and self.maxcpu[i]},
+                    "unplaced": unplaced,
+                })
+        results.sort(key=lambda r: (len(r['unplaced']), r['worst_mem_ratio']), reverse=True)
+        return results
@@ -1,60 +1,259 @@
 # proxmox_manager/tabs/ha_tab.py
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QHBoxLayout, QPushButton, QMessageBox
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QListWidget, QHBoxLayout, QPushButton, QMessageBox,
+    QLabel, QComboBox, QTableWidget, QTableWidgetItem, QAbstractItemView
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import QTimer, QDateTime, QItemSelectionModel
+from PyQt6.QtGui import QColor
+
+from tabs.concurrency import run_parallel
+
+# CRM service states while a resource is being moved, stopped or recovered
+MOVING_STATES = {"migrate", "relocate", "fence", "recovery", "request_stop", "request_start", "freeze"}
+FAST_POLL_MS = 2000
+SLOW_POLL_MS = 15000
+# Keep polling fast this long after the last movement or bulk change
+FAST_POLL_HOLD_MS = 60000
+MAX_EVENTS = 200
+
+def join_ha_status(status, resources, groups):
+    """
+    Combine GET /cluster/ha/status/current, /cluster/ha/resources and
+    /cluster/ha/groups into (quorum, master node, {node: lrm status}, services).
+    Each service dict has sid, requested state, crm_state, node, group, group
+    nodes and the status text the CRM reports.
+    """
+    quorum = {}
+    master = None
+    lrm = {}
+    services = {}
+    for entry in status:
+        kind = entry.get('type')
+        if kind == 'quorum':
+            quorum = entry
+        elif kind == 'master':
+            master = entry.get('node')
+        elif kind == 'lrm':
+            lrm[entry.get('node')] = entry.get('status', '')
+        elif kind == 'service':
+            services[entry['sid']] = entry
+
+    group_nodes = {g['group']: g.get('nodes', '') for g in groups}
+    joined = []
+    for r in resources:
+        sid = r['sid']
+        s = services.get(sid, {})
+        joined.append({
+            "sid": sid,
+            "requested": r.get('state', 'started'),
+            "crm_state": s.get('crm_state', s.get('state', '')),
+            "node": s.get('node', ''),
+            "group": r.get('group', ''),
+            "group_nodes": group_nodes.get(r.get('group', ''), ''),
+            "status": s.get('status', ''),
+            "comment": r.get('comment', ''),
+        })
+    return quorum, master, lrm, joined
+
+def is_moving(service):
+    return service['crm_state'] in MOVING_STATES
 
 class HATab(QWidget):
+    """
+    Live HA view: quorum, CRM master and LRM state per node, and every HA
+    resource with its requested and actual CRM state, node and group.
+    Polls slowly while the cluster is calm and every few seconds while
+    resources are migrating, relocating, being fenced or recovered.
+    """
     def __init__(self, proxmox):
         super().__init__()
         self.proxmox = proxmox
+        self.services = {}
+        self.live = False
+        self.fast_until = 0
         self.setup_ui()
 
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setSingleShot(True)
+        self.poll_timer.timeout.connect(self.refresh_ha)
+
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
-        self.ha_list = QListWidget()
-        layout.addWidget(self.ha_list)
-
-        btn_layout = QHBoxLayout()
+        top_layout = QHBoxLayout()
         self.refresh_btn = QPushButton("Refresh HA")
         self.refresh_btn.clicked.connect(self.refresh_ha)
-        btn_layout.addWidget(self.refresh_btn)
+        top_layout.addWidget(self.refresh_btn)
+
+        self.live_btn = QPushButton("Start Live View")
+        self.live_btn.clicked.connect(self.toggle_live)
+        top_layout.addWidget(self.live_btn)
+
+        self.quorum_label = QLabel("")
+        top_layout.addWidget(self.quorum_label)
+        layout.addLayout(top_layout)
+
+        self.node_table = QTableWidget()
+        self.node_table.setColumnCount(3)
+        self.node_table.setHorizontalHeaderLabels(["Node", "CRM", "LRM"])
+        self.node_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.node_table.setMaximumHeight(150)
+        layout.addWidget(self.node_table)
 
-        # Example: place a "Set Maintenance" or "Unset Maintenance" button
-        self.maint_btn = QPushButton("Toggle Maintenance")
-        self.maint_btn.clicked.connect(self.toggle_maintenance)
-        btn_layout.addWidget(self.maint_btn)
+        self.ha_table = QTableWidget()
+        self.ha_table.setColumnCount(7)
+        self.ha_table.setHorizontalHeaderLabels(
+            ["Resource", "Requested", "CRM State", "Node", "Group", "Group Nodes", "Status"]
+        )
+        self.ha_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.ha_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.ha_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.ha_table)
 
+        btn_layout = QHBoxLayout()
+        btn_layout.addWidget(QLabel("Set state of selected:"))
+        self.state_combo = QComboBox()
+        self.state_combo.addItems(["started", "stopped", "disabled", "ignored"])
+        btn_layout.addWidget(self.state_combo)
+
+        self.state_btn = QPushButton("Apply State")
+        self.state_btn.clicked.connect(self.set_selected_state)
+        btn_layout.addWidget(self.state_btn)
         layout.addLayout(btn_layout)
+
+        layout.addWidget(QLabel("State changes seen:"))
+        self.events_list = QListWidget()
+        self.events_list.setMaximumHeight(150)
+        layout.addWidget(self.events_list)
+
         self.setLayout(layout)
 
+    def toggle_live(self):
+        self.live = not self.live
+        if not self.live:
+            self.poll_timer.stop()
+            self.live_btn.setText("Start Live View")
+            self.refresh_btn.setText("Refresh HA")
+            return
+        self.live_btn.setText("Stop Live View")
+        self.refresh_ha()
+
     def refresh_ha(self):
-        self.ha_list.clear()
-        try:
-            # https://pve.proxmox.com/pve-docs/api-viewer/index.html
-            # For example: /cluster/ha/resources
-            resources = self.proxmox.cluster.ha.resources.get()
-            for r in resources:
-                sid = r.get('sid', 'N/A')
-                state = r.get('state', 'N/A')
-                self.ha_list.addItem(f"{sid} - state={state}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to list HA resources: {e}")
-
-    def toggle_maintenance(self):
-        """Naive example: if the first selected resource is 'started', set it to maintenance, or vice versa."""
-        item = self.ha_list.currentItem()
-        if not item:
-            QMessageBox.warning(self, "Warning", "Select an HA resource.")
+        """
+        GET /cluster/ha/status/current
+        GET /cluster/ha/resources
+        GET /cluster/ha/groups
+        (fetched in parallel)
+        """
+        calls = {
+            "status": lambda: self.proxmox.cluster.ha.status.current.get(),
+            "resources": lambda: self.proxmox.cluster.ha.resources.get(),
+            "groups": lambda: self.proxmox.cluster.ha.groups.get(),
+        }
+        results = {}
+        for name, result, error in run_parallel(lambda name: calls[name](), calls):
+            if error is not None:
+                if self.live:
+                    # A failing node can make single polls fail; keep watching.
+                    self.quorum_label.setText(f"Failed to read HA {name}: {error}")
+                    self.schedule_next(moving=False)
+                else:
+                    QMessageBox.critical(self, "Error", f"Failed to read HA {name}: {error}")
+                return
+            results[name] = result
+
+        quorum, master, lrm, services = join_ha_status(results['status'], results['resources'], results['groups'])
+        self.record_events(services)
+        self.show_status(quorum, master, lrm, services)
+        if self.live:
+            # An LRM with a stale timestamp is a node about to be fenced.
+            node_lost = any("old timestamp" in s or "dead" in s for s in lrm.values())
+            self.schedule_next(moving=node_lost or any(is_moving(s) for s in services))
+
+    def schedule_next(self, moving):
+        """Poll fast while anything moves (and for a minute after), slowly otherwise."""
+        now = QDateTime.currentMSecsSinceEpoch()
+        if moving:
+            self.fast_until = now + FAST_POLL_HOLD_MS
+        interval = FAST_POLL_MS if now < self.fast_until else SLOW_POLL_MS
+        self.poll_timer.start(interval)
+        self.refresh_btn.setText(f"Refresh HA (live, every {interval // 1000}s)")
+
+    def record_events(self, services):
+        stamp = QDateTime.currentDateTime().toString("HH:mm:ss")
+        current = {s['sid']: (s['crm_state'], s['node']) for s in services}
+        if self.services:
+            for sid, (state, node) in current.items():
+                old = self.services.get(sid)
+                if old and old != (state, node):
+                    self.events_list.insertItem(0, f"{stamp} {sid}: {old[0]}@{old[1]} -> {state}@{node}")
+            while self.events_list.count() > MAX_EVENTS:
+                self.events_list.takeItem(self.events_list.count() - 1)
+        self.services = current
+
+    def show_status(self, quorum, master, lrm, services):
+        quorate = "quorate" if int(quorum.get('quorate', 0) or 0) else "NOT QUORATE"
+        self.quorum_label.setText(
+            f"Quorum: {quorate} ({quorum.get('status', '')}), CRM master: {master or 'none'}, "
+            f"updated {QDateTime.currentDateTime().toString('HH:mm:ss')}"
+        )
+
+        self.node_table.setRowCount(0)
+        for node in sorted(lrm):
+            row = self.node_table.rowCount()
+            self.node_table.insertRow(row)
+            values = [node, "master" if node == master else "", lrm[node]]
+            for col, value in enumerate(values):
+                self.node_table.setItem(row, col, QTableWidgetItem(value))
+
+        selected = set(self.selected_sids())
+        self.ha_table.setRowCount(0)
+        for s in sorted(services, key=lambda s: s['sid']):
+            row = self.ha_table.rowCount()
+            self.ha_table.insertRow(row)
+            values = [s['sid'], s['requested'], s['crm_state'], s['node'], s['group'], s['group_nodes'], s['status']]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if is_moving(s):
+                    item.setBackground(QColor(255, 235, 160))
+                elif s['crm_state'] == 'error':
+                    item.setBackground(QColor(255, 200, 200))
+                self.ha_table.setItem(row, col, item)
+            if s['sid'] in selected:
+                # selectRow() would replace the selection; add to it instead
+                self.ha_table.selectionModel().select(
+                    self.ha_table.model().index(row, 0),
+                    QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+                )
+
+    def selected_sids(self):
+        rows = sorted({index.row() for index in self.ha_table.selectedIndexes()})
+        return [self.ha_table.item(row, 0).text() for row in rows]
+
+    def set_selected_state(self):
+        """PUT /cluster/ha/resources/{sid} state=... for every selected resource, in parallel."""
+        sids = self.selected_sids()
+        if not sids:
+            QMessageBox.warning(self, "Warning", "Select one or more HA resources.")
+            return
+        state = self.state_combo.currentText()
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Set {len(sids)} HA resource(s) to '{state}'?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
             return
-        text = item.text()  # e.g. "vm:101 - state=started"
-        sid = text.split(" ")[0].strip()  # "vm:101"
-        # fetch state
-        state_str = text.split("=")[-1]
-        newstate = "maintenance" if "started" in state_str else "started"
-        try:
-            # proxmox.cluster.ha.resources(sid).post(state=newstate)
-            self.proxmox.cluster.ha.resources(sid).post(state=newstate)
-            QMessageBox.information(self, "Success", f"Set {sid} to {newstate}")
-            self.refresh_ha()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to set state: {e}")
+
+        errors = []
+        for sid, _, error in run_parallel(lambda sid: self.proxmox.cluster.ha.resources(sid).put(state=state), sids):
+            if error is not None:
+                errors.append(f"{sid}: {error}")
+        # The CRM acts on the change within seconds; watch it closely.
+        self.fast_until = QDateTime.currentMSecsSinceEpoch() + FAST_POLL_HOLD_MS
+        self.refresh_ha()
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some resources were not changed:\n" + "\n".join(errors))
@@ -0,0 +1,194 @@
+# proxmox_manager/tabs/ip_lookup_tab.py
+
+import time
+import ipaddress
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
+    QCheckBox, QTableWidget, QTableWidgetItem, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import QTimer
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.firewall_targets import firewall_targets, firewall_api
+from tabs.ip_trie import PrefixTrie
+
+def firewall_digest(ipsets, aliases):
+    """
+    The config digest of a firewall. Every entry of GET .../ipset and
+    GET .../aliases carries the digest of the file it came from, so an
+    unchanged digest means none of that firewall's sets or aliases changed.
+    """
+    for entry in list(ipsets) + list(aliases):
+        if entry.get('digest'):
+            return entry['digest']
+    return ""
+
+class IPLookupTab(QWidget):
+    """
+    Which ipset or alias matches an address? Loads every ipset and alias of
+    the cluster and guest firewalls into a prefix trie and answers both the
+    most specific match and every containing prefix. Refreshing only re-reads
+    the firewalls whose config digest changed.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.trie = PrefixTrie()
+        # firewall label -> (digest, [(network, label), ...]) currently in the trie
+        self.sources = {}
+        self.setup_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self.refresh_btn = QPushButton("Refresh Sets")
+        self.refresh_btn.clicked.connect(self.refresh)
+        top_layout.addWidget(self.refresh_btn)
+
+        self.reload_btn = QPushButton("Full Reload")
+        self.reload_btn.clicked.connect(self.full_reload)
+        top_layout.addWidget(self.reload_btn)
+
+        self.auto_check = QCheckBox("Auto refresh (60s)")
+        self.auto_check.toggled.connect(self.toggle_auto_refresh)
+        top_layout.addWidget(self.auto_check)
+        layout.addLayout(top_layout)
+
+        lookup_layout = QHBoxLayout()
+        self.ip_input = QLineEdit()
+        self.ip_input.setPlaceholderText("IP address (e.g. 203.0.113.7 or 2001:db8::1)")
+        self.ip_input.returnPressed.connect(self.lookup)
+        lookup_layout.addWidget(self.ip_input)
+
+        self.lookup_btn = QPushButton("Lookup")
+        self.lookup_btn.clicked.connect(self.lookup)
+        lookup_layout.addWidget(self.lookup_btn)
+        layout.addLayout(lookup_layout)
+
+        self.result_table = QTableWidget()
+        self.result_table.setColumnCount(6)
+        self.result_table.setHorizontalHeaderLabels(["Prefix", "Firewall", "Kind", "Name", "Entry", "Match"])
+        self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.result_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def toggle_auto_refresh(self, checked):
+        if checked:
+            self.refresh()
+            self.refresh_timer.start(60000)
+        else:
+            self.refresh_timer.stop()
+
+    def full_reload(self):
+        self.trie = PrefixTrie()
+        self.sources = {}
+        self.refresh()
+
+    def load_firewall(self, target, known_digest):
+        """
+        GET .../ipset and .../aliases; if the digest changed, also
+        GET .../ipset/{name} for each set. Returns (digest, prefixes or None if unchanged).
+        """
+        api = firewall_api(self.proxmox, target)
+        ipsets = api.ipset.get()
+        aliases = api.aliases.get()
+        digest = firewall_digest(ipsets, aliases)
+        if digest and digest == known_digest:
+            return digest, None
+        prefixes = []
+        for alias in aliases:
+            label = (target['label'], "alias", alias['name'], alias['cidr'])
+            prefixes.append((alias['cidr'], label))
+        for ipset in ipsets:
+            for entry in api.ipset(ipset['name']).get():
+                cidr = entry['cidr']
+                kind = "ipset (nomatch)" if int(entry.get('nomatch', 0) or 0) else "ipset"
+                prefixes.append((cidr, (target['label'], kind, ipset['name'], cidr)))
+        return digest, prefixes
+
+    def refresh(self):
+        """Re-read changed firewalls (all of them in parallel) and patch the trie."""
+        try:
+            self.resources.refresh(force=True)
+            targets = firewall_targets(self.resources, levels=("cluster", "guest"))
+        except Exception as e:
+            self.auto_check.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Failed to list firewalls: {e}")
+            return
+
+        def load(target):
+            known = self.sources.get(target['label'], (None, []))[0]
+            return self.load_firewall(target, known)
+
+        started = time.time()
+        errors = []
+        changed = 0
+        current = {t['label'] for t in targets}
+        for target, result, error in run_parallel(load, targets, max_workers=16):
+            if error is not None:
+                errors.append(f"{target['label']}: {error}")
+                continue
+            digest, prefixes = result
+            if prefixes is None:
+                continue
+            changed += 1
+            self.replace_source(target['label'], digest, prefixes)
+        for label in set(self.sources) - current:
+            self.replace_source(label, None, [])
+            del self.sources[label]
+
+        self.summary_label.setText(
+            f"{len(self.trie)} prefix(es) from {len(self.sources)} firewall(s); "
+            f"{changed} re-read in {time.time() - started:.1f}s."
+        )
+        if errors and not self.auto_check.isChecked():
+            QMessageBox.warning(self, "Warning", "Some firewalls could not be read:\n" + "\n".join(errors[:20]))
+
+    def replace_source(self, source, digest, prefixes):
+        for network, label in self.sources.get(source, (None, []))[1]:
+            self.trie.remove(network, label)
+        kept = []
+        for cidr, label in prefixes:
+            try:
+                network = ipaddress.ip_network(cidr, strict=False)
+            except ValueError:
+                continue  # alias/ipset references like '+other' or 'dc/name' are not addresses
+            self.trie.insert(network, label)
+            kept.append((network, label))
+        self.sources[source] = (digest, kept)
+
+    def lookup(self):
+        text = self.ip_input.text().strip()
+        try:
+            ipaddress.ip_address(text)
+        except ValueError:
+            QMessageBox.warning(self, "Warning", "Enter a valid IP address.")
+            return
+        started = time.perf_counter()
+        found = self.trie.matches(text)
+        elapsed_us = (time.perf_counter() - started) * 1e6
+
+        self.result_table.setRowCount(0)
+        # Most specific first, which is the prefix the firewall effectively matches
+        for depth, (network, labels) in enumerate(reversed(found)):
+            for firewall, kind, name, entry in sorted(labels):
+                row = self.result_table.rowCount()
+                self.result_table.insertRow(row)
+                cells = [str(network), firewall, kind, name, entry, "longest" if depth == 0 else "containing"]
+                for col, value in enumerate(cells):
+                    self.result_table.setItem(row, col, QTableWidgetItem(value))
+        self.summary_label.setText(
+            f"{self.result_table.rowCount()} match(es) for {text} in {elapsed_us:.1f} µs "
+            f"({len(self.trie)} prefix(es) loaded)."
+        )
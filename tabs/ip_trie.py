@@ -0,0 +1,84 @@
+# proxmox_manager/tabs/ip_trie.py
+
+import ipaddress
+
+class PrefixTrie:
+    """
+    A binary radix trie of IPv4/IPv6 networks, each carrying a set of labels
+    (e.g. which ipset or alias lists it). A lookup walks at most 32 (or 128)
+    nodes no matter how many prefixes are stored, so answering "which sets
+    contain this address" takes microseconds even with 100k entries.
+
+    Nodes are [child0, child1, entry] lists; entry is (network, labels) for
+    nodes where a stored prefix ends.
+    """
+    def __init__(self):
+        self.roots = {4: [None, None, None], 6: [None, None, None]}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def bits(network):
+        address = int(network.network_address)
+        width = network.max_prefixlen
+        return [(address >> (width - 1 - i)) & 1 for i in range(network.prefixlen)]
+
+    def insert(self, network, label):
+        network = ipaddress.ip_network(network, strict=False)
+        node = self.roots[network.version]
+        for bit in self.bits(network):
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+        if node[2] is None:
+            node[2] = (network, set())
+            self.count += 1
+        node[2][1].add(label)
+
+    def remove(self, network, label):
+        """Drop label from network; the prefix (and empty branches) go when no label is left."""
+        network = ipaddress.ip_network(network, strict=False)
+        path = [self.roots[network.version]]
+        bits = self.bits(network)
+        for bit in bits:
+            child = path[-1][bit]
+            if child is None:
+                return
+            path.append(child)
+        entry = path[-1][2]
+        if entry is None:
+            return
+        entry[1].discard(label)
+        if entry[1]:
+            return
+        path[-1][2] = None
+        self.count -= 1
+        for depth in range(len(bits), 0, -1):
+            node = path[depth]
+            if node[0] is not None or node[1] is not None or node[2] is not None:
+                break
+            path[depth - 1][bits[depth - 1]] = None
+
+    def matches(self, address):
+        """Every stored (network, labels) containing address, shortest prefix first."""
+        address = ipaddress.ip_address(address)
+        node = self.roots[address.version]
+        value = int(address)
+        width = address.max_prefixlen
+        result = []
+        for i in range(width + 1):
+            if node[2] is not None:
+                result.append(node[2])
+            if i == width:
+                break
+            node = node[(value >> (width - 1 - i)) & 1]
+            if node is None:
+                break
+        return result
+
+    def longest_match(self, address):
+        """The most specific (network, labels) containing address, or None."""
+        found = self.matches(address)
+        return found[-1] if found else None
@@ -0,0 +1,234 @@
+# proxmox_manager/tabs/ipset_import_tab.py
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget,
+    QLineEdit, QPlainTextEdit, QSpinBox, QTableWidget, QTableWidgetItem,
+    QMessageBox, QFileDialog
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import QTimer
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.firewall_targets import firewall_targets, firewall_api, populate_target_list, checked_targets
+from tabs.ipset_sync import parse_cidr_list, aggregate_networks, ipset_diff, cidr_path
+
+# Entries sent per UI update; keeps the window responsive during 20k-entry syncs.
+CHUNK_SIZE = 200
+
+class IPSetImportTab(QWidget):
+    """
+    Bulk IPSet import for blocklists. The pasted or loaded list is parsed,
+    overlapping and adjacent networks are merged, and each chosen ipset
+    (cluster or guest level) only gets the entries it is missing added and
+    the ones no longer listed removed.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.networks = []
+        self.plans = {}
+        self.plan_name = ""  # the ipset self.plans was diffed against
+        self.pending_ops = []
+        self.sync_name = ""
+        self.total_ops = 0
+        self.done_ops = 0
+        self.failed_ops = 0
+        self.errors = []
+        self.setup_ui()
+
+        self.apply_timer = QTimer(self)
+        self.apply_timer.timeout.connect(self.apply_chunk)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("IPSet name:"))
+        self.name_input = QLineEdit()
+        self.name_input.setPlaceholderText("e.g. blocklist")
+        top_layout.addWidget(self.name_input)
+
+        self.load_file_btn = QPushButton("Load File")
+        self.load_file_btn.clicked.connect(self.load_file)
+        top_layout.addWidget(self.load_file_btn)
+        layout.addLayout(top_layout)
+
+        self.cidr_edit = QPlainTextEdit()
+        self.cidr_edit.setPlaceholderText("Paste IPs/CIDRs, one or more per line (# comments allowed)")
+        layout.addWidget(self.cidr_edit)
+
+        target_layout = QHBoxLayout()
+        self.refresh_targets_btn = QPushButton("Refresh Targets")
+        self.refresh_targets_btn.clicked.connect(self.refresh_targets)
+        target_layout.addWidget(self.refresh_targets_btn)
+
+        target_layout.addWidget(QLabel("Concurrent requests:"))
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 32)
+        self.concurrency_spin.setValue(8)
+        target_layout.addWidget(self.concurrency_spin)
+        layout.addLayout(target_layout)
+
+        self.target_list = QListWidget()
+        self.target_list.setMaximumHeight(150)
+        layout.addWidget(self.target_list)
+
+        action_layout = QHBoxLayout()
+        self.preview_btn = QPushButton("Preview")
+        self.preview_btn.clicked.connect(self.preview)
+        action_layout.addWidget(self.preview_btn)
+
+        self.sync_btn = QPushButton("Sync IPSets")
+        self.sync_btn.clicked.connect(self.sync)
+        action_layout.addWidget(self.sync_btn)
+        layout.addLayout(action_layout)
+
+        self.diff_table = QTableWidget()
+        self.diff_table.setColumnCount(5)
+        self.diff_table.setHorizontalHeaderLabels(["Target", "Current Entries", "Add", "Remove", "Status"])
+        self.diff_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.diff_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def load_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Select blocklist", "", "Text files (*.txt *.list *.netset);;All files (*)")
+        if not path:
+            return
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                self.cidr_edit.setPlainText(f.read())
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to read {path}: {e}")
+
+    def refresh_targets(self):
+        """Only the cluster and guests have ipsets (/cluster/firewall/ipset, .../{vmid}/firewall/ipset)."""
+        try:
+            self.resources.refresh(force=True)
+            populate_target_list(self.target_list, firewall_targets(self.resources, levels=("cluster", "guest")))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list targets: {e}")
+
+    def preview(self):
+        """Parse and aggregate the list, then GET .../ipset/{name} of every target in parallel and diff."""
+        name = self.name_input.text().strip()
+        if not name:
+            QMessageBox.warning(self, "Warning", "Enter an IPSet name.")
+            return
+        targets = checked_targets(self.target_list)
+        if not targets:
+            QMessageBox.warning(self, "Warning", "Check at least one target.")
+            return
+        networks, bad = parse_cidr_list(self.cidr_edit.toPlainText())
+        if bad:
+            QMessageBox.warning(self, "Warning", f"{len(bad)} invalid entr(y/ies) skipped, e.g. {', '.join(bad[:5])}")
+        self.networks = aggregate_networks(networks)
+
+        def fetch(i):
+            ipsets = firewall_api(self.proxmox, targets[i]).ipset.get()
+            if not any(s.get('name') == name for s in ipsets):
+                return None  # created on sync
+            return firewall_api(self.proxmox, targets[i]).ipset(name).get()
+
+        self.plans = {}
+        self.plan_name = name
+        self.diff_table.setRowCount(0)
+        for i, entries, error in run_parallel(fetch, range(len(targets)), max_workers=16):
+            target = targets[i]
+            if error is not None:
+                self.add_row(target['label'], "", "", "", f"read failed: {error}")
+                continue
+            adds, removes = ipset_diff(entries or [], self.networks)
+            self.plans[target['label']] = (target, entries is None, adds, removes)
+            status = "new ipset" if entries is None else ("in sync" if not adds and not removes else "pending")
+            self.add_row(target['label'], len(entries or []), len(adds), len(removes), status)
+
+        total = sum(len(p[2]) + len(p[3]) for p in self.plans.values())
+        self.summary_label.setText(
+            f"{len(networks)} entr(y/ies) aggregated to {len(self.networks)} network(s); "
+            f"{total} change(s) across {len(self.plans)} target(s)."
+        )
+
+    def add_row(self, label, current, adds, removes, status):
+        row = self.diff_table.rowCount()
+        self.diff_table.insertRow(row)
+        for col, value in enumerate([label, current, adds, removes, status]):
+            self.diff_table.setItem(row, col, QTableWidgetItem(str(value)))
+
+    def sync(self):
+        """
+        POST .../ipset                 name=...      (targets without the set)
+        POST .../ipset/{name}          cidr=...      (missing entries)
+        DELETE .../ipset/{name}/{cidr}               (entries no longer listed)
+        Sent in chunks with a bounded number of concurrent requests.
+        """
+        if self.apply_timer.isActive():
+            QMessageBox.warning(self, "Warning", "A sync is still running.")
+            return
+        # The plans were diffed against the previewed set, whatever the field says now
+        name = self.plan_name
+        plans = {label: p for label, p in self.plans.items() if p[1] or p[2] or p[3]}
+        if not plans:
+            QMessageBox.warning(self, "Warning", "Nothing to sync - preview first.")
+            return
+        total = sum(len(p[2]) + len(p[3]) for p in plans.values())
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Apply {total} ipset change(s) to '{name}' on {len(plans)} target(s)?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        def create(label):
+            firewall_api(self.proxmox, plans[label][0]).ipset.post(name=name)
+
+        self.errors = []
+        missing = [label for label, p in plans.items() if p[1]]
+        for label, _, error in run_parallel(create, missing):
+            if error is not None:
+                self.errors.append(f"{label}: {error}")
+                plans.pop(label)
+
+        self.pending_ops = []
+        for label, (target, _, adds, removes) in plans.items():
+            self.pending_ops += [(label, target, 'add', cidr) for cidr in adds]
+            self.pending_ops += [(label, target, 'remove', cidr) for cidr in removes]
+        self.sync_name = name
+        self.total_ops = len(self.pending_ops)
+        self.done_ops = 0
+        self.failed_ops = 0
+        self.plans = {}
+        self.apply_timer.start(0)
+
+    def apply_chunk(self):
+        chunk, self.pending_ops = self.pending_ops[:CHUNK_SIZE], self.pending_ops[CHUNK_SIZE:]
+
+        def apply(op):
+            label, target, action, cidr = op
+            ipset = firewall_api(self.proxmox, target).ipset(self.sync_name)
+            if action == 'add':
+                ipset.post(cidr=cidr)
+            else:
+                ipset(cidr_path(cidr)).delete()
+
+        for op, _, error in run_parallel(apply, chunk, max_workers=self.concurrency_spin.value()):
+            if error is not None:
+                self.failed_ops += 1
+                self.errors.append(f"{op[0]}: {op[2]} {op[3]}: {error}")
+        self.done_ops += len(chunk)
+        self.summary_label.setText(f"Synced {self.done_ops} of {self.total_ops} change(s), {self.failed_ops} failed.")
+
+        if not self.pending_ops:
+            self.apply_timer.stop()
+            message = f"IPSet '{self.sync_name}': {self.total_ops - self.failed_ops} change(s) applied."
+            if self.errors:
+                QMessageBox.warning(self, "Warning", message + "\nFailed:\n" + "\n".join(self.errors[:20]))
+            else:
+                QMessageBox.information(self, "IPSet Import", message)
@@ -0,0 +1,57 @@
+# proxmox_manager/tabs/ipset_sync.py
+
+import ipaddress
+from urllib.parse import quote
+
+def parse_cidr_list(text):
+    """
+    Networks from a blocklist: one or more IPs/CIDRs per line, separated by
+    whitespace or commas; '#' and ';' start a comment.
+    Returns (networks, bad_tokens). Host bits are cleared (10.0.0.1/8 -> 10.0.0.0/8).
+    """
+    networks = []
+    bad = []
+    for line in text.splitlines():
+        line = line.split("#")[0].split(";")[0]
+        for token in line.replace(",", " ").split():
+            try:
+                networks.append(ipaddress.ip_network(token, strict=False))
+            except ValueError:
+                bad.append(token)
+    return networks, bad
+
+def aggregate_networks(networks):
+    """Merge overlapping and adjacent networks, e.g. 10.0.0.0/25 + 10.0.0.128/25 -> 10.0.0.0/24."""
+    v4 = [n for n in networks if n.version == 4]
+    v6 = [n for n in networks if n.version == 6]
+    return list(ipaddress.collapse_addresses(v4)) + list(ipaddress.collapse_addresses(v6))
+
+def format_cidr(network):
+    """Single hosts without a prefix length, the way the GUI shows them."""
+    if network.prefixlen == network.max_prefixlen:
+        return str(network.network_address)
+    return str(network)
+
+def cidr_path(cidr):
+    """An ipset entry as a path segment (/ipset/{name}/{cidr}); the slash must be escaped."""
+    return quote(cidr, safe="")
+
+def ipset_diff(entries, networks):
+    """
+    (adds, removes) turning the entries of GET .../ipset/{name} into exactly
+    networks. adds are CIDR strings to POST, removes the entries' own cidr
+    strings to DELETE. nomatch entries are exceptions someone added on
+    purpose and are left alone.
+    """
+    current = {}
+    for entry in entries:
+        if int(entry.get('nomatch', 0) or 0):
+            continue
+        try:
+            current[ipaddress.ip_network(entry['cidr'], strict=False)] = entry['cidr']
+        except ValueError:
+            continue
+    desired = set(networks)
+    adds = [format_cidr(n) for n in networks if n not in current]
+    removes = [cidr for n, cidr in current.items() if n not in desired]
+    return adds, removes
@@ -0,0 +1,120 @@
+# proxmox_manager/tabs/local_store.py
+
+import os
+import json
+import sqlite3
+import threading
+
+def default_store_path():
+    """~/.proxmox_manager/local.db, or $PROXMOX_MANAGER_HOME/local.db"""
+    home = os.getenv("PROXMOX_MANAGER_HOME", os.path.join(os.path.expanduser("~"), ".proxmox_manager"))
+    return os.path.join(home, "local.db")
+
+class LocalStore:
+    """
+    A small SQLite file for data worth keeping between sessions.
+    Logs of finished tasks never change, so they are cached by UPID and
+    only ever fetched from the cluster once. Settings hold JSON values
+    such as saved retention policies. History holds time series samples
+    (series, key, timestamp, value), e.g. replication durations per job.
+    """
+    def __init__(self, path=None):
+        self.path = path or default_store_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_logs (upid TEXT PRIMARY KEY, lines TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            " series TEXT NOT NULL, key TEXT NOT NULL, ts INTEGER NOT NULL, value REAL NOT NULL,"
+            " PRIMARY KEY (series, key, ts))"
+        )
+        self.conn.commit()
+
+    def get_setting(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def put_setting(self, key, value):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value))
+            )
+            self.conn.commit()
+
+    def get_task_log(self, upid):
+        """Cached log lines for upid, or None if the log was never stored."""
+        with self.lock:
+            row = self.conn.execute("SELECT lines FROM task_logs WHERE upid = ?", (upid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_task_logs(self, upids):
+        """{upid: lines} for the upids that are cached."""
+        upids = list(upids)
+        result = {}
+        with self.lock:
+            for i in range(0, len(upids), 500):
+                chunk = upids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT upid, lines FROM task_logs WHERE upid IN ({marks})", chunk
+                ).fetchall()
+                for upid, lines in rows:
+                    result[upid] = json.loads(lines)
+        return result
+
+    def put_task_logs(self, logs):
+        """Store {upid: lines}. Only pass logs of tasks that have finished."""
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO task_logs (upid, lines) VALUES (?, ?)",
+                [(upid, json.dumps(lines)) for upid, lines in logs.items()]
+            )
+            self.conn.commit()
+
+    def append_history(self, series, samples):
+        """
+        Store [(key, ts, value), ...] for series. A sample that already exists
+        (same key and timestamp) is overwritten, so re-reading the same
+        status twice does not duplicate it.
+        """
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO history (series, key, ts, value) VALUES (?, ?, ?, ?)",
+                [(series, str(key), int(ts), float(value)) for key, ts, value in samples]
+            )
+            self.conn.commit()
+
+    def history(self, series, since=0):
+        """{key: [(ts, value), ...] oldest first} for series, from since on."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, ts, value FROM history WHERE series = ? AND ts >= ? ORDER BY ts",
+                (series, int(since))
+            ).fetchall()
+        result = {}
+        for key, ts, value in rows:
+            result.setdefault(key, []).append((ts, value))
+        return result
+
+    def prune_history(self, series, before):
+        """Drop samples of series older than before (epoch seconds)."""
+        with self.lock:
+            self.conn.execute("DELETE FROM history WHERE series = ? AND ts < ?", (series, int(before)))
+            self.conn.commit()
+
+_shared = None
+
+def get_local_store():
+    """Return the LocalStore shared by every tab."""
+    global _shared
+    if _shared is None:
+        _shared = LocalStore()
+    return _shared
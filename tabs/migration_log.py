@@ -0,0 +1,154 @@
+# proxmox_manager/tabs/migration_log.py
+
+import re
+import time
+
+UNITS = {"B": 1, "KiB": 1024, "MiB": 1024**2, "GiB": 1024**3, "TiB": 1024**4,
+         "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+STAMP_RE = re.compile(r"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) ")
+TARGET_RE = re.compile(r"starting migration of (?:VM|CT) (\d+) to node '([^']+)'")
+# PVE 7+: "migration active, transferred 1.2 GiB of 8.0 GiB VM-state, 110.5 MiB/s"
+RAM_RE = re.compile(r"migration active, transferred ([\d.]+ \w+) of ([\d.]+ \w+) VM-state, ([\d.]+ \w+)/s")
+# Older QEMU: "migration status: active (transferred 123, remaining 456), total 789)"
+RAM_OLD_RE = re.compile(r"migration status: active \(transferred (\d+), remaining (\d+)\), total (\d+)\)")
+# Local disks: "drive-scsi0: transferred 1.0 GiB of 32.0 GiB (3.13%) in 10s"
+DISK_RE = re.compile(r"(drive-\w+): transferred ([\d.]+ \w+) of ([\d.]+ \w+) \(")
+DONE_RE = re.compile(r"migration (finished successfully|status: completed)|^TASK OK")
+FAILED_RE = re.compile(r"migration (aborted|problems)|^TASK ERROR")
+MAX_SAMPLES = 300
+# A counter without a progress line for this long no longer adds to the rate
+STALE_S = 10
+
+def parse_size(text):
+    """'1.2 GiB' -> bytes."""
+    number, unit = text.split()
+    return int(float(number) * UNITS.get(unit, 1))
+
+def parse_migration_line(text):
+    """
+    One qmigrate/vzmigrate task log line as a dict with 'time' (epoch or
+    None) and, where the line says so, 'target', 'ram' (transferred, total),
+    'rate' (bytes/s), 'disk' (drive, transferred, total) and 'state'
+    ('done' or 'failed'). None for lines that carry no progress.
+    """
+    record = {}
+    m = STAMP_RE.match(text)
+    if m:
+        record['time'] = int(time.mktime(time.strptime(m.group(1), "%Y-%m-%d %H:%M:%S")))
+        text = text[m.end():]
+
+    m = TARGET_RE.search(text)
+    if m:
+        record['target'] = m.group(2)
+    m = RAM_RE.search(text)
+    if m:
+        record['ram'] = (parse_size(m.group(1)), parse_size(m.group(2)))
+        record['rate'] = parse_size(m.group(3))
+    m = RAM_OLD_RE.search(text)
+    if m:
+        record['ram'] = (int(m.group(1)), int(m.group(3)))
+    m = DISK_RE.search(text)
+    if m:
+        record['disk'] = (m.group(1), parse_size(m.group(2)), parse_size(m.group(3)))
+    if DONE_RE.search(text):
+        record['state'] = "done"
+    elif FAILED_RE.search(text):
+        record['state'] = "failed"
+
+    if len(record) == ('time' in record):
+        return None
+    record.setdefault('time', None)
+    return record
+
+class MigrationProgress:
+    """
+    Progress of one migration task, fed its log lines as they arrive.
+    Transferred bytes are RAM plus local disks. Each counter (RAM, every
+    drive) gets its own rate: the one QEMU reports for RAM, or else the
+    counter's growth since its own previous timestamped line. The first
+    line of a counter only sets its baseline, so a drive showing up with
+    gigabytes already copied is no spike. The migration's rate is the sum
+    over counters that reported within STALE_S.
+    """
+    def __init__(self, upid, vmid, node):
+        self.upid = upid
+        self.vmid = vmid
+        self.node = node
+        self.target = ""
+        self.lines_read = 0
+        self.ram = (0, 0)
+        self.disks = {}
+        self.rate = 0.0
+        self.state = "running"
+        self.rates = []  # [(epoch, bytes/s)]
+        self.counters = {}  # 'ram' or drive -> (epoch, transferred) of its last line
+        self.counter_rates = {}  # 'ram' or drive -> bytes/s
+
+    def transferred(self):
+        return self.ram[0] + sum(t for t, _ in self.disks.values())
+
+    def total(self):
+        return self.ram[1] + sum(total for _, total in self.disks.values())
+
+    def phase(self):
+        if self.state != "running":
+            return self.state
+        if self.ram[1]:
+            return "memory"
+        return "disks" if self.disks else "starting"
+
+    def eta(self):
+        """Seconds left at the current rate, None when unknown."""
+        if self.state != "running" or self.rate <= 0:
+            return None
+        # RAM can be sent more than once (dirty pages), so 'left' may go below zero
+        return max(0, self.total() - self.transferred()) / self.rate
+
+    def update_counter(self, name, stamp, transferred, total):
+        last = self.counters.get(name)
+        if last is None or stamp > last[0]:
+            if last is not None:
+                self.counter_rates[name] = max(0.0, (transferred - last[1]) / (stamp - last[0]))
+            self.counters[name] = (stamp, transferred)
+        if total and transferred >= total:
+            # A finished drive (or mirror in sync) moves nothing more
+            self.counter_rates[name] = 0.0
+
+    def feed(self, lines, now=None):
+        for text in lines:
+            self.lines_read += 1
+            record = parse_migration_line(text)
+            if record is None:
+                continue
+            if 'target' in record:
+                self.target = record['target']
+            if 'state' in record and self.state == "running":
+                self.state = record['state']
+                self.counter_rates = {}
+                self.rate = 0.0
+            if 'ram' not in record and 'disk' not in record:
+                continue
+
+            stamp = record['time'] or now or time.time()
+            if 'ram' in record:
+                self.ram = record['ram']
+                if 'rate' in record:
+                    self.counter_rates['ram'] = float(record['rate'])
+                    self.counters['ram'] = (stamp, self.ram[0])
+                else:
+                    self.update_counter('ram', stamp, *self.ram)
+            if 'disk' in record:
+                drive, transferred, total = record['disk']
+                self.disks[drive] = (transferred, total)
+                self.update_counter(drive, stamp, transferred, total)
+            if self.state != "running":
+                continue
+
+            self.rate = sum(rate for name, rate in self.counter_rates.items()
+                            if stamp - self.counters[name][0] <= STALE_S)
+            if not self.rates or stamp > self.rates[-1][0]:
+                self.rates.append((stamp, self.rate))
+                del self.rates[:-MAX_SAMPLES]
+            else:
+                self.rates[-1] = (self.rates[-1][0], self.rate)
@@ -0,0 +1,184 @@
+# proxmox_manager/tabs/migration_monitor_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSpinBox,
+    QTableWidget, QTableWidgetItem
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCharts import QChart, QChartView, QLineSeries
+from PyQt6.QtGui import QPainter, QPen, QColor
+from PyQt6.QtCore import Qt, QTimer
+
+from tabs.concurrency import run_parallel
+from tabs.migration_log import MigrationProgress
+from tabs.sparkline import sparkline
+from tabs.task_queue import read_task_log, upid_node
+
+MIGRATION_TYPES = ("qmigrate", "vzmigrate")
+MAX_POINTS = 300
+# Finished migrations stay listed this long
+KEEP_FINISHED_S = 1800
+MIB = 1024**2
+
+class MigrationMonitorTab(QWidget):
+    """
+    Follows every running VM/CT migration in the cluster, wherever it was
+    started. Each poll lists running qmigrate/vzmigrate tasks from
+    /cluster/tasks and reads only the new lines of their logs, parsing
+    transferred bytes and rates into per-migration throughput and ETA and a
+    chart of the total migration bandwidth.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.migrations = {}  # upid -> MigrationProgress
+        self.finished_at = {}
+        self.total_rates = []  # [(epoch, bytes/s)]
+        self.peak_rate = 0.0
+        self.setup_ui()
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Poll every (s):"))
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(1, 60)
+        self.interval_spin.setValue(3)
+        top_layout.addWidget(self.interval_spin)
+
+        self.monitor_btn = QPushButton("Start Monitoring")
+        self.monitor_btn.clicked.connect(self.toggle_monitor)
+        top_layout.addWidget(self.monitor_btn)
+
+        self.total_label = QLabel("")
+        top_layout.addWidget(self.total_label)
+        layout.addLayout(top_layout)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(10)
+        self.table.setHorizontalHeaderLabels([
+            "VMID", "From", "To", "Phase", "Transferred (GiB)", "Total (GiB)",
+            "Rate (MiB/s)", "ETA (s)", "Throughput", "Task"
+        ])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        self.chart = QChart()
+        self.chart.setTitle("Migration throughput (MiB/s)")
+        self.chart.legend().setVisible(True)
+        self.chart_view = QChartView(self.chart)
+        self.chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
+        layout.addWidget(self.chart_view)
+
+        self.setLayout(layout)
+
+    def toggle_monitor(self):
+        if self.poll_timer.isActive():
+            self.poll_timer.stop()
+            self.monitor_btn.setText("Start Monitoring")
+            return
+        self.poll()
+        self.poll_timer.start(self.interval_spin.value() * 1000)
+        self.monitor_btn.setText("Stop Monitoring")
+
+    def discover(self):
+        """GET /cluster/tasks - add running migrations not followed yet."""
+        running = set()
+        for t in self.proxmox.cluster.tasks.get():
+            if t.get('type') not in MIGRATION_TYPES or t.get('endtime'):
+                continue
+            upid = t['upid']
+            running.add(upid)
+            if upid not in self.migrations:
+                self.migrations[upid] = MigrationProgress(upid, t.get('id', ''), t.get('node') or upid_node(upid))
+        return running
+
+    def read_new_lines(self, progress):
+        """GET /nodes/{node}/tasks/{upid}/log from the first unread line."""
+        return read_task_log(self.proxmox, progress.upid, start=progress.lines_read)
+
+    def poll(self):
+        try:
+            running = self.discover()
+        except Exception as e:
+            self.total_label.setText(f"Failed to list tasks: {e}")
+            return
+
+        now = time.time()
+        active = [p for p in self.migrations.values() if p.state == "running"]
+        for progress, lines, error in run_parallel(self.read_new_lines, active):
+            if error is not None:
+                continue
+            progress.feed(lines, now=now)
+            if progress.upid not in running and progress.state == "running":
+                # The task ended without a final progress line we recognise.
+                progress.state = "ended"
+                progress.rate = 0.0
+
+        for upid, progress in list(self.migrations.items()):
+            if progress.state != "running":
+                self.finished_at.setdefault(upid, now)
+                if now - self.finished_at[upid] > KEEP_FINISHED_S:
+                    del self.migrations[upid]
+                    del self.finished_at[upid]
+
+        total = sum(p.rate for p in self.migrations.values() if p.state == "running")
+        self.peak_rate = max(self.peak_rate, total)
+        self.total_rates.append((now, total))
+        del self.total_rates[:-MAX_POINTS]
+        self.total_label.setText(
+            f"{len(active)} active migration(s), {total / MIB:.1f} MiB/s total "
+            f"(peak {self.peak_rate / MIB:.1f} MiB/s)"
+        )
+        self.show_table()
+        self.show_chart()
+
+    def show_table(self):
+        self.table.setRowCount(0)
+        for p in sorted(self.migrations.values(), key=lambda p: (p.state != "running", p.upid)):
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            eta = p.eta()
+            numbers = [
+                p.transferred() / 1024**3, p.total() / 1024**3, p.rate / MIB,
+                round(eta) if eta is not None else None,
+            ]
+            self.table.setItem(row, 0, QTableWidgetItem(str(p.vmid)))
+            self.table.setItem(row, 1, QTableWidgetItem(p.node))
+            self.table.setItem(row, 2, QTableWidgetItem(p.target))
+            self.table.setItem(row, 3, QTableWidgetItem(p.phase()))
+            for col, value in enumerate(numbers, start=4):
+                # Numeric display data so sorting by column is numeric, not alphabetical
+                item = QTableWidgetItem()
+                if value is not None:
+                    item.setData(Qt.ItemDataRole.DisplayRole, round(value, 2))
+                self.table.setItem(row, col, item)
+            self.table.setItem(row, 8, QTableWidgetItem(sparkline([r for _, r in p.rates], width=30)))
+            self.table.setItem(row, 9, QTableWidgetItem(p.upid))
+
+    def show_chart(self):
+        self.chart.removeAllSeries()
+        if not self.total_rates:
+            return
+        start_t = self.total_rates[0][0]
+        series = [("Total", self.total_rates, "#ffffff")]
+        palette = ["#e6194b", "#3cb44b", "#ffe119", "#4363d8", "#f58231", "#911eb4", "#46f0f0", "#f032e6"]
+        for i, p in enumerate(sorted(self.migrations.values(), key=lambda p: p.upid)):
+            series.append((f"{p.vmid} -> {p.target}", p.rates[-MAX_POINTS:], palette[i % len(palette)]))
+
+        for name, points, color in series:
+            line = QLineSeries()
+            line.setName(name)
+            pen = QPen(QColor(color))
+            pen.setWidth(2)
+            line.setPen(pen)
+            for ts, rate in points:
+                if ts >= start_t:
+                    line.append(ts - start_t, rate / MIB)
+            self.chart.addSeries(line)
+        self.chart.createDefaultAxes()
@@ -0,0 +1,262 @@
+# proxmox_manager/tabs/migration_plan.py
+
+from tabs.cluster_resources import config_storages
+from tabs.ha_simulation import parse_group_nodes
+from tabs.vzdump_stats import percentile
+
+# Never plan a node past this share of its memory
+DEFAULT_MEM_LIMIT = 0.9
+
+def startup_order(value):
+    """Guest config 'startup' value 'order=3,up=30' -> 3 (None if unset)."""
+    for part in str(value or "").split(","):
+        key, _, number = part.partition("=")
+        if key.strip() == "order" and number.strip().isdigit():
+            return int(number)
+    return None
+
+def local_storages(config, node_storages):
+    """
+    Storages of a guest's disks that are not shared, i.e. the disks that must
+    be copied along with the guest. node_storages: {storage: resource dict}
+    of the guest's node.
+    """
+    local = set()
+    for storage in config_storages(config):
+        st = node_storages.get(storage)
+        if st is None or not int(st.get('shared', 0) or 0):
+            local.add(storage)
+    return local
+
+def ha_allowed_nodes(ha_resources, groups):
+    """
+    {vmid: set of nodes} for HA resources in a restricted group; the CRM
+    would move them back (or refuse) anywhere else.
+    """
+    restricted = {
+        g['group']: {name for name, _ in parse_group_nodes(g.get('nodes'))}
+        for g in groups if int(g.get('restricted', 0) or 0)
+    }
+    allowed = {}
+    for r in ha_resources:
+        nodes = restricted.get(r.get('group'))
+        if nodes is not None:
+            allowed[int(r['sid'].split(":")[1])] = nodes
+    return allowed
+
+def guest_load(guest):
+    """(memory bytes, CPU cores) a guest puts on its node; stopped guests cost nothing."""
+    if guest.get('status') != 'running':
+        return 0, 0.0
+    return int(guest.get('maxmem', 0) or 0), float(guest.get('cpu', 0) or 0) * int(guest.get('maxcpu', 0) or 0)
+
+def guest_usage(guest):
+    """(memory bytes, CPU cores) a guest uses right now, unlike guest_load's configured memory."""
+    if guest.get('status') != 'running':
+        return 0, 0.0
+    return int(guest.get('mem', 0) or 0), float(guest.get('cpu', 0) or 0) * int(guest.get('maxcpu', 0) or 0)
+
+def node_loads(nodes):
+    """{node: [mem used, maxmem, cores used, maxcpu]} from node resource dicts."""
+    loads = {}
+    for name, n in nodes.items():
+        maxcpu = int(n.get('maxcpu', 0) or 0)
+        loads[name] = [int(n.get('mem', 0) or 0), int(n.get('maxmem', 0) or 0),
+                       float(n.get('cpu', 0) or 0) * maxcpu, maxcpu]
+    return loads
+
+def can_host(guest, mem, node, load, node_storages, mem_limit):
+    """Whether node has the guest's local storages, is allowed by HA and has mem bytes left."""
+    allowed = guest.get('allowed')
+    if allowed is not None and node not in allowed:
+        return False
+    if not guest.get('local_storages', set()) <= node_storages.get(node, set()):
+        return False
+    return load[0] + mem <= load[1] * mem_limit
+
+def plan_drain(guests, nodes, node_storages, order_by="memory", mem_limit=DEFAULT_MEM_LIMIT):
+    """
+    Pick a target node for every guest being evacuated.
+
+    guests: guest resource dicts plus 'local_storages' (set), 'allowed'
+            (set of nodes or None) and 'order' (startup order or None)
+    nodes:  {name: node resource dict} of the possible targets
+    node_storages: {node: set of storage ids}
+    order_by: 'memory' moves the largest running guests first, 'startup'
+              follows the guests' startup order (unset last).
+
+    Each guest goes to the target with the lowest projected memory share
+    (then CPU share). Returns [{'guest', 'target', 'reason'}] in migration
+    order; target is None when no node can take the guest.
+    """
+    if order_by == "startup":
+        key = lambda g: (g.get('order') is None, g.get('order') or 0, -guest_load(g)[0], int(g['vmid']))
+    else:
+        key = lambda g: (-guest_load(g)[0], int(g['vmid']))
+    loads = node_loads(nodes)
+
+    plan = []
+    for guest in sorted(guests, key=key):
+        mem, cores = guest_load(guest)
+        candidates = [n for n in sorted(loads) if can_host(guest, mem, n, loads[n], node_storages, mem_limit)]
+        if not candidates:
+            plan.append({"guest": guest, "target": None, "reason": "no node with enough memory, storage or HA group"})
+            continue
+        target = min(candidates, key=lambda n: (
+            (loads[n][0] + mem) / (loads[n][1] or 1),
+            (loads[n][2] + cores) / (loads[n][3] or 1),
+        ))
+        loads[target][0] += mem
+        loads[target][2] += cores
+        plan.append({"guest": guest, "target": target, "reason": ""})
+    return plan
+
+def migration_params(guest, target, bwlimit=None):
+    """
+    Parameters for POST /nodes/{node}/{qemu|lxc}/{vmid}/migrate.
+    Running VMs migrate live (copying local disks along), running
+    containers are restarted on the target since they cannot move live.
+    """
+    params = {"target": target}
+    running = guest.get('status') == 'running'
+    if guest.get('type') == 'lxc':
+        if running:
+            params['restart'] = 1
+    elif running:
+        params['online'] = 1
+        if guest.get('local_storages'):
+            params['with-local-disks'] = 1
+    if bwlimit:
+        params['bwlimit'] = bwlimit
+    return params
+
+def rrd_demand(points, pct):
+    """
+    (memory bytes, CPU cores) a guest needs at the given percentile of its
+    GET .../rrddata points; None when the points hold no samples.
+    """
+    mem = [float(p['mem']) for p in points if p.get('mem') is not None]
+    cpu = [float(p['cpu']) * float(p.get('maxcpu', 1) or 1) for p in points if p.get('cpu') is not None]
+    if not mem or not cpu:
+        return None
+    return percentile(mem, pct), percentile(cpu, pct)
+
+class Balance:
+    """
+    Per-node memory and CPU utilization with the running sums needed to get
+    the variance after a move in constant time. The score is the weighted
+    sum of the variances of memory share and CPU share across nodes.
+    """
+    def __init__(self, loads, cpu_weight):
+        # loads: {node: [mem, maxmem, cores, maxcpu]}
+        self.loads = loads
+        self.cpu_weight = cpu_weight
+        self.n = len(loads)
+        self.sums = [0.0, 0.0, 0.0, 0.0]  # sum and sum of squares of mem share, then CPU share
+        for load in loads.values():
+            self.add(load, 1)
+
+    def shares(self, load, mem=0, cores=0.0):
+        return (load[0] + mem) / (load[1] or 1), (load[2] + cores) / (load[3] or 1)
+
+    def add(self, load, sign, mem=0, cores=0.0):
+        m, c = self.shares(load, mem, cores)
+        self.sums[0] += sign * m
+        self.sums[1] += sign * m * m
+        self.sums[2] += sign * c
+        self.sums[3] += sign * c * c
+
+    def score(self, s=None):
+        s = s or self.sums
+        mem_var = s[1] / self.n - (s[0] / self.n) ** 2
+        cpu_var = s[3] / self.n - (s[2] / self.n) ** 2
+        return (1 - self.cpu_weight) * mem_var + self.cpu_weight * cpu_var
+
+    def delta(self, node, mem, cores):
+        """Change of the four sums if mem/cores were added to node (negative to remove)."""
+        load = self.loads[node]
+        m0, c0 = self.shares(load)
+        m1, c1 = self.shares(load, mem, cores)
+        return m1 - m0, m1 * m1 - m0 * m0, c1 - c0, c1 * c1 - c0 * c0
+
+    def score_after(self, source_delta, target_delta):
+        """The score with a source and a target delta applied, without applying them."""
+        return self.score([a + b + c for a, b, c in zip(self.sums, source_delta, target_delta)])
+
+    def move(self, source, target, mem, cores):
+        for node, sign in ((source, -1), (target, 1)):
+            self.add(self.loads[node], -1)
+            self.loads[node][0] += sign * mem
+            self.loads[node][2] += sign * cores
+            self.add(self.loads[node], 1)
+
+def plan_rebalance(guests, nodes, node_storages, max_moves=10, cpu_weight=0.5,
+                   mem_limit=DEFAULT_MEM_LIMIT, allow_local_disks=False, min_gain=1e-5):
+    """
+    Greedy improvement of cluster balance: repeatedly take the single guest
+    move that lowers the utilization variance most, until max_moves moves
+    are planned or no move gains at least min_gain.
+
+    guests: guest resource dicts with 'demand' (mem bytes, cores) plus
+            'local_storages' and 'allowed' as for plan_drain
+    nodes:  {name: node resource dict}; a node's load is its current usage
+            with each guest's current usage replaced by its demand
+
+    Guests with local disks only move if allow_local_disks is set (and then
+    only to nodes with the same storages); each guest moves at most once.
+    Returns {'moves': [{'guest', 'source', 'target', 'gain'}], 'score_before',
+    'score_after', 'before'/'after': {node: (mem share, cpu share)}}.
+    """
+    loads = node_loads(nodes)
+    for g in guests:
+        load = loads.get(g['node'])
+        if load is None:
+            continue
+        # Swap the guest's current usage (not its configured size) for its demand
+        current_mem, current_cores = guest_usage(g)
+        load[0] += g['demand'][0] - current_mem
+        load[2] += g['demand'][1] - current_cores
+    for load in loads.values():
+        load[0] = max(load[0], 0)
+        load[2] = max(load[2], 0.0)
+
+    balance = Balance(loads, cpu_weight)
+    score_before = balance.score()
+    before = {name: balance.shares(load) for name, load in loads.items()}
+    movable = [
+        g for g in guests
+        if g['node'] in loads and g.get('status') == 'running'
+        and (allow_local_disks or not g.get('local_storages'))
+    ]
+    moves = []
+    moved = set()
+    while len(moves) < max_moves:
+        current = balance.score()
+        best = None
+        for g in movable:
+            if g['vmid'] in moved:
+                continue
+            mem, cores = g['demand']
+            source_delta = balance.delta(g['node'], -mem, -cores)
+            for target, load in loads.items():
+                if target == g['node']:
+                    continue
+                if not can_host(g, mem, target, load, node_storages, mem_limit):
+                    continue
+                score = balance.score_after(source_delta, balance.delta(target, mem, cores))
+                if best is None or score < best[0]:
+                    best = (score, g, target)
+        if best is None or current - best[0] < min_gain:
+            break
+        score, g, target = best
+        balance.move(g['node'], target, *g['demand'])
+        moves.append({"guest": g, "source": g['node'], "target": target, "gain": current - score})
+        moved.add(g['vmid'])
+
+    return {
+        "moves": moves,
+        "score_before": score_before,
+        "score_after": balance.score(),
+        "before": before,
+        "after": {name: balance.shares(load) for name, load in loads.items()},
+    }
@@ -0,0 +1,295 @@
+# proxmox_manager/tabs/node_drain_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox,
+    QSpinBox, QListWidget, QTableWidget, QTableWidgetItem, QAbstractItemView,
+    QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt, QTimer
+
+from tabs.cluster_resources import get_cluster_resources, guest_api
+from tabs.concurrency import run_parallel
+from tabs.migration_plan import (
+    startup_order, local_storages, ha_allowed_nodes, plan_drain, migration_params
+)
+from tabs.task_queue import QueueJob, TaskQueue
+
+ORDERS = {"Largest memory first": "memory", "Startup order": "startup"}
+
+class NodeDrainTab(QWidget):
+    """
+    Maintenance drain: move every guest off one node. Targets are planned by
+    projected free memory and CPU (respecting local disks and restricted HA
+    groups), then the migrations run concurrently within a total and a
+    per-target limit, each task tracked until it stops.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.plan = []
+        self.queue = None
+        self.started_at = None
+        self.setup_ui()
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_queue)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Drain node:"))
+        self.node_combo = QComboBox()
+        top_layout.addWidget(self.node_combo)
+        self.refresh_btn = QPushButton("Refresh Nodes")
+        self.refresh_btn.clicked.connect(self.refresh_nodes)
+        top_layout.addWidget(self.refresh_btn)
+
+        top_layout.addWidget(QLabel("Order:"))
+        self.order_combo = QComboBox()
+        self.order_combo.addItems(list(ORDERS))
+        top_layout.addWidget(self.order_combo)
+
+        top_layout.addWidget(QLabel("Max target memory %:"))
+        self.mem_limit_spin = QSpinBox()
+        self.mem_limit_spin.setRange(10, 100)
+        self.mem_limit_spin.setValue(90)
+        top_layout.addWidget(self.mem_limit_spin)
+        layout.addLayout(top_layout)
+
+        target_layout = QHBoxLayout()
+        target_layout.addWidget(QLabel("Target nodes (none selected = all others):"))
+        self.target_list = QListWidget()
+        self.target_list.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
+        self.target_list.setMaximumHeight(90)
+        target_layout.addWidget(self.target_list)
+        layout.addLayout(target_layout)
+
+        limits_layout = QHBoxLayout()
+        limits_layout.addWidget(QLabel("Parallel migrations:"))
+        self.parallel_spin = QSpinBox()
+        self.parallel_spin.setRange(1, 32)
+        self.parallel_spin.setValue(4)
+        limits_layout.addWidget(self.parallel_spin)
+
+        limits_layout.addWidget(QLabel("Per target node:"))
+        self.per_target_spin = QSpinBox()
+        self.per_target_spin.setRange(1, 16)
+        self.per_target_spin.setValue(2)
+        limits_layout.addWidget(self.per_target_spin)
+
+        limits_layout.addWidget(QLabel("Bandwidth limit per migration (MiB/s, 0 = none):"))
+        self.bwlimit_spin = QSpinBox()
+        self.bwlimit_spin.setRange(0, 100000)
+        limits_layout.addWidget(self.bwlimit_spin)
+        layout.addLayout(limits_layout)
+
+        btn_layout = QHBoxLayout()
+        self.plan_btn = QPushButton("Plan Drain")
+        self.plan_btn.clicked.connect(self.build_plan)
+        btn_layout.addWidget(self.plan_btn)
+
+        self.start_btn = QPushButton("Start Drain")
+        self.start_btn.clicked.connect(self.start_drain)
+        btn_layout.addWidget(self.start_btn)
+
+        self.cancel_btn = QPushButton("Cancel Pending")
+        self.cancel_btn.clicked.connect(self.cancel_pending)
+        btn_layout.addWidget(self.cancel_btn)
+        layout.addLayout(btn_layout)
+
+        self.plan_table = QTableWidget()
+        self.plan_table.setColumnCount(8)
+        self.plan_table.setHorizontalHeaderLabels(
+            ["VMID", "Name", "Type", "State", "Memory (GB)", "Local Disks", "Target", "Status"]
+        )
+        self.plan_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.plan_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+        self.refresh_nodes()
+
+    def refresh_nodes(self):
+        try:
+            self.resources.refresh(force=True)
+            names = self.resources.node_names(online_only=True)
+        except Exception as e:
+            print(f"Failed to list nodes: {e}")
+            return
+        current = self.node_combo.currentText()
+        self.node_combo.clear()
+        self.node_combo.addItems(names)
+        if current:
+            self.node_combo.setCurrentText(current)
+        selected = {i.text() for i in self.target_list.selectedItems()}
+        self.target_list.clear()
+        for name in names:
+            self.target_list.addItem(name)
+            if name in selected:
+                self.target_list.item(self.target_list.count() - 1).setSelected(True)
+
+    def load_guests(self, source):
+        """
+        Guests on the source node with their config details:
+        GET /nodes/{node}/{qemu|lxc}/{vmid}/config for each (in parallel),
+        plus /cluster/ha/resources and /cluster/ha/groups for restricted groups.
+        """
+        guests = [dict(g) for g in self.resources.guests(include_templates=False) if g.get('node') == source]
+        source_storages = {st['storage']: st for st in self.resources.storages(node=source)}
+        allowed = ha_allowed_nodes(self.proxmox.cluster.ha.resources.get(), self.proxmox.cluster.ha.groups.get())
+
+        errors = []
+        for guest, config, error in run_parallel(lambda g: guest_api(self.proxmox, g).config.get(), guests):
+            if error is not None:
+                errors.append(f"{guest['vmid']}: {error}")
+                config = {}
+            guest['local_storages'] = local_storages(config, source_storages)
+            guest['order'] = startup_order(config.get('startup'))
+            guest['allowed'] = allowed.get(int(guest['vmid']))
+        return guests, errors
+
+    def build_plan(self):
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "A drain is still running.")
+            return
+        source = self.node_combo.currentText()
+        if not source:
+            QMessageBox.warning(self, "Warning", "Select the node to drain.")
+            return
+        targets = [i.text() for i in self.target_list.selectedItems() if i.text() != source]
+        try:
+            self.resources.refresh(force=True)
+            nodes = {n['node']: n for n in self.resources.nodes(online_only=True) if n['node'] != source}
+            if targets:
+                nodes = {name: n for name, n in nodes.items() if name in targets}
+            guests, errors = self.load_guests(source)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to read cluster state: {e}")
+            return
+        if not nodes:
+            QMessageBox.warning(self, "Warning", "No online target node.")
+            return
+
+        node_storages = {name: {st['storage'] for st in self.resources.storages(node=name)} for name in nodes}
+        self.plan = plan_drain(
+            guests, nodes, node_storages,
+            order_by=ORDERS[self.order_combo.currentText()],
+            mem_limit=self.mem_limit_spin.value() / 100,
+        )
+        self.show_plan()
+        unplaced = sum(1 for p in self.plan if p['target'] is None)
+        self.summary_label.setText(f"{len(self.plan)} guest(s) on {source}; {unplaced} without a target.")
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some guest configs could not be read:\n" + "\n".join(errors))
+
+    def show_plan(self):
+        self.plan_table.setRowCount(0)
+        for p in self.plan:
+            g = p['guest']
+            row = self.plan_table.rowCount()
+            self.plan_table.insertRow(row)
+            values = [
+                str(g['vmid']), g.get('name', ''), g.get('type', ''), g.get('status', ''),
+                None, ", ".join(sorted(g['local_storages'])), p['target'] or "", p['reason'] or "planned",
+            ]
+            for col, value in enumerate(values):
+                if col == 4:
+                    # Numeric display data so sorting by column is numeric, not alphabetical
+                    item = QTableWidgetItem()
+                    item.setData(Qt.ItemDataRole.DisplayRole, round(int(g.get('maxmem', 0) or 0) / 1024**3, 1))
+                else:
+                    item = QTableWidgetItem(value)
+                self.plan_table.setItem(row, col, item)
+
+    def start_drain(self):
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "A drain is still running.")
+            return
+        # Guests that were queued once are not migrated again from the same plan
+        runnable = [p for p in self.plan if p['target'] and not p.get('job')]
+        if not runnable:
+            QMessageBox.warning(self, "Warning", "Nothing left to migrate; plan a drain first.")
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Migrate {len(runnable)} guest(s) off {runnable[0]['guest']['node']}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        # bwlimit is in KiB/s
+        bwlimit = self.bwlimit_spin.value() * 1024 or None
+        self.queue = TaskQueue(self.proxmox, on_change=self.update_status)
+        self.queue.set_limit("drain", self.parallel_spin.value())
+        for p in runnable:
+            target_key = f"target:{p['target']}"
+            self.queue.set_limit(target_key, self.per_target_spin.value())
+            params = migration_params(p['guest'], p['target'], bwlimit)
+            p['job'] = self.queue.add(QueueJob(
+                label=f"{p['guest']['vmid']} -> {p['target']}",
+                start=lambda p=p, params=params: guest_api(self.proxmox, p['guest']).migrate.post(**params),
+                slots=["drain", target_key],
+                serial=f"vm:{p['guest']['vmid']}",
+                recover=lambda p=p: self.find_migrate_task(p),
+            ))
+        self.started_at = time.time()
+        self.queue.poll()
+        self.poll_timer.start(3000)
+
+    def find_migrate_task(self, p):
+        """
+        The migrate request failed (e.g. timed out on a busy API) - look for a
+        migration task for this VMID that the node started anyway.
+        GET /nodes/{node}/tasks?vmid=...&typefilter=...
+        """
+        g = p['guest']
+        typefilter = "vzmigrate" if g.get('type') == 'lxc' else "qmigrate"
+        tasks = self.proxmox.nodes(g['node']).tasks.get(vmid=g['vmid'], typefilter=typefilter, source='all', limit=1)
+        started_at = p['job'].started_at or 0
+        for t in tasks:
+            if int(t.get('starttime', 0)) >= started_at - 120:
+                return t['upid']
+        return None
+
+    def poll_queue(self):
+        if not self.queue:
+            return
+        self.queue.poll()
+        if self.queue.is_idle():
+            self.poll_timer.stop()
+            self.resources.invalidate()
+            counts = self.queue.counts()
+            QMessageBox.information(
+                self, "Drain",
+                f"Drain finished in {time.time() - self.started_at:.0f}s: "
+                f"{counts.get('ok', 0)} ok, {counts.get('failed', 0)} failed."
+            )
+
+    def cancel_pending(self):
+        if self.queue:
+            self.queue.cancel_pending()
+
+    def update_status(self):
+        for row, p in enumerate(self.plan):
+            job = p.get('job')
+            if not job:
+                continue
+            status = job.state
+            if job.error:
+                status = f"{status}: {job.error}"
+            self.plan_table.setItem(row, 7, QTableWidgetItem(status))
+        counts = self.queue.counts()
+        elapsed = time.time() - self.started_at if self.started_at else 0
+        self.summary_label.setText(
+            f"pending {counts.get('pending', 0)}, running {counts.get('running', 0)}, "
+            f"ok {counts.get('ok', 0)}, failed {counts.get('failed', 0)}, "
+            f"cancelled {counts.get('cancelled', 0)} ({elapsed:.0f}s)"
+        )
@@ -0,0 +1,171 @@
+# proxmox_manager/tabs/pool_usage_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QCheckBox,
+    QTableWidget, QTableWidgetItem, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt, QTimer, QDateTime
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.local_store import get_local_store
+from tabs.sparkline import sparkline
+
+CPU_SERIES = "pool_cpu_cores"
+MEM_SERIES = "pool_mem_used"
+HISTORY_DAYS = 7
+NO_POOL = "(no pool)"
+
+def pool_aggregates(guests):
+    """
+    Per-pool totals of guest resources in one pass over /cluster/resources:
+    {pool: {'guests', 'running', 'vcpus', 'cpu_cores', 'maxmem', 'mem',
+    'maxdisk', 'disk', 'netin', 'netout'}}. netin/netout are the guests'
+    summed cumulative byte counters; rates come from pool_net_rates.
+    """
+    totals = {}
+    for g in guests:
+        pool = g.get('pool') or NO_POOL
+        t = totals.setdefault(pool, {
+            "guests": 0, "running": 0, "vcpus": 0, "cpu_cores": 0.0, "maxmem": 0, "mem": 0,
+            "maxdisk": 0, "disk": 0, "netin": 0, "netout": 0,
+        })
+        maxcpu = int(g.get('maxcpu', 0) or 0)
+        t['guests'] += 1
+        t['running'] += g.get('status') == 'running'
+        t['vcpus'] += maxcpu
+        # 'cpu' is the share of the guest's own vCPUs in use
+        t['cpu_cores'] += float(g.get('cpu', 0) or 0) * maxcpu
+        for key in ("maxmem", "mem", "maxdisk", "disk", "netin", "netout"):
+            t[key] += int(g.get(key, 0) or 0)
+    return totals
+
+def counter_rate(current, previous, elapsed):
+    """Bytes/s from two counter readings; None when there is no usable previous one."""
+    if previous is None or elapsed <= 0 or current < previous:
+        return None  # first snapshot, or counters reset by a guest restart/migration
+    return (current - previous) / elapsed
+
+def pool_net_rates(guests, previous, elapsed):
+    """
+    {pool: {'netin', 'netout'}} bytes/s, summed from per-guest counter rates
+    so guests joining a pool or restarting do not distort the total; a
+    pool's rate is None while none of its guests has a usable previous
+    reading. previous is {vmid: {'netin', 'netout'}} from the last snapshot.
+    """
+    rates = {}
+    for g in guests:
+        r = rates.setdefault(g.get('pool') or NO_POOL, {"netin": None, "netout": None})
+        last = previous.get(g['vmid'], {})
+        for key in ("netin", "netout"):
+            rate = counter_rate(int(g.get(key, 0) or 0), last.get(key), elapsed)
+            if rate is not None:
+                r[key] = (r[key] or 0.0) + rate
+    return rates
+
+class PoolUsageTab(QWidget):
+    """
+    Per-pool usage totals for billing: vCPUs, CPU in use, allocated and used
+    memory, allocated disk, network rates and running guests. One
+    /cluster/resources call covers every pool; CPU and memory samples go to
+    the local history so each pool shows a trend.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.store = get_local_store()
+        self.previous = None  # (timestamp, {vmid: net counters}) of the last refresh
+        self.setup_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh_usage)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self.refresh_btn = QPushButton("Refresh Usage")
+        self.refresh_btn.clicked.connect(self.refresh_usage)
+        top_layout.addWidget(self.refresh_btn)
+
+        self.auto_check = QCheckBox("Auto refresh (60s)")
+        self.auto_check.toggled.connect(self.toggle_auto_refresh)
+        top_layout.addWidget(self.auto_check)
+        layout.addLayout(top_layout)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(12)
+        self.table.setHorizontalHeaderLabels([
+            "Pool", "Guests", "Running", "vCPUs", "CPU Used (cores)", "Mem Alloc (GB)",
+            "Mem Used (GB)", "Disk Alloc (GB)", "Net In (MB/s)", "Net Out (MB/s)",
+            "CPU Trend", "Mem Trend"
+        ])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def toggle_auto_refresh(self, checked):
+        if checked:
+            self.refresh_usage()
+            self.refresh_timer.start(60000)
+        else:
+            self.refresh_timer.stop()
+
+    def refresh_usage(self):
+        """GET /cluster/resources, aggregated per pool, with samples appended to the history."""
+        try:
+            self.resources.refresh(force=True)
+            guests = self.resources.guests(include_templates=False)
+        except Exception as e:
+            self.auto_check.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Failed to read cluster resources: {e}")
+            return
+        now = time.time()
+        totals = pool_aggregates(guests)
+
+        self.store.append_history(CPU_SERIES, [(pool, now, t['cpu_cores']) for pool, t in totals.items()])
+        self.store.append_history(MEM_SERIES, [(pool, now, t['mem']) for pool, t in totals.items()])
+        for series in (CPU_SERIES, MEM_SERIES):
+            self.store.prune_history(series, now - HISTORY_DAYS * 86400)
+        since = now - HISTORY_DAYS * 86400
+        cpu_history = self.store.history(CPU_SERIES, since)
+        mem_history = self.store.history(MEM_SERIES, since)
+
+        previous_time, previous = self.previous or (now, {})
+        net_rates = pool_net_rates(guests, previous, now - previous_time)
+        self.previous = (now, {g['vmid']: {key: int(g.get(key, 0) or 0) for key in ("netin", "netout")} for g in guests})
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        for pool, t in sorted(totals.items()):
+            rates = []
+            for key in ("netin", "netout"):
+                rate = net_rates[pool][key]
+                rates.append("" if rate is None else round(rate / 1024**2, 2))
+            values = [
+                t['guests'], t['running'], t['vcpus'], round(t['cpu_cores'], 2),
+                round(t['maxmem'] / 1024**3, 1), round(t['mem'] / 1024**3, 1),
+                round(t['maxdisk'] / 1024**3, 1), *rates,
+            ]
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.table.setItem(row, 0, QTableWidgetItem(pool))
+            for col, value in enumerate(values, start=1):
+                item = QTableWidgetItem()
+                # Numeric display data so sorting by column is numeric, not alphabetical
+                item.setData(Qt.ItemDataRole.DisplayRole, value)
+                self.table.setItem(row, col, item)
+            self.table.setItem(row, 10, QTableWidgetItem(sparkline([v for ts, v in cpu_history.get(pool, [])], 30)))
+            self.table.setItem(row, 11, QTableWidgetItem(sparkline([v for ts, v in mem_history.get(pool, [])], 30)))
+        self.table.setSortingEnabled(True)
+
+        self.summary_label.setText(
+            f"{len(guests)} guest(s) in {len(totals)} pool(s). Updated {QDateTime.currentDateTime().toString()}."
+        )
@@ -2,16 +2,29 @@
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QListWidget, QHBoxLayout, QPushButton,
-    QLineEdit, QLabel, QMessageBox
+    QLineEdit, QLabel, QMessageBox, QListWidgetItem, QTableWidget,
+    QTableWidgetItem, QComboBox, QCheckBox, QAbstractItemView, QSpinBox
 )
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.vmid_allocator import get_vmid_allocator, MAX_VMID
 
 class PoolsTab(QWidget):
     """
     Manage Proxmox Pools: create new pools, list them, add VMs, remove VMs, etc.
+    Members of a pool are loaded when it is selected and joined with the
+    shared /cluster/resources data for status and usage. Membership changes
+    of any size are a single PUT /pools/{poolid}.
     """
     def __init__(self, proxmox):
         super().__init__()
         self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.allocator = get_vmid_allocator(proxmox)
+        # poolid -> members from GET /pools/{poolid}, dropped when the pool changes
+        self.members_cache = {}
         self.setup_ui()
 
     def setup_ui(self):
@@ -28,35 +41,91 @@ class PoolsTab(QWidget):
 
         layout.addLayout(top_layout)
 
+        pools_layout = QHBoxLayout()
         self.pools_list = QListWidget()
-        layout.addWidget(self.pools_list)
+        self.pools_list.setMaximumWidth(300)
+        self.pools_list.currentItemChanged.connect(self.show_members)
+        pools_layout.addWidget(self.pools_list)
+
+        self.members_table = QTableWidget()
+        self.members_table.setColumnCount(7)
+        self.members_table.setHorizontalHeaderLabels(["Type", "ID", "Name", "Node", "Status", "CPU %", "Memory (GB)"])
+        self.members_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.members_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.members_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        pools_layout.addWidget(self.members_table)
+        layout.addLayout(pools_layout)
 
         remove_layout = QHBoxLayout()
         self.remove_pool_btn = QPushButton("Remove Selected Pool")
         self.remove_pool_btn.clicked.connect(self.remove_pool)
         remove_layout.addWidget(self.remove_pool_btn)
+
+        self.remove_members_btn = QPushButton("Remove Selected Members")
+        self.remove_members_btn.clicked.connect(self.remove_selected_members)
+        remove_layout.addWidget(self.remove_members_btn)
+
+        self.move_pool_combo = QComboBox()
+        remove_layout.addWidget(self.move_pool_combo)
+
+        self.move_members_btn = QPushButton("Move Selected Members to Pool")
+        self.move_members_btn.clicked.connect(self.move_selected_members)
+        remove_layout.addWidget(self.move_members_btn)
         layout.addLayout(remove_layout)
 
-        # Minimal form to add a VM to a pool
+        # Minimal form to add VMs/storages to a pool
         add_vm_layout = QHBoxLayout()
         self.pool_input = QLineEdit()
         self.pool_input.setPlaceholderText("Pool name to modify")
         add_vm_layout.addWidget(self.pool_input)
 
         self.vmid_input = QLineEdit()
-        self.vmid_input.setPlaceholderText("VMID to add or remove")
+        self.vmid_input.setPlaceholderText("VMIDs to add or remove (100,101,...)")
         add_vm_layout.addWidget(self.vmid_input)
 
-        self.add_vm_btn = QPushButton("Add VM to Pool")
+        self.storage_input = QLineEdit()
+        self.storage_input.setPlaceholderText("Storages (local-lvm,...)")
+        add_vm_layout.addWidget(self.storage_input)
+
+        self.allow_move_cb = QCheckBox("Move from other pools")
+        add_vm_layout.addWidget(self.allow_move_cb)
+
+        self.add_vm_btn = QPushButton("Add to Pool")
         self.add_vm_btn.clicked.connect(self.add_vm_to_pool)
         add_vm_layout.addWidget(self.add_vm_btn)
 
-        self.remove_vm_btn = QPushButton("Remove VM from Pool")
+        self.remove_vm_btn = QPushButton("Remove from Pool")
         self.remove_vm_btn.clicked.connect(self.remove_vm_from_pool)
         add_vm_layout.addWidget(self.remove_vm_btn)
 
         layout.addLayout(add_vm_layout)
 
+        # VMID ranges used when creating or cloning guests for a pool or team
+        range_layout = QHBoxLayout()
+        range_layout.addWidget(QLabel("VMID range for pool/team:"))
+        self.range_name_combo = QComboBox()
+        self.range_name_combo.setEditable(True)
+        self.range_name_combo.currentTextChanged.connect(self.show_range)
+        range_layout.addWidget(self.range_name_combo)
+
+        self.range_first_spin = QSpinBox()
+        self.range_first_spin.setRange(100, MAX_VMID)
+        range_layout.addWidget(self.range_first_spin)
+        range_layout.addWidget(QLabel("to"))
+        self.range_last_spin = QSpinBox()
+        self.range_last_spin.setRange(100, MAX_VMID)
+        self.range_last_spin.setValue(MAX_VMID)
+        range_layout.addWidget(self.range_last_spin)
+
+        self.save_range_btn = QPushButton("Save Range")
+        self.save_range_btn.clicked.connect(self.save_range)
+        range_layout.addWidget(self.save_range_btn)
+
+        self.remove_range_btn = QPushButton("Remove Range")
+        self.remove_range_btn.clicked.connect(self.remove_range)
+        range_layout.addWidget(self.remove_range_btn)
+        layout.addLayout(range_layout)
+
         self.setLayout(layout)
 
     def refresh_pools(self):
@@ -64,17 +133,124 @@ class PoolsTab(QWidget):
         GET /pools
         """
         self.pools_list.clear()
+        self.move_pool_combo.clear()
+        self.members_cache = {}
+        self.members_table.setRowCount(0)
         try:
             pools = self.proxmox.pools.get()
-            # each pool has a 'poolid', 'comment', 'members'
+            # each pool has a 'poolid' and 'comment'; members come from GET /pools/{poolid}
             for p in pools:
                 pid = p.get('poolid', '')
                 comment = p.get('comment', '')
-                members = p.get('members', [])
-                display = f"{pid} - {comment}, {len(members)} members"
-                self.pools_list.addItem(display)
+                item = QListWidgetItem(f"{pid} - {comment}" if comment else pid)
+                item.setData(Qt.ItemDataRole.UserRole, pid)
+                self.pools_list.addItem(item)
+                self.move_pool_combo.addItem(pid)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to list pools: {e}")
+        self.refresh_ranges()
+
+    def refresh_ranges(self):
+        current = self.range_name_combo.currentText()
+        pools = [self.move_pool_combo.itemText(i) for i in range(self.move_pool_combo.count())]
+        self.range_name_combo.blockSignals(True)
+        self.range_name_combo.clear()
+        self.range_name_combo.addItems(sorted(set(pools) | set(self.allocator.ranges())))
+        self.range_name_combo.setCurrentText(current)
+        self.range_name_combo.blockSignals(False)
+        self.show_range()
+
+    def show_range(self):
+        first, last = self.allocator.ranges().get(self.range_name_combo.currentText().strip(), (100, MAX_VMID))
+        self.range_first_spin.setValue(first)
+        self.range_last_spin.setValue(last)
+
+    def save_range(self):
+        name = self.range_name_combo.currentText().strip()
+        if not name:
+            QMessageBox.warning(self, "Warning", "Enter a pool or team name.")
+            return
+        try:
+            self.allocator.set_range(name, self.range_first_spin.value(), self.range_last_spin.value())
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", str(e))
+            return
+        self.refresh_ranges()
+
+    def remove_range(self):
+        self.allocator.remove_range(self.range_name_combo.currentText().strip())
+        self.refresh_ranges()
+
+    def selected_pool(self):
+        item = self.pools_list.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item else None
+
+    def pool_members(self, poolid):
+        """GET /pools/{poolid}, once per pool until it is changed or refreshed."""
+        if poolid not in self.members_cache:
+            self.members_cache[poolid] = self.proxmox.pools(poolid).get().get('members', [])
+        return self.members_cache[poolid]
+
+    def show_members(self):
+        poolid = self.selected_pool()
+        self.members_table.setRowCount(0)
+        if not poolid:
+            return
+        self.pool_input.setText(poolid)
+        try:
+            members = self.pool_members(poolid)
+            resources = {r.get('id'): r for r in self.resources.refresh()}
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load pool {poolid}: {e}")
+            return
+        for m in members:
+            # Live status and usage from the shared /cluster/resources snapshot
+            r = resources.get(m.get('id'), m)
+            is_storage = m.get('type') == 'storage'
+            row = self.members_table.rowCount()
+            self.members_table.insertRow(row)
+            cells = [
+                m.get('type', ''),
+                m.get('storage', '') if is_storage else str(m.get('vmid', '')),
+                r.get('name', '') if not is_storage else '',
+                r.get('node', ''),
+                r.get('status', ''),
+                "" if is_storage else f"{float(r.get('cpu', 0) or 0) * 100:.1f}",
+                "" if is_storage else f"{int(r.get('mem', 0) or 0) / 1024**3:.1f} / {int(r.get('maxmem', 0) or 0) / 1024**3:.1f}",
+            ]
+            for col, value in enumerate(cells):
+                item = QTableWidgetItem(value)
+                if col == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, m)
+                self.members_table.setItem(row, col, item)
+
+    def update_members(self, poolid, vms=(), storage=(), delete=False, allow_move=False):
+        """
+        PUT /pools/{poolid}
+        fields: vms="100,101,...", storage="local,...", delete=1 to remove them,
+        allow-move=1 to take guests out of the pool they are in now.
+        One request for any number of members.
+        """
+        params = {}
+        if vms:
+            params['vms'] = ",".join(str(v) for v in vms)
+        if storage:
+            params['storage'] = ",".join(storage)
+        if delete:
+            params['delete'] = 1
+        if allow_move:
+            params['allow-move'] = 1
+        self.proxmox.pools(poolid).put(**params)
+        self.members_cache.pop(poolid, None)
+        self.resources.invalidate()
+
+    def selected_members(self):
+        """(vmids, storages) of the selected member rows."""
+        rows = sorted({index.row() for index in self.members_table.selectedIndexes()})
+        members = [self.members_table.item(row, 0).data(Qt.ItemDataRole.UserRole) for row in rows]
+        vms = [m['vmid'] for m in members if m.get('type') != 'storage']
+        storage = [m['storage'] for m in members if m.get('type') == 'storage']
+        return vms, storage
 
     def create_pool(self):
         """
@@ -95,14 +271,11 @@ class PoolsTab(QWidget):
     def remove_pool(self):
         """
         DELETE /pools/{poolid}
-        parse from selected item
         """
-        item = self.pools_list.currentItem()
-        if not item:
+        poolid = self.selected_pool()
+        if not poolid:
             QMessageBox.warning(self, "Warning", "Select a pool.")
             return
-        line = item.text()  # e.g. "my-pool - my test comment, 3 members"
-        poolid = line.split(" - ")[0].strip()
         confirm = QMessageBox.question(
             self,
             "Confirm",
@@ -117,72 +290,87 @@ class PoolsTab(QWidget):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to remove pool: {e}")
 
+    def form_members(self):
+        """(poolid, vmids, storages) from the form, or None (after warning) if invalid."""
+        poolid = self.pool_input.text().strip()
+        vmids = [v.strip() for v in self.vmid_input.text().split(",") if v.strip()]
+        storage = [s.strip() for s in self.storage_input.text().split(",") if s.strip()]
+        if not poolid or not (vmids or storage) or not all(v.isdigit() for v in vmids):
+            QMessageBox.warning(self, "Warning", "Pool name or VMIDs/storages invalid.")
+            return None
+        return poolid, [int(v) for v in vmids], storage
+
     def add_vm_to_pool(self):
         """
-        POST /pools/{poolid}
-        fields: vmid=..., type='qemu'
-        For containers: type='lxc'
+        PUT /pools/{poolid}
+        fields: vms=..., storage=... (VMs and containers alike)
         """
-        poolid = self.pool_input.text().strip()
-        vmid_str = self.vmid_input.text().strip()
-        if not (poolid and vmid_str.isdigit()):
-            QMessageBox.warning(self, "Warning", "Pool name or VMID invalid.")
-            return
-        vmid = int(vmid_str)
-        node = self.find_vm_node(vmid)
-        if not node:
-            QMessageBox.warning(self, "Warning", f"Cannot find node for VM {vmid}")
+        form = self.form_members()
+        if form is None:
             return
-        # We guess it's a QEMU VM. For containers, you'd do type='lxc'
+        poolid, vmids, storage = form
         try:
-            self.proxmox.pools(poolid).post(vmid=vmid, node=node, type='qemu')
-            QMessageBox.information(self, "Added", f"VM {vmid} to pool {poolid}")
-            self.refresh_pools()
+            self.update_members(poolid, vmids, storage, allow_move=self.allow_move_cb.isChecked())
+            QMessageBox.information(self, "Added", f"Added {len(vmids) + len(storage)} member(s) to pool {poolid}")
+            self.show_members()
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to add VM to pool: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to add to pool: {e}")
 
     def remove_vm_from_pool(self):
         """
-        DELETE /pools/{poolid}
-        fields: vmid=..., node=..., type=...
+        PUT /pools/{poolid}
+        fields: vms=..., storage=..., delete=1
         """
-        poolid = self.pool_input.text().strip()
-        vmid_str = self.vmid_input.text().strip()
-        if not (poolid and vmid_str.isdigit()):
-            QMessageBox.warning(self, "Warning", "Pool name or VMID invalid.")
+        form = self.form_members()
+        if form is None:
             return
-        vmid = int(vmid_str)
-        node = self.find_vm_node(vmid)
-        if not node:
-            QMessageBox.warning(self, "Warning", f"Cannot find node for VM {vmid}")
+        poolid, vmids, storage = form
+        self.remove_members(poolid, vmids, storage)
+
+    def remove_selected_members(self):
+        poolid = self.selected_pool()
+        vms, storage = self.selected_members()
+        if not poolid or not (vms or storage):
+            QMessageBox.warning(self, "Warning", "Select a pool and some of its members.")
             return
+        self.remove_members(poolid, vms, storage)
+
+    def remove_members(self, poolid, vmids, storage):
         confirm = QMessageBox.question(
             self,
             "Confirm",
-            f"Remove VM {vmid} from pool {poolid}?",
+            f"Remove {len(vmids) + len(storage)} member(s) from pool {poolid}?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
             try:
-                self.proxmox.pools(poolid).delete(
-                    vmid=vmid, node=node, type='qemu'
-                )
-                QMessageBox.information(self, "Removed", f"Removed VM {vmid} from pool {poolid}")
-                self.refresh_pools()
+                self.update_members(poolid, vmids, storage, delete=True)
+                QMessageBox.information(self, "Removed", f"Removed {len(vmids) + len(storage)} member(s) from pool {poolid}")
+                self.show_members()
             except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to remove VM from pool: {e}")
+                QMessageBox.critical(self, "Error", f"Failed to remove from pool: {e}")
 
-    def find_vm_node(self, vmid):
+    def move_selected_members(self):
         """
-        As done in snapshots or replication code, we find which node has a QEMU VM matching vmid.
+        PUT /pools/{target} with allow-move=1: guests leave their old pool in the
+        same request. Storages can belong to several pools, so they are added to
+        the target and removed from the source.
         """
+        poolid = self.selected_pool()
+        target = self.move_pool_combo.currentText()
+        vms, storage = self.selected_members()
+        if not poolid or not (vms or storage):
+            QMessageBox.warning(self, "Warning", "Select a pool and some of its members.")
+            return
+        if target == poolid:
+            QMessageBox.warning(self, "Warning", "Choose a different target pool.")
+            return
         try:
-            for node_info in self.proxmox.nodes.get():
-                node_name = node_info['node']
-                vms = self.proxmox.nodes(node_name).qemu.get()
-                for vm in vms:
-                    if vm['vmid'] == vmid:
-                        return node_name
-        except:
-            pass
-        return None
+            self.update_members(target, vms, storage, allow_move=True)
+            if storage:
+                self.update_members(poolid, storage=storage, delete=True)
+            self.members_cache.pop(poolid, None)
+            QMessageBox.information(self, "Moved", f"Moved {len(vms) + len(storage)} member(s) to pool {target}")
+            self.show_members()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to move members: {e}")
@@ -0,0 +1,292 @@
+# proxmox_manager/tabs/rebalance_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox,
+    QSpinBox, QCheckBox, QTableWidget, QTableWidgetItem, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor
+
+from tabs.cluster_resources import get_cluster_resources, guest_api
+from tabs.concurrency import run_parallel
+from tabs.migration_plan import (
+    local_storages, ha_allowed_nodes, guest_usage, rrd_demand, plan_rebalance, migration_params
+)
+from tabs.task_queue import QueueJob, TaskQueue
+
+class RebalanceTab(QWidget):
+    """
+    Cluster load balancer. Each running guest's memory and CPU demand is
+    taken at a percentile of its rrddata (or its current usage), then a
+    greedy planner picks the few migrations that most reduce the variance
+    of node utilization, within restricted HA groups and local-disk limits.
+    The plan runs like a drain: concurrent migrations within limits.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.moves = []
+        self.queue = None
+        self.setup_ui()
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_queue)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        demand_layout = QHBoxLayout()
+        demand_layout.addWidget(QLabel("Demand from:"))
+        self.timeframe_combo = QComboBox()
+        self.timeframe_combo.addItems(["current usage", "hour", "day", "week"])
+        self.timeframe_combo.setCurrentText("day")
+        demand_layout.addWidget(self.timeframe_combo)
+
+        demand_layout.addWidget(QLabel("Percentile:"))
+        self.percentile_spin = QSpinBox()
+        self.percentile_spin.setRange(50, 100)
+        self.percentile_spin.setValue(95)
+        demand_layout.addWidget(self.percentile_spin)
+
+        demand_layout.addWidget(QLabel("CPU weight %:"))
+        self.cpu_weight_spin = QSpinBox()
+        self.cpu_weight_spin.setRange(0, 100)
+        self.cpu_weight_spin.setValue(50)
+        demand_layout.addWidget(self.cpu_weight_spin)
+        layout.addLayout(demand_layout)
+
+        plan_layout = QHBoxLayout()
+        plan_layout.addWidget(QLabel("Max moves:"))
+        self.max_moves_spin = QSpinBox()
+        self.max_moves_spin.setRange(1, 200)
+        self.max_moves_spin.setValue(10)
+        plan_layout.addWidget(self.max_moves_spin)
+
+        plan_layout.addWidget(QLabel("Max target memory %:"))
+        self.mem_limit_spin = QSpinBox()
+        self.mem_limit_spin.setRange(10, 100)
+        self.mem_limit_spin.setValue(90)
+        plan_layout.addWidget(self.mem_limit_spin)
+
+        self.local_disks_cb = QCheckBox("Move guests with local disks")
+        plan_layout.addWidget(self.local_disks_cb)
+
+        self.plan_btn = QPushButton("Plan Rebalance")
+        self.plan_btn.clicked.connect(self.build_plan)
+        plan_layout.addWidget(self.plan_btn)
+        layout.addLayout(plan_layout)
+
+        self.node_table = QTableWidget()
+        self.node_table.setColumnCount(5)
+        self.node_table.setHorizontalHeaderLabels(["Node", "Mem % Before", "Mem % After", "CPU % Before", "CPU % After"])
+        self.node_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.node_table.setMaximumHeight(200)
+        layout.addWidget(self.node_table)
+
+        self.move_table = QTableWidget()
+        self.move_table.setColumnCount(7)
+        self.move_table.setHorizontalHeaderLabels(
+            ["VMID", "Name", "Memory (GB)", "CPU (cores)", "From", "To", "Status"]
+        )
+        self.move_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.move_table)
+
+        run_layout = QHBoxLayout()
+        run_layout.addWidget(QLabel("Parallel migrations:"))
+        self.parallel_spin = QSpinBox()
+        self.parallel_spin.setRange(1, 32)
+        self.parallel_spin.setValue(2)
+        run_layout.addWidget(self.parallel_spin)
+
+        run_layout.addWidget(QLabel("Per node:"))
+        self.per_node_spin = QSpinBox()
+        self.per_node_spin.setRange(1, 16)
+        self.per_node_spin.setValue(1)
+        run_layout.addWidget(self.per_node_spin)
+
+        run_layout.addWidget(QLabel("Bandwidth limit (MiB/s, 0 = none):"))
+        self.bwlimit_spin = QSpinBox()
+        self.bwlimit_spin.setRange(0, 100000)
+        run_layout.addWidget(self.bwlimit_spin)
+
+        self.start_btn = QPushButton("Run Plan")
+        self.start_btn.clicked.connect(self.run_plan)
+        run_layout.addWidget(self.start_btn)
+
+        self.cancel_btn = QPushButton("Cancel Pending")
+        self.cancel_btn.clicked.connect(self.cancel_pending)
+        run_layout.addWidget(self.cancel_btn)
+        layout.addLayout(run_layout)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def guest_details(self, guest):
+        """
+        GET .../config and, unless planning on current usage,
+        GET .../rrddata?timeframe=...&cf=AVERAGE
+        """
+        api = guest_api(self.proxmox, guest)
+        config = api.config.get()
+        timeframe = self.timeframe_combo.currentText()
+        points = [] if timeframe == "current usage" else api.rrddata.get(timeframe=timeframe, cf="AVERAGE")
+        return config, points
+
+    def load_guests(self):
+        """Running guests with 'demand', 'local_storages' and 'allowed' filled in."""
+        guests = [dict(g) for g in self.resources.guests(include_templates=False) if g.get('status') == 'running']
+        storages = {}
+        for st in self.resources.storages():
+            storages.setdefault(st['node'], {})[st['storage']] = st
+        allowed = ha_allowed_nodes(self.proxmox.cluster.ha.resources.get(), self.proxmox.cluster.ha.groups.get())
+        pct = self.percentile_spin.value()
+
+        errors = []
+        for guest, result, error in run_parallel(self.guest_details, guests, max_workers=16):
+            config, points = ({}, []) if error is not None else result
+            if error is not None:
+                errors.append(f"{guest['vmid']}: {error}")
+                # Unknown disks: keep the guest where it is.
+                guest['local_storages'] = {"?"}
+            else:
+                guest['local_storages'] = local_storages(config, storages.get(guest['node'], {}))
+            guest['allowed'] = allowed.get(int(guest['vmid']))
+            # "current usage", or no rrddata: plan on what the guest uses now
+            guest['demand'] = rrd_demand(points, pct) or guest_usage(guest)
+        return guests, errors
+
+    def build_plan(self):
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "A rebalance is still running.")
+            return
+        started = time.time()
+        try:
+            self.resources.refresh(force=True)
+            nodes = {n['node']: n for n in self.resources.nodes(online_only=True)}
+            guests, errors = self.load_guests()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to read cluster state: {e}")
+            return
+
+        node_storages = {name: {st['storage'] for st in self.resources.storages(node=name)} for name in nodes}
+        result = plan_rebalance(
+            guests, nodes, node_storages,
+            max_moves=self.max_moves_spin.value(),
+            cpu_weight=self.cpu_weight_spin.value() / 100,
+            mem_limit=self.mem_limit_spin.value() / 100,
+            allow_local_disks=self.local_disks_cb.isChecked(),
+        )
+        self.moves = result['moves']
+        self.show_nodes(result['before'], result['after'])
+        self.show_moves()
+        self.summary_label.setText(
+            f"{len(self.moves)} move(s) planned for {len(guests)} running guest(s) in "
+            f"{time.time() - started:.1f}s; imbalance {result['score_before']:.4f} -> {result['score_after']:.4f}."
+        )
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some guests were left in place:\n" + "\n".join(errors[:20]))
+
+    def show_nodes(self, before, after):
+        self.node_table.setRowCount(0)
+        for node in sorted(before):
+            row = self.node_table.rowCount()
+            self.node_table.insertRow(row)
+            self.node_table.setItem(row, 0, QTableWidgetItem(node))
+            values = [before[node][0], after[node][0], before[node][1], after[node][1]]
+            for col, share in enumerate(values, start=1):
+                # Numeric display data so sorting by column is numeric, not alphabetical
+                item = QTableWidgetItem()
+                item.setData(Qt.ItemDataRole.DisplayRole, round(share * 100, 1))
+                if share > 1.0:
+                    item.setBackground(QColor(255, 200, 200))
+                self.node_table.setItem(row, col, item)
+
+    def show_moves(self):
+        self.move_table.setRowCount(0)
+        for m in self.moves:
+            g = m['guest']
+            row = self.move_table.rowCount()
+            self.move_table.insertRow(row)
+            self.move_table.setItem(row, 0, QTableWidgetItem(str(g['vmid'])))
+            self.move_table.setItem(row, 1, QTableWidgetItem(g.get('name', '')))
+            for col, value in ((2, g['demand'][0] / 1024**3), (3, g['demand'][1])):
+                item = QTableWidgetItem()
+                item.setData(Qt.ItemDataRole.DisplayRole, round(value, 1))
+                self.move_table.setItem(row, col, item)
+            self.move_table.setItem(row, 4, QTableWidgetItem(m['source']))
+            self.move_table.setItem(row, 5, QTableWidgetItem(m['target']))
+            self.move_table.setItem(row, 6, QTableWidgetItem("planned"))
+
+    def run_plan(self):
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "A rebalance is still running.")
+            return
+        # Moves that were queued once are not migrated again from the same plan
+        runnable = [m for m in self.moves if not m.get('job')]
+        if not runnable:
+            QMessageBox.warning(self, "Warning", "Nothing left to migrate; plan a rebalance first.")
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Run {len(runnable)} migration(s)?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        # bwlimit is in KiB/s
+        bwlimit = self.bwlimit_spin.value() * 1024 or None
+        self.queue = TaskQueue(self.proxmox, on_change=self.update_status)
+        self.queue.set_limit("rebalance", self.parallel_spin.value())
+        for m in runnable:
+            # A node both sends and receives migrations; limit both sides.
+            node_keys = [f"node:{m['source']}", f"node:{m['target']}"]
+            for key in node_keys:
+                self.queue.set_limit(key, self.per_node_spin.value())
+            params = migration_params(m['guest'], m['target'], bwlimit)
+            m['job'] = self.queue.add(QueueJob(
+                label=f"{m['guest']['vmid']} -> {m['target']}",
+                start=lambda m=m, params=params: guest_api(self.proxmox, m['guest']).migrate.post(**params),
+                slots=["rebalance"] + node_keys,
+                serial=f"vm:{m['guest']['vmid']}",
+            ))
+        self.queue.poll()
+        self.poll_timer.start(3000)
+
+    def poll_queue(self):
+        if not self.queue:
+            return
+        self.queue.poll()
+        if self.queue.is_idle():
+            self.poll_timer.stop()
+            self.resources.invalidate()
+            counts = self.queue.counts()
+            QMessageBox.information(
+                self, "Rebalance",
+                f"Rebalance finished: {counts.get('ok', 0)} ok, {counts.get('failed', 0)} failed."
+            )
+
+    def cancel_pending(self):
+        if self.queue:
+            self.queue.cancel_pending()
+
+    def update_status(self):
+        for row, m in enumerate(self.moves):
+            job = m.get('job')
+            if not job:
+                continue
+            status = job.state
+            if job.error:
+                status = f"{status}: {job.error}"
+            self.move_table.setItem(row, 6, QTableWidgetItem(status))
+        counts = self.queue.counts()
+        self.summary_label.setText(
+            f"pending {counts.get('pending', 0)}, running {counts.get('running', 0)}, "
+            f"ok {counts.get('ok', 0)}, failed {counts.get('failed', 0)}, cancelled {counts.get('cancelled', 0)}"
+        )
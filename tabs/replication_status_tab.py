@@ -0,0 +1,204 @@
+# proxmox_manager/tabs/replication_status_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QCheckBox,
+    QTableWidget, QTableWidgetItem, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt, QTimer, QDateTime
+from PyQt6.QtGui import QColor
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+from tabs.local_store import get_local_store
+from tabs.sparkline import sparkline
+
+HISTORY_SERIES = "replication_duration"
+# A job whose sync takes this share of its schedule interval is about to
+# start overlapping itself, so it is flagged before the RPO actually slips.
+SLOW_RATIO = 0.8
+
+def schedule_interval(proxmox, schedule):
+    """
+    Seconds between two runs of a calendar event schedule, e.g. '*/15' -> 900.
+    GET /cluster/jobs/schedule-analyze returns the next few run times; the
+    shortest gap between them is the interval the job has to fit into.
+    """
+    runs = proxmox.cluster.jobs("schedule-analyze").get(schedule=schedule, iterations=4)
+    times = sorted(int(r['timestamp']) for r in runs)
+    gaps = [b - a for a, b in zip(times, times[1:]) if b > a]
+    return min(gaps) if gaps else None
+
+def job_flags(job, interval, now):
+    """Problems worth a second look for one replication status entry."""
+    flags = []
+    if int(job.get('fail_count', 0) or 0):
+        flags.append("failing")
+    duration = float(job.get('duration', 0) or 0)
+    last_sync = int(job.get('last_sync', 0) or 0)
+    if interval:
+        if duration >= SLOW_RATIO * interval:
+            flags.append("duration near interval")
+        # A healthy job is at most one interval plus one sync old.
+        if last_sync and now - last_sync > 2 * interval + duration:
+            flags.append("RPO exceeded")
+    if not last_sync:
+        flags.append("never synced")
+    return flags
+
+class ReplicationStatusTab(QWidget):
+    """
+    Live state of every storage replication job.
+    /cluster/replication only holds the job definitions; the sync state lives
+    on the source node (GET /nodes/{node}/replication), so all source nodes
+    are queried concurrently. Sync durations are kept in the local history
+    to show how each job trends over time.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.store = get_local_store()
+        self.intervals = {}
+        self.setup_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh_status)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self.refresh_btn = QPushButton("Refresh Status")
+        self.refresh_btn.clicked.connect(self.refresh_status)
+        top_layout.addWidget(self.refresh_btn)
+
+        self.auto_check = QCheckBox("Auto refresh (60s)")
+        self.auto_check.toggled.connect(self.toggle_auto_refresh)
+        top_layout.addWidget(self.auto_check)
+        layout.addLayout(top_layout)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(12)
+        self.table.setHorizontalHeaderLabels([
+            "Job", "Guest", "Source", "Target", "Schedule", "Last Sync", "Duration (s)",
+            "Fail Count", "Next Sync", "RPO (min)", "Duration Trend", "Flags"
+        ])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def toggle_auto_refresh(self, checked):
+        if checked:
+            self.refresh_status()
+            self.refresh_timer.start(60000)
+        else:
+            self.refresh_timer.stop()
+
+    def source_nodes(self, jobs):
+        """Nodes currently hosting a replicated guest; the job follows its guest on migration."""
+        self.resources.refresh(force=True)
+        nodes = set()
+        for job in jobs:
+            guest = self.resources.find_guest(job['guest'])
+            if guest:
+                nodes.add(guest['node'])
+        online = set(self.resources.node_names(online_only=True))
+        return sorted(nodes & online)
+
+    def refresh_status(self):
+        """
+        GET /cluster/replication              (job definitions)
+        GET /nodes/{node}/replication         (every source node, in parallel)
+        GET /cluster/jobs/schedule-analyze    (once per distinct schedule)
+        """
+        try:
+            jobs = self.proxmox.cluster.replication.get()
+            nodes = self.source_nodes(jobs)
+        except Exception as e:
+            self.auto_check.setChecked(False)
+            QMessageBox.critical(self, "Error", f"Failed to list replication jobs: {e}")
+            return
+
+        errors = []
+        status = []
+        for node, result, error in run_parallel(lambda n: self.proxmox.nodes(n).replication.get(), nodes):
+            if error is not None:
+                errors.append(f"{node}: {error}")
+                continue
+            for job in result:
+                job.setdefault('source', node)
+                status.append(job)
+
+        schedules = {job.get('schedule') or "*/15" for job in status} - set(self.intervals)
+        for schedule, interval, error in run_parallel(lambda s: schedule_interval(self.proxmox, s), schedules):
+            if error is not None:
+                errors.append(f"schedule '{schedule}': {error}")
+                continue
+            self.intervals[schedule] = interval
+
+        self.store.append_history(HISTORY_SERIES, [
+            (job['id'], job['last_sync'], job['duration'])
+            for job in status if job.get('last_sync') and job.get('duration') is not None
+        ])
+        history = self.store.history(HISTORY_SERIES, since=time.time() - 30 * 86400)
+
+        self.show_status(status, history)
+        if errors and not self.auto_check.isChecked():
+            QMessageBox.warning(self, "Warning", "Some status could not be read:\n" + "\n".join(errors[:20]))
+
+    def show_status(self, status, history):
+        now = time.time()
+        flagged = 0
+        worst_rpo = 0
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        for job in sorted(status, key=lambda j: j['id']):
+            schedule = job.get('schedule') or "*/15"
+            last_sync = int(job.get('last_sync', 0) or 0)
+            next_sync = int(job.get('next_sync', 0) or 0)
+            rpo_min = round((now - last_sync) / 60.0, 1) if last_sync else None
+            flags = job_flags(job, self.intervals.get(schedule), now)
+            if flags:
+                flagged += 1
+            if rpo_min is not None:
+                worst_rpo = max(worst_rpo, rpo_min)
+            durations = [value for ts, value in history.get(job['id'], [])]
+
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            cells = [
+                job['id'],
+                str(job.get('guest', '')),
+                job.get('source', ''),
+                job.get('target', ''),
+                schedule,
+                QDateTime.fromSecsSinceEpoch(last_sync).toString() if last_sync else "never",
+                round(float(job.get('duration', 0) or 0), 1),
+                int(job.get('fail_count', 0) or 0),
+                QDateTime.fromSecsSinceEpoch(next_sync).toString() if next_sync else "",
+                rpo_min if rpo_min is not None else "",
+                sparkline(durations),
+                ", ".join(flags),
+            ]
+            for col, value in enumerate(cells):
+                item = QTableWidgetItem()
+                # Numeric display data so sorting by column is numeric, not alphabetical
+                item.setData(Qt.ItemDataRole.DisplayRole, value)
+                if flags:
+                    item.setBackground(QColor(255, 220, 200))
+                if col == 11 and job.get('error'):
+                    item.setToolTip(job['error'])
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+
+        self.summary_label.setText(
+            f"{len(status)} replication job(s), {flagged} flagged, worst RPO {worst_rpo} min. "
+            f"Updated {QDateTime.currentDateTime().toString()}."
+        )
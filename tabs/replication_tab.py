@@ -2,9 +2,25 @@
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QListWidget, QHBoxLayout, QPushButton,
-    QLineEdit, QComboBox, QLabel, QMessageBox
+    QLineEdit, QComboBox, QLabel, QMessageBox, QSpinBox, QAbstractItemView,
+    QListWidgetItem
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.concurrency import run_parallel
+
+def next_job_number(job_ids, vmid):
+    """
+    Lowest free job number for vmid. Replication job IDs are '<vmid>-<n>',
+    e.g. with '100-0' and '100-2' taken the next one is 1.
+    """
+    prefix = f"{vmid}-"
+    used = {int(j[len(prefix):]) for j in job_ids if j.startswith(prefix) and j[len(prefix):].isdigit()}
+    n = 0
+    while n in used:
+        n += 1
+    return n
 
 class ReplicationTab(QWidget):
     """
@@ -13,8 +29,14 @@ class ReplicationTab(QWidget):
     def __init__(self, proxmox):
         super().__init__()
         self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.jobs = []
+        self.pending_triggers = []
         self.setup_ui()
 
+        self.trigger_timer = QTimer(self)
+        self.trigger_timer.timeout.connect(self.trigger_next)
+
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
@@ -29,12 +51,23 @@ class ReplicationTab(QWidget):
         layout.addLayout(top_layout)
 
         self.replication_list = QListWidget()
+        self.replication_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         layout.addWidget(self.replication_list)
 
         remove_layout = QHBoxLayout()
         self.remove_btn = QPushButton("Remove Selected Replication")
         self.remove_btn.clicked.connect(self.remove_replication)
         remove_layout.addWidget(self.remove_btn)
+
+        self.schedule_now_btn = QPushButton("Schedule Now (selected, or all)")
+        self.schedule_now_btn.clicked.connect(self.schedule_now)
+        remove_layout.addWidget(self.schedule_now_btn)
+
+        remove_layout.addWidget(QLabel("Stagger (s):"))
+        self.stagger_spin = QSpinBox()
+        self.stagger_spin.setRange(0, 3600)
+        self.stagger_spin.setValue(60)
+        remove_layout.addWidget(self.stagger_spin)
         layout.addLayout(remove_layout)
 
         # A minimal form to set up replication
@@ -57,8 +90,31 @@ class ReplicationTab(QWidget):
         self.schedule_input.setPlaceholderText("Schedule (e.g. every 1h, crontab...)")
         form_layout.addWidget(self.schedule_input)
 
+        form_layout.addWidget(QLabel("Rate (MB/s, 0 = unlimited):"))
+        self.rate_spin = QSpinBox()
+        self.rate_spin.setRange(0, 100000)
+        form_layout.addWidget(self.rate_spin)
+
         layout.addLayout(form_layout)
 
+        # Bulk creation uses the target, schedule and rate above
+        bulk_layout = QHBoxLayout()
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItems(["VMIDs", "Pool"])
+        bulk_layout.addWidget(self.scope_combo)
+
+        self.scope_input = QLineEdit()
+        self.scope_input.setPlaceholderText("VMIDs (100,101,105) or pool name")
+        bulk_layout.addWidget(self.scope_input)
+
+        self.bulk_create_btn = QPushButton("Bulk Create Replications")
+        self.bulk_create_btn.clicked.connect(self.bulk_create)
+        bulk_layout.addWidget(self.bulk_create_btn)
+        layout.addLayout(bulk_layout)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
         self.setLayout(layout)
 
     def refresh_replications(self):
@@ -68,28 +124,43 @@ class ReplicationTab(QWidget):
         """
         self.replication_list.clear()
         try:
-            result = self.proxmox.cluster.replication.get()
-            # each job has 'id', 'jobid', 'node', 'target', 'schedule', etc.
-            for job in result:
-                jobid = job.get('jobid', '')  # typically "vmid-id" or so
-                node = job.get('node', '')
+            self.jobs = self.proxmox.cluster.replication.get()
+            # each job has 'id' ("<vmid>-<n>"), 'guest', 'source', 'target', 'schedule', 'rate'
+            for job in self.jobs:
+                jobid = job.get('id', '')
+                node = job.get('source', '')
                 target = job.get('target', '')
-                schedule = job.get('schedule', '')
+                schedule = job.get('schedule', '*/15')
                 display = f"{jobid} on {node} -> {target}, schedule={schedule}"
-                self.replication_list.addItem(display)
+                if job.get('rate'):
+                    display += f", rate={job['rate']} MB/s"
+                item = QListWidgetItem(display)
+                item.setData(Qt.ItemDataRole.UserRole, job)
+                self.replication_list.addItem(item)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to list replications: {e}")
 
+    def job_params(self, jobid, target):
+        """POST /cluster/replication parameters for the form's schedule and rate."""
+        params = {
+            "id": jobid,
+            "target": target,
+            "type": "local",
+            "schedule": self.schedule_input.text().strip() or "*/30",  # default every 30min?
+        }
+        if self.rate_spin.value():
+            params["rate"] = self.rate_spin.value()
+        return params
+
     def create_replication(self):
         """
         POST /cluster/replication
         fields:
-          - node (source node)
+          - id ("<vmid>-<n>", the next free job number for the guest)
           - target (target node)
-          - vmid
+          - type='local'
           - schedule
-          - type='local' (usually)
-          - etc.
+          - rate (MB/s, optional)
         """
         vmid_str = self.vmid_input.text().strip()
         if not vmid_str.isdigit():
@@ -97,54 +168,193 @@ class ReplicationTab(QWidget):
             return
         vmid = int(vmid_str)
         target_node = self.target_node_combo.currentText()
-        schedule = self.schedule_input.text().strip() or "*/30"  # default every 30min?
 
-        # We also need a "source node." We'll guess the node from find_vm_node or user input
-        source_node = self.find_vm_node(vmid)
-        if not source_node:
+        try:
+            guest = self.resources.find_guest(vmid)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list guests: {e}")
+            return
+        if not guest:
             QMessageBox.warning(self, "Warning", f"Cannot find node hosting VM {vmid}.")
             return
+        if guest['node'] == target_node:
+            QMessageBox.warning(self, "Warning", f"VM {vmid} already runs on {target_node}.")
+            return
 
         try:
-            data = {
-                "node": source_node,
-                "target": target_node,
-                "vmid": vmid,
-                "schedule": schedule
-            }
-            self.proxmox.cluster.replication.post(**data)
-            QMessageBox.information(self, "Created", "Replication job created.")
+            job_ids = [j['id'] for j in self.proxmox.cluster.replication.get()]
+            jobid = f"{vmid}-{next_job_number(job_ids, vmid)}"
+            self.proxmox.cluster.replication.post(**self.job_params(jobid, target_node))
+            QMessageBox.information(self, "Created", f"Replication job {jobid} created.")
             self.refresh_replications()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to create replication: {e}")
 
-    def remove_replication(self):
+    def bulk_guests(self):
+        """{vmid: guest resource} for the bulk scope, or None (after warning) if it is empty."""
+        value = self.scope_input.text().strip()
+        if not value:
+            QMessageBox.warning(self, "Warning", "Enter VMIDs or a pool name.")
+            return None
+        try:
+            self.resources.refresh(force=True)
+            guests = {int(g['vmid']): g for g in self.resources.guests(include_templates=False)}
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list guests: {e}")
+            return None
+        if self.scope_combo.currentText() == "Pool":
+            selected = {vmid: g for vmid, g in guests.items() if g.get('pool') == value}
+        else:
+            vmids = [v.strip() for v in value.split(",") if v.strip()]
+            if not all(v.isdigit() for v in vmids):
+                QMessageBox.warning(self, "Warning", "VMIDs must be numbers separated by commas.")
+                return None
+            missing = [v for v in vmids if int(v) not in guests]
+            if missing:
+                QMessageBox.warning(self, "Warning", f"Unknown VMIDs: {', '.join(missing)}")
+                return None
+            selected = {int(v): guests[int(v)] for v in vmids}
+        if not selected:
+            QMessageBox.warning(self, "Warning", "No guests match.")
+            return None
+        return selected
+
+    def bulk_create(self):
         """
-        We parse jobid from the selected list item and do:
-        DELETE /cluster/replication/{jobid}
+        POST /cluster/replication for every guest in the scope, with job IDs
+        numbered from the current job list. Guests on the target node and
+        guests already replicating to it are skipped.
         """
-        sel_item = self.replication_list.currentItem()
-        if not sel_item:
-            QMessageBox.warning(self, "Warning", "Select a replication job.")
+        guests = self.bulk_guests()
+        if guests is None:
             return
-        line = sel_item.text()  # e.g. "100-0 on pve -> pve2, schedule=every 1h"
-        jobid = line.split(" ")[0]  # "100-0"
+        target_node = self.target_node_combo.currentText()
         try:
-            self.proxmox.cluster.replication(jobid).delete()
-            QMessageBox.information(self, "Removed", f"Removed replication job {jobid}")
-            self.refresh_replications()
+            existing = self.proxmox.cluster.replication.get()
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to remove replication: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to list replications: {e}")
+            return
+
+        job_ids = [j['id'] for j in existing]
+        replicated = {int(j['guest']) for j in existing if j.get('target') == target_node}
+        skipped = []
+        params = {}
+        for vmid, g in sorted(guests.items()):
+            if g['node'] == target_node:
+                skipped.append(f"{vmid} (runs on {target_node})")
+                continue
+            if vmid in replicated:
+                skipped.append(f"{vmid} (already replicated to {target_node})")
+                continue
+            jobid = f"{vmid}-{next_job_number(job_ids, vmid)}"
+            job_ids.append(jobid)
+            params[jobid] = self.job_params(jobid, target_node)
+
+        if not params:
+            QMessageBox.warning(self, "Warning", "Nothing to create:\n" + "\n".join(skipped[:20]))
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Create {len(params)} replication job(s) to {target_node}? {len(skipped)} guest(s) skipped.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        # Every job lands in the same cluster config file, so only a few writers at once.
+        errors = []
+        results = run_parallel(lambda jobid: self.proxmox.cluster.replication.post(**params[jobid]),
+                               params, max_workers=4)
+        for jobid, _, error in results:
+            if error is not None:
+                errors.append(f"{jobid}: {error}")
+        self.refresh_replications()
+        message = f"Created {len(params) - len(errors)} replication job(s), {len(skipped)} skipped."
+        self.status_label.setText(message)
+        if errors:
+            QMessageBox.warning(self, "Warning", message + "\nFailed:\n" + "\n".join(errors[:20]))
+        else:
+            QMessageBox.information(self, "Created", message)
+
+    def schedule_now(self):
+        """
+        POST /nodes/{source}/replication/{id}/schedule_now for the selected
+        jobs (all listed jobs if none is selected), one every stagger seconds,
+        so seeding many replicas does not saturate the migration network.
+        """
+        items = self.replication_list.selectedItems()
+        if not items:
+            items = [self.replication_list.item(i) for i in range(self.replication_list.count())]
+        jobs = [item.data(Qt.ItemDataRole.UserRole) for item in items]
+        if not jobs:
+            QMessageBox.warning(self, "Warning", "No replication jobs listed - refresh first.")
+            return
 
-    def find_vm_node(self, vmid):
-        """Similar logic to snapshots. We search which node has that VM."""
         try:
-            for node_info in self.proxmox.nodes.get():
-                node_name = node_info['node']
-                qemus = self.proxmox.nodes(node_name).qemu.get()
-                for vm in qemus:
-                    if vm['vmid'] == vmid:
-                        return node_name
-        except:
-            pass
-        return None
+            self.resources.refresh(force=True)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list guests: {e}")
+            return
+        triggers = []
+        for job in jobs:
+            # 'source' can be stale after a migration; the job runs where the guest is.
+            guest = self.resources.find_guest(job['guest'])
+            source = guest['node'] if guest else job.get('source')
+            if source:
+                triggers.append((source, job['id']))
+        self.pending_triggers.extend(t for t in triggers if t not in self.pending_triggers)
+        self.trigger_next()
+        if self.pending_triggers:
+            self.trigger_timer.start(max(1, self.stagger_spin.value()) * 1000)
+
+    def trigger_next(self):
+        if not self.pending_triggers:
+            self.trigger_timer.stop()
+            return
+        # With no stagger, trigger everything at once.
+        batch = self.pending_triggers if self.stagger_spin.value() == 0 else self.pending_triggers[:1]
+        self.pending_triggers = self.pending_triggers[len(batch):]
+        errors = []
+        for source, jobid in batch:
+            try:
+                self.proxmox.nodes(source).replication(jobid).schedule_now.post()
+            except Exception as e:
+                errors.append(f"{jobid} on {source}: {e}")
+        message = f"Scheduled {len(batch) - len(errors)} replication job(s)"
+        if errors:
+            message += f", failed: {'; '.join(errors)}"
+        if self.pending_triggers:
+            message += f"; {len(self.pending_triggers)} waiting, next in {self.stagger_spin.value()}s."
+        else:
+            self.trigger_timer.stop()
+        self.status_label.setText(message)
+
+    def remove_replication(self):
+        """DELETE /cluster/replication/{jobid} for every selected job, a few at a time."""
+        jobids = [item.data(Qt.ItemDataRole.UserRole)['id'] for item in self.replication_list.selectedItems()]
+        if not jobids:
+            QMessageBox.warning(self, "Warning", "Select one or more replication jobs.")
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Remove {len(jobids)} replication job(s)?\n" + ", ".join(jobids[:20]),
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        # Every job lives in the same cluster config file, so only a few writers at once.
+        errors = []
+        for jobid, _, error in run_parallel(lambda jobid: self.proxmox.cluster.replication(jobid).delete(),
+                                            jobids, max_workers=4):
+            if error is not None:
+                errors.append(f"{jobid}: {error}")
+        self.refresh_replications()
+        message = f"Removed {len(jobids) - len(errors)} of {len(jobids)} replication job(s)."
+        self.status_label.setText(message)
+        if errors:
+            QMessageBox.warning(self, "Warning", message + "\nFailed:\n" + "\n".join(errors[:20]))
+        else:
+            QMessageBox.information(self, "Removed", message)
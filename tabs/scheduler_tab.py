@@ -1,111 +1,408 @@
 # proxmox_manager/tabs/scheduler_tab.py
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QListWidget, QPushButton,
-    QHBoxLayout, QInputDialog, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
+    QComboBox, QCheckBox, QListWidget, QTableWidget, QTableWidgetItem,
+    QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import QDateTime
+
+# Keys of a /cluster/backup job that are not vzdump parameters.
+# They are stripped when a job is started by hand via /nodes/{node}/vzdump.
+JOB_ONLY_KEYS = (
+    "id", "type", "schedule", "enabled", "comment", "next-run",
+    "starttime", "dow", "repeat-missed", "node", "digest"
 )
-from PyQt6.QtCore import QTimer, QDateTime
-import time
 
 class SchedulerTab(QWidget):
+    """
+    Manage server-side backup jobs (/cluster/backup).
+    The jobs are scheduled by the cluster itself, so backups keep running
+    while this application is closed.
+    """
     def __init__(self, proxmox):
         super().__init__()
         self.proxmox = proxmox
+        self.jobs = []  # job dicts, in the same order as the table rows
         self.setup_ui()
 
-        # A naive list of (vmid, interval_minutes, next_run_ts)
-        self.jobs = []
-        self.check_timer = QTimer(self)
-        self.check_timer.timeout.connect(self.check_jobs)
-        self.check_timer.start(10_000)  # check every 10 seconds
-
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
-        self.job_list = QListWidget()
-        layout.addWidget(self.job_list)
+        # Job list
+        self.job_table = QTableWidget()
+        self.job_table.setColumnCount(7)
+        self.job_table.setHorizontalHeaderLabels([
+            "ID", "Enabled", "Schedule", "Next Run", "Selection", "Storage", "Comment"
+        ])
+        self.job_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.job_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.job_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.job_table.itemSelectionChanged.connect(self.load_selected_job)
+        layout.addWidget(self.job_table)
 
         btn_layout = QHBoxLayout()
-        self.add_job_btn = QPushButton("Add Scheduled Backup")
-        self.add_job_btn.clicked.connect(self.add_backup_job)
-        btn_layout.addWidget(self.add_job_btn)
+        self.refresh_btn = QPushButton("Refresh Jobs")
+        self.refresh_btn.clicked.connect(self.refresh_jobs)
+        btn_layout.addWidget(self.refresh_btn)
+
+        self.run_now_btn = QPushButton("Run Now")
+        self.run_now_btn.clicked.connect(self.run_job_now)
+        btn_layout.addWidget(self.run_now_btn)
 
         self.remove_job_btn = QPushButton("Remove Job")
         self.remove_job_btn.clicked.connect(self.remove_job)
         btn_layout.addWidget(self.remove_job_btn)
-
         layout.addLayout(btn_layout)
+
+        # Job form (used for both create and edit)
+        schedule_layout = QHBoxLayout()
+        schedule_layout.addWidget(QLabel("Schedule:"))
+        self.schedule_input = QLineEdit()
+        self.schedule_input.setPlaceholderText("Calendar event (e.g. 'sat 02:00', 'daily', '*/6:00')")
+        schedule_layout.addWidget(self.schedule_input)
+
+        self.preview_btn = QPushButton("Preview Schedule")
+        self.preview_btn.clicked.connect(self.preview_schedule)
+        schedule_layout.addWidget(self.preview_btn)
+
+        self.enabled_cb = QCheckBox("Enabled")
+        self.enabled_cb.setChecked(True)
+        schedule_layout.addWidget(self.enabled_cb)
+        layout.addLayout(schedule_layout)
+
+        selection_layout = QHBoxLayout()
+        selection_layout.addWidget(QLabel("Selection:"))
+        self.selection_combo = QComboBox()
+        self.selection_combo.addItems(["VMIDs", "Pool", "All"])
+        self.selection_combo.currentTextChanged.connect(self.update_selection_inputs)
+        selection_layout.addWidget(self.selection_combo)
+
+        self.vmid_input = QLineEdit()
+        self.vmid_input.setPlaceholderText("VMIDs (e.g. 100,101,105) - excluded VMIDs in 'All' mode")
+        selection_layout.addWidget(self.vmid_input)
+
+        self.pool_combo = QComboBox()
+        selection_layout.addWidget(self.pool_combo)
+        layout.addLayout(selection_layout)
+
+        target_layout = QHBoxLayout()
+        target_layout.addWidget(QLabel("Storage:"))
+        self.storage_combo = QComboBox()
+        target_layout.addWidget(self.storage_combo)
+
+        target_layout.addWidget(QLabel("Mode:"))
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["snapshot", "suspend", "stop"])
+        target_layout.addWidget(self.mode_combo)
+
+        target_layout.addWidget(QLabel("Compression:"))
+        self.compress_combo = QComboBox()
+        self.compress_combo.addItems(["zstd", "lzo", "gzip", "0"])
+        target_layout.addWidget(self.compress_combo)
+
+        self.comment_input = QLineEdit()
+        self.comment_input.setPlaceholderText("Comment")
+        target_layout.addWidget(self.comment_input)
+        layout.addLayout(target_layout)
+
+        form_btn_layout = QHBoxLayout()
+        self.create_job_btn = QPushButton("Create Job")
+        self.create_job_btn.clicked.connect(self.create_job)
+        form_btn_layout.addWidget(self.create_job_btn)
+
+        self.update_job_btn = QPushButton("Update Selected Job")
+        self.update_job_btn.clicked.connect(self.update_job)
+        form_btn_layout.addWidget(self.update_job_btn)
+        layout.addLayout(form_btn_layout)
+
+        # Next runs of the schedule typed in the form
+        self.preview_list = QListWidget()
+        self.preview_list.setMaximumHeight(110)
+        layout.addWidget(self.preview_list)
+
+        # Guests that are not covered by any backup job
+        report_layout = QHBoxLayout()
+        report_layout.addWidget(QLabel("Guests not covered by any backup job:"))
+        self.not_backed_up_btn = QPushButton("Refresh Report")
+        self.not_backed_up_btn.clicked.connect(self.refresh_not_backed_up)
+        report_layout.addWidget(self.not_backed_up_btn)
+        layout.addLayout(report_layout)
+
+        self.not_backed_up_list = QListWidget()
+        layout.addWidget(self.not_backed_up_list)
+
         self.setLayout(layout)
 
-    def add_backup_job(self):
-        # This is just an example: user picks VMID and interval in minutes
-        vmid_str, ok = QInputDialog.getText(self, "Schedule Backup", "Enter VMID:")
-        if not ok or not vmid_str.isdigit():
+        self.populate_storage_combo()
+        self.populate_pool_combo()
+        self.update_selection_inputs(self.selection_combo.currentText())
+
+    def populate_storage_combo(self):
+        """GET /storage -> storages that accept backup content."""
+        self.storage_combo.clear()
+        try:
+            for st in self.proxmox.storage.get():
+                if 'backup' in st.get('content', '').split(","):
+                    self.storage_combo.addItem(st['storage'])
+        except Exception as e:
+            print(f"Failed to populate storage combo: {e}")
+
+    def populate_pool_combo(self):
+        """GET /pools"""
+        self.pool_combo.clear()
+        try:
+            for p in self.proxmox.pools.get():
+                self.pool_combo.addItem(p.get('poolid', ''))
+        except Exception as e:
+            print(f"Failed to populate pool combo: {e}")
+
+    def update_selection_inputs(self, selection):
+        self.vmid_input.setEnabled(selection in ("VMIDs", "All"))
+        self.pool_combo.setEnabled(selection == "Pool")
+
+    def refresh_jobs(self):
+        """
+        GET /cluster/backup
+        Each job has 'id', 'schedule', 'enabled', 'storage', 'next-run' and
+        one of 'vmid', 'pool' or 'all'.
+        """
+        self.jobs = []
+        self.job_table.setRowCount(0)
+        try:
+            self.jobs = self.proxmox.cluster.backup.get()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list backup jobs: {e}")
+            return
+
+        for job in self.jobs:
+            row = self.job_table.rowCount()
+            self.job_table.insertRow(row)
+
+            next_run = job.get('next-run')
+            if next_run:
+                next_run_str = QDateTime.fromSecsSinceEpoch(int(next_run)).toString()
+            else:
+                next_run_str = "-"
+
+            self.job_table.setItem(row, 0, QTableWidgetItem(job.get('id', '')))
+            self.job_table.setItem(row, 1, QTableWidgetItem("yes" if int(job.get('enabled', 1)) else "no"))
+            self.job_table.setItem(row, 2, QTableWidgetItem(job.get('schedule', '')))
+            self.job_table.setItem(row, 3, QTableWidgetItem(next_run_str))
+            self.job_table.setItem(row, 4, QTableWidgetItem(self.describe_selection(job)))
+            self.job_table.setItem(row, 5, QTableWidgetItem(job.get('storage', '')))
+            self.job_table.setItem(row, 6, QTableWidgetItem(job.get('comment', '')))
+
+    def describe_selection(self, job):
+        if int(job.get('all', 0)):
+            exclude = job.get('exclude')
+            return f"all (exclude {exclude})" if exclude else "all"
+        if job.get('pool'):
+            return f"pool {job['pool']}"
+        return f"VMIDs {job.get('vmid', '')}"
+
+    def selected_job(self):
+        row = self.job_table.currentRow()
+        if row < 0 or row >= len(self.jobs):
+            return None
+        return self.jobs[row]
+
+    def load_selected_job(self):
+        """Copy the selected job into the form so it can be edited."""
+        job = self.selected_job()
+        if not job:
             return
-        vmid = int(vmid_str)
+        self.schedule_input.setText(job.get('schedule', ''))
+        self.enabled_cb.setChecked(bool(int(job.get('enabled', 1))))
+        if int(job.get('all', 0)):
+            self.selection_combo.setCurrentText("All")
+            self.vmid_input.setText(job.get('exclude', ''))
+        elif job.get('pool'):
+            self.selection_combo.setCurrentText("Pool")
+            self.pool_combo.setCurrentText(job['pool'])
+            self.vmid_input.clear()
+        else:
+            self.selection_combo.setCurrentText("VMIDs")
+            self.vmid_input.setText(str(job.get('vmid', '')))
+        self.storage_combo.setCurrentText(job.get('storage', ''))
+        self.mode_combo.setCurrentText(job.get('mode', 'snapshot'))
+        self.compress_combo.setCurrentText(str(job.get('compress', 'zstd')))
+        self.comment_input.setText(job.get('comment', ''))
+
+    def build_job_params(self):
+        """
+        Build the POST/PUT body for /cluster/backup from the form.
+        Returns None (after warning the user) if the form is incomplete.
+        """
+        schedule = self.schedule_input.text().strip()
+        if not schedule:
+            QMessageBox.warning(self, "Warning", "Please enter a schedule.")
+            return None
+        storage = self.storage_combo.currentText()
+        if not storage:
+            QMessageBox.warning(self, "Warning", "No backup storage selected.")
+            return None
+
+        params = {
+            "schedule": schedule,
+            "enabled": int(self.enabled_cb.isChecked()),
+            "storage": storage,
+            "mode": self.mode_combo.currentText(),
+            "compress": self.compress_combo.currentText(),
+            "comment": self.comment_input.text().strip()
+        }
+
+        selection = self.selection_combo.currentText()
+        vmids = self.parse_vmids(self.vmid_input.text())
+        if vmids is None:
+            QMessageBox.warning(self, "Warning", "VMIDs must be a comma-separated list of numbers.")
+            return None
+        if selection == "VMIDs":
+            if not vmids:
+                QMessageBox.warning(self, "Warning", "Enter at least one VMID.")
+                return None
+            params["vmid"] = ",".join(vmids)
+        elif selection == "Pool":
+            pool = self.pool_combo.currentText()
+            if not pool:
+                QMessageBox.warning(self, "Warning", "Select a pool.")
+                return None
+            params["pool"] = pool
+        else:
+            params["all"] = 1
+            if vmids:
+                params["exclude"] = ",".join(vmids)
+        return params
+
+    def parse_vmids(self, text):
+        """'100, 101,105' -> ['100', '101', '105']; None if anything is not a number."""
+        vmids = [v.strip() for v in text.split(",") if v.strip()]
+        if not all(v.isdigit() for v in vmids):
+            return None
+        return vmids
 
-        minutes_str, ok2 = QInputDialog.getText(self, "Schedule Backup", "Interval in minutes:")
-        if not ok2 or not minutes_str.isdigit():
+    def create_job(self):
+        """POST /cluster/backup"""
+        params = self.build_job_params()
+        if params is None:
             return
-        interval = int(minutes_str)
+        try:
+            self.proxmox.cluster.backup.post(**params)
+            QMessageBox.information(self, "Created", "Backup job created.")
+            self.refresh_jobs()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to create backup job: {e}")
 
-        next_run = time.time() + (interval * 60)
-        self.jobs.append((vmid, interval, next_run))
-        self.refresh_job_list()
+    def update_job(self):
+        """
+        PUT /cluster/backup/{id}
+        Selection keys that no longer apply are removed via 'delete'.
+        """
+        job = self.selected_job()
+        if not job:
+            QMessageBox.warning(self, "Warning", "Select a backup job.")
+            return
+        params = self.build_job_params()
+        if params is None:
+            return
+        stale = [key for key in ("vmid", "pool", "all", "exclude")
+                 if key in job and key not in params]
+        if stale:
+            params["delete"] = ",".join(stale)
+        try:
+            self.proxmox.cluster.backup(job['id']).put(**params)
+            QMessageBox.information(self, "Updated", f"Backup job {job['id']} updated.")
+            self.refresh_jobs()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to update backup job: {e}")
 
     def remove_job(self):
-        sel = self.job_list.currentRow()
-        if sel < 0:
+        """DELETE /cluster/backup/{id}"""
+        job = self.selected_job()
+        if not job:
+            QMessageBox.warning(self, "Warning", "Select a backup job.")
             return
-        del self.jobs[sel]
-        self.refresh_job_list()
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Remove backup job {job['id']}? Existing backups are kept.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm == QMessageBox.StandardButton.Yes:
+            try:
+                self.proxmox.cluster.backup(job['id']).delete()
+                QMessageBox.information(self, "Removed", f"Removed backup job {job['id']}")
+                self.refresh_jobs()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to remove backup job: {e}")
 
-    def refresh_job_list(self):
-        self.job_list.clear()
-        for job in self.jobs:
-            vmid, interval, next_run = job
-            dt = QDateTime.fromSecsSinceEpoch(int(next_run))
-            self.job_list.addItem(f"VM {vmid}, every {interval} min, next run: {dt.toString()}")
-
-    def check_jobs(self):
-        now = time.time()
-        updated = False
-        for idx, job in enumerate(self.jobs):
-            vmid, interval, next_run = job
-            if now >= next_run:
-                # Time to run a backup
-                node = self.find_vm_node(vmid)
-                if node:
-                    try:
-                        self.proxmox.nodes(node).vzdump.post(
-                            vmid=vmid,
-                            storage="local",
-                            mode="snapshot",
-                            compress="lz4"
-                        )
-                        print(f"Scheduled backup triggered for VM {vmid}")
-                    except Exception as e:
-                        print(f"Scheduled backup failed for VM {vmid}: {e}")
-                else:
-                    print(f"Cannot find node for VM {vmid}")
-
-                # Reschedule
-                next_run = now + (interval * 60)
-                self.jobs[idx] = (vmid, interval, next_run)
-                updated = True
-
-        if updated:
-            self.refresh_job_list()
-
-    def find_vm_node(self, vmid):
-        """Used to find which node a VM is on, same approach as in snapshots_tab."""
+    def run_job_now(self):
+        """
+        Start the selected job immediately, the same way the PVE web UI does:
+        POST /nodes/{node}/vzdump with the job's parameters on every node the
+        job applies to. Each node only backs up the guests it hosts.
+        """
+        job = self.selected_job()
+        if not job:
+            QMessageBox.warning(self, "Warning", "Select a backup job.")
+            return
+        try:
+            config = self.proxmox.cluster.backup(job['id']).get()
+            params = {k: v for k, v in config.items() if k not in JOB_ONLY_KEYS}
+            if config.get('node'):
+                nodes = [config['node']]
+            else:
+                nodes = [n['node'] for n in self.proxmox.nodes.get()
+                         if n.get('status', 'online') == 'online']
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load backup job: {e}")
+            return
+
+        started, failed = [], []
+        for node in nodes:
+            try:
+                self.proxmox.nodes(node).vzdump.post(**params)
+                started.append(node)
+            except Exception as e:
+                failed.append(f"{node}: {e}")
+
+        if failed:
+            QMessageBox.warning(
+                self, "Run Now",
+                f"Started on: {', '.join(started) or 'none'}\nFailed:\n" + "\n".join(failed)
+            )
+        else:
+            QMessageBox.information(self, "Run Now", f"Backup job {job['id']} started on {', '.join(started)}")
+
+    def preview_schedule(self):
+        """
+        GET /cluster/jobs/schedule-analyze
+        Shows the next runs of the calendar event typed in the form.
+        """
+        self.preview_list.clear()
+        schedule = self.schedule_input.text().strip()
+        if not schedule:
+            QMessageBox.warning(self, "Warning", "Please enter a schedule.")
+            return
+        try:
+            runs = self.proxmox.cluster.jobs("schedule-analyze").get(schedule=schedule, iterations=5)
+            for run in runs:
+                dt = QDateTime.fromSecsSinceEpoch(int(run['timestamp']))
+                self.preview_list.addItem(dt.toString())
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Invalid schedule '{schedule}': {e}")
+
+    def refresh_not_backed_up(self):
+        """GET /cluster/backup-info/not-backed-up"""
+        self.not_backed_up_list.clear()
         try:
-            for node_info in self.proxmox.nodes.get():
-                node_name = node_info['node']
-                qemus = self.proxmox.nodes(node_name).qemu.get()
-                for vm in qemus:
-                    if vm['vmid'] == vmid:
-                        return node_name
-        except:
-            pass
-        return None
+            guests = self.proxmox.cluster("backup-info")("not-backed-up").get()
+            for g in sorted(guests, key=lambda g: int(g.get('vmid', 0))):
+                self.not_backed_up_list.addItem(
+                    f"{g.get('name', 'N/A')} ({g.get('type', '')} {g.get('vmid', '')})"
+                )
+            if not guests:
+                self.not_backed_up_list.addItem("All guests are covered by a backup job.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load not-backed-up report: {e}")
@@ -0,0 +1,61 @@
+# proxmox_manager/tabs/snapshot_retention.py
+
+def rule_for(name, rules):
+    """The first rule whose prefix matches the snapshot name, or None."""
+    for rule in rules:
+        if name.startswith(rule['prefix']):
+            return rule
+    return None
+
+def plan_snapshot_retention(snapshots, rules, now):
+    """
+    Decide which snapshots to delete.
+
+    snapshots: {vmid: GET .../snapshot result}
+    rules: [{'prefix': 'auto-', 'keep_last': 3, 'max_age_days': 14}, ...]
+           evaluated in order; the first matching prefix owns a snapshot.
+           Per guest and rule the keep_last newest snapshots are always kept;
+           older ones are deleted once they are older than max_age_days
+           (max_age_days 0 deletes everything beyond keep_last).
+    Snapshots that match no rule are never touched.
+
+    Returns a list of (vmid, snapshot dict, rule, action) with action
+    'delete' or 'keep', oldest snapshots first.
+    """
+    plan = []
+    for vmid, snaps in snapshots.items():
+        by_rule = {}
+        for s in snaps:
+            name = s.get('name', '')
+            if name == 'current':
+                continue
+            rule = rule_for(name, rules)
+            if rule is not None:
+                by_rule.setdefault(id(rule), (rule, []))[1].append(s)
+
+        for rule, matched in by_rule.values():
+            matched.sort(key=lambda s: -int(s.get('snaptime', 0) or 0))
+            max_age = rule.get('max_age_days', 0) * 86400
+            for idx, s in enumerate(matched):
+                age = now - int(s.get('snaptime', 0) or 0)
+                if idx < rule.get('keep_last', 0):
+                    action = 'keep'
+                elif max_age and age < max_age:
+                    action = 'keep'
+                else:
+                    action = 'delete'
+                plan.append((vmid, s, rule, action))
+
+    plan.sort(key=lambda p: int(p[1].get('snaptime', 0) or 0))
+    return plan
+
+def deletion_order(plan):
+    """
+    The 'delete' entries grouped per guest, oldest first.
+    Deleting from the oldest end keeps each delete a merge into one child.
+    """
+    order = {}
+    for vmid, s, rule, action in plan:
+        if action == 'delete':
+            order.setdefault(vmid, []).append(s['name'])
+    return order
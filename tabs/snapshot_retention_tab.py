@@ -0,0 +1,276 @@
+# proxmox_manager/tabs/snapshot_retention_tab.py
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSpinBox,
+    QTableWidget, QTableWidgetItem, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import QTimer, QDateTime
+
+from tabs.cluster_resources import get_cluster_resources, guest_api, config_storages
+from tabs.concurrency import run_parallel
+from tabs.local_store import get_local_store
+from tabs.snapshot_retention import plan_snapshot_retention, deletion_order
+from tabs.task_queue import QueueJob, TaskQueue
+
+class SnapshotRetentionTab(QWidget):
+    """
+    Snapshot retention policies, e.g. "keep the last 3 'auto-' snapshots and
+    delete older ones after 14 days". Scans every guest's snapshots
+    concurrently, shows the deletion plan, then deletes one snapshot at a
+    time per guest with a cluster-wide limit on concurrent deletes.
+    """
+    def __init__(self, proxmox):
+        super().__init__()
+        self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.store = get_local_store()
+        self.guests = {}
+        self.plan = []
+        self.queue = None
+        self.storage_before = {}
+        self.storage_names = set()
+        self.setup_ui()
+        self.load_rules()
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_queue)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("Rules (first matching prefix wins, snapshots matching no rule are kept):"))
+        self.rules_table = QTableWidget()
+        self.rules_table.setColumnCount(3)
+        self.rules_table.setHorizontalHeaderLabels(["Name Prefix", "Keep Last", "Delete Older Than (days, 0 = any age)"])
+        self.rules_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.rules_table.setMaximumHeight(150)
+        layout.addWidget(self.rules_table)
+
+        rule_btn_layout = QHBoxLayout()
+        self.add_rule_btn = QPushButton("Add Rule")
+        self.add_rule_btn.clicked.connect(lambda: self.add_rule_row("", 3, 14))
+        rule_btn_layout.addWidget(self.add_rule_btn)
+
+        self.remove_rule_btn = QPushButton("Remove Rule")
+        self.remove_rule_btn.clicked.connect(self.remove_rule_row)
+        rule_btn_layout.addWidget(self.remove_rule_btn)
+
+        self.save_rules_btn = QPushButton("Save Rules")
+        self.save_rules_btn.clicked.connect(self.save_rules)
+        rule_btn_layout.addWidget(self.save_rules_btn)
+        layout.addLayout(rule_btn_layout)
+
+        run_layout = QHBoxLayout()
+        self.scan_btn = QPushButton("Scan All Guests")
+        self.scan_btn.clicked.connect(self.scan)
+        run_layout.addWidget(self.scan_btn)
+
+        run_layout.addWidget(QLabel("Concurrent deletes (cluster):"))
+        self.cluster_limit_spin = QSpinBox()
+        self.cluster_limit_spin.setRange(1, 64)
+        self.cluster_limit_spin.setValue(8)
+        run_layout.addWidget(self.cluster_limit_spin)
+
+        run_layout.addWidget(QLabel("Per node:"))
+        self.per_node_spin = QSpinBox()
+        self.per_node_spin.setRange(1, 64)
+        self.per_node_spin.setValue(3)
+        run_layout.addWidget(self.per_node_spin)
+
+        self.apply_btn = QPushButton("Delete Planned Snapshots")
+        self.apply_btn.clicked.connect(self.apply_plan)
+        run_layout.addWidget(self.apply_btn)
+        layout.addLayout(run_layout)
+
+        self.plan_table = QTableWidget()
+        self.plan_table.setColumnCount(7)
+        self.plan_table.setHorizontalHeaderLabels(["Guest", "Node", "Snapshot", "Date", "Age (days)", "Rule", "Action"])
+        self.plan_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.plan_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.setLayout(layout)
+
+    def add_rule_row(self, prefix, keep_last, max_age_days):
+        row = self.rules_table.rowCount()
+        self.rules_table.insertRow(row)
+        self.rules_table.setItem(row, 0, QTableWidgetItem(prefix))
+        self.rules_table.setItem(row, 1, QTableWidgetItem(str(keep_last)))
+        self.rules_table.setItem(row, 2, QTableWidgetItem(str(max_age_days)))
+
+    def remove_rule_row(self):
+        row = self.rules_table.currentRow()
+        if row >= 0:
+            self.rules_table.removeRow(row)
+
+    def rules(self):
+        """Rules from the table; None (after warning) if a row is invalid."""
+        rules = []
+        for row in range(self.rules_table.rowCount()):
+            cells = [self.rules_table.item(row, c) for c in range(3)]
+            prefix, keep_last, max_age = [(c.text().strip() if c else "") for c in cells]
+            if not prefix or not keep_last.isdigit() or not max_age.isdigit():
+                QMessageBox.warning(self, "Warning", f"Rule {row + 1}: enter a prefix and whole numbers.")
+                return None
+            rules.append({"prefix": prefix, "keep_last": int(keep_last), "max_age_days": int(max_age)})
+        return rules
+
+    def load_rules(self):
+        for rule in self.store.get_setting("snapshot_retention_rules", []):
+            self.add_rule_row(rule['prefix'], rule['keep_last'], rule['max_age_days'])
+
+    def save_rules(self):
+        rules = self.rules()
+        if rules is None:
+            return
+        self.store.put_setting("snapshot_retention_rules", rules)
+        QMessageBox.information(self, "Saved", f"Saved {len(rules)} rule(s).")
+
+    def scan(self):
+        """GET .../snapshot for every guest, in parallel, then build the plan."""
+        rules = self.rules()
+        if rules is None:
+            return
+        if not rules:
+            QMessageBox.warning(self, "Warning", "Add at least one rule.")
+            return
+        try:
+            self.resources.refresh(force=True)
+            self.guests = {int(g['vmid']): g for g in self.resources.guests(include_templates=False)}
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to list guests: {e}")
+            return
+
+        def fetch(vmid):
+            return guest_api(self.proxmox, self.guests[vmid]).snapshot.get()
+
+        snapshots = {}
+        errors = []
+        for vmid, snaps, error in run_parallel(fetch, self.guests, max_workers=16):
+            if error is not None:
+                errors.append(f"{vmid}: {error}")
+                continue
+            snapshots[vmid] = snaps
+
+        now = time.time()
+        self.plan = plan_snapshot_retention(snapshots, rules, now)
+        self.plan_table.setRowCount(0)
+        for vmid, s, rule, action in self.plan:
+            g = self.guests[vmid]
+            row = self.plan_table.rowCount()
+            self.plan_table.insertRow(row)
+            snaptime = int(s.get('snaptime', 0) or 0)
+            date_str = QDateTime.fromSecsSinceEpoch(snaptime).toString() if snaptime else ""
+            self.plan_table.setItem(row, 0, QTableWidgetItem(f"{g.get('name', 'N/A')} ({vmid})"))
+            self.plan_table.setItem(row, 1, QTableWidgetItem(g['node']))
+            self.plan_table.setItem(row, 2, QTableWidgetItem(s['name']))
+            self.plan_table.setItem(row, 3, QTableWidgetItem(date_str))
+            self.plan_table.setItem(row, 4, QTableWidgetItem(f"{(now - snaptime) / 86400:.1f}" if snaptime else ""))
+            self.plan_table.setItem(row, 5, QTableWidgetItem(rule['prefix']))
+            self.plan_table.setItem(row, 6, QTableWidgetItem(action))
+
+        deletes = sum(1 for p in self.plan if p[3] == 'delete')
+        self.summary_label.setText(
+            f"Scanned {len(snapshots)} guest(s): {deletes} snapshot(s) to delete, "
+            f"{len(self.plan) - deletes} kept by rules."
+        )
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some guests could not be read:\n" + "\n".join(errors[:20]))
+
+    def apply_plan(self):
+        """DELETE .../snapshot/{name}, oldest first within each guest."""
+        order = deletion_order(self.plan)
+        if not order:
+            QMessageBox.warning(self, "Warning", "Nothing to delete - scan first.")
+            return
+        if self.queue and not self.queue.is_idle():
+            QMessageBox.warning(self, "Warning", "Deletion is still running.")
+            return
+        total = sum(len(names) for names in order.values())
+        confirm = QMessageBox.question(
+            self,
+            "Confirm",
+            f"Delete {total} snapshot(s) on {len(order)} guest(s)? This cannot be undone.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        self.storage_before = self.storage_usage(order)
+        self.queue = TaskQueue(self.proxmox, on_change=self.update_status)
+        self.queue.set_limit("cluster", self.cluster_limit_spin.value())
+        for vmid, names in order.items():
+            node = self.guests[vmid]['node']
+            self.queue.set_limit(f"node:{node}", self.per_node_spin.value())
+            api = guest_api(self.proxmox, self.guests[vmid])
+            for name in names:
+                self.queue.add(QueueJob(
+                    label=f"{vmid}/{name}",
+                    start=lambda api=api, name=name: api.snapshot(name).delete(),
+                    slots=["cluster", f"node:{node}"],
+                    serial=f"vm:{vmid}",
+                ))
+        self.plan = []
+        self.queue.poll()
+        self.poll_timer.start(2000)
+
+    def storage_usage(self, order):
+        """
+        Used bytes, from /cluster/resources, of the storages holding the disks
+        of the affected guests. PVE does not report the size of single
+        snapshots, so the reclaimed space is the drop in used space on those
+        storages.
+        """
+        def read_config(vmid):
+            return guest_api(self.proxmox, self.guests[vmid]).config.get()
+
+        self.storage_names = set()
+        for vmid, config, error in run_parallel(read_config, order, max_workers=16):
+            if error is None:
+                self.storage_names |= config_storages(config)
+        return self.current_usage()
+
+    def current_usage(self):
+        """{storage key: used bytes}; a shared storage is one key, a local one is per node."""
+        try:
+            self.resources.refresh(force=True)
+        except Exception:
+            return {}
+        usage = {}
+        for st in self.resources.storages():
+            if st['storage'] not in self.storage_names:
+                continue
+            key = st['storage'] if int(st.get('shared', 0)) else f"{st['node']}/{st['storage']}"
+            usage[key] = int(st.get('disk', 0) or 0)
+        return usage
+
+    def poll_queue(self):
+        if not self.queue:
+            return
+        self.queue.poll()
+        if self.queue.is_idle():
+            self.poll_timer.stop()
+            # Storage usage in /cluster/resources lags behind by a status update (~10s).
+            QTimer.singleShot(15000, self.report_reclaimed)
+
+    def report_reclaimed(self):
+        counts = self.queue.counts()
+        message = f"Deleted {counts.get('ok', 0)} snapshot(s), {counts.get('failed', 0)} failed."
+        after = self.current_usage()
+        common = [key for key in self.storage_before if key in after]
+        if common:
+            reclaimed = sum(max(0, self.storage_before[key] - after[key]) for key in common)
+            message += f" Storages report {reclaimed / 1024**3:.2f} GB freed."
+        self.summary_label.setText(message)
+        QMessageBox.information(self, "Snapshot Retention", message)
+
+    def update_status(self):
+        counts = self.queue.counts()
+        self.summary_label.setText(
+            f"Deleting: pending {counts.get('pending', 0)}, running {counts.get('running', 0)}, "
+            f"ok {counts.get('ok', 0)}, failed {counts.get('failed', 0)}"
+        )
@@ -1,28 +1,80 @@
 # proxmox_manager/tabs/snapshots_tab.py
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QHBoxLayout, QPushButton, QListWidget, QMessageBox
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QLineEdit, QHBoxLayout, QPushButton, QLabel, QCheckBox,
+    QComboBox, QSpinBox, QTreeWidget, QTreeWidgetItem, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QMessageBox
+)
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import Qt, QTimer, QDateTime
+
+from tabs.cluster_resources import get_cluster_resources, guest_api, config_storages
+from tabs.concurrency import run_parallel
+from tabs.task_queue import QueueJob, TaskQueue
+
+def snapshot_children(snaps):
+    """
+    Group a GET .../snapshot result by parent name, oldest first.
+    The root snapshots are under None. The 'current' entry (the running
+    state) hangs below the snapshot it was taken from.
+    """
+    children = {}
+    for s in snaps:
+        children.setdefault(s.get('parent'), []).append(s)
+    for group in children.values():
+        group.sort(key=lambda s: (s.get('name') == 'current', int(s.get('snaptime', 0) or 0)))
+    return children
 
 class SnapshotsTab(QWidget):
+    """
+    Snapshot tree for VMs and containers.
+    Guests come from /cluster/resources; a guest's snapshots are only loaded
+    when it is expanded and are cached until a create, rollback or delete on
+    that guest finishes. 'All Snapshots' fetches every guest concurrently.
+
+    Bulk create/delete runs over the selected guests, a pool or a tag: in
+    parallel across guests, one operation at a time per guest (PVE locks a
+    guest during snapshot operations) and capped per node and per storage.
+    """
     def __init__(self, proxmox):
         super().__init__()
         self.proxmox = proxmox
+        self.resources = get_cluster_resources(proxmox)
+        self.guests = {}          # vmid -> guest resource dict
+        self.guest_items = {}     # vmid -> top-level tree item
+        self.snapshot_cache = {}  # vmid -> (snapshot list, children by parent)
         self.setup_ui()
 
+        self.queue = TaskQueue(self.proxmox, on_change=self.update_status)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_queue)
+
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
+        filter_layout = QHBoxLayout()
         self.vm_id_input = QLineEdit()
-        self.vm_id_input.setPlaceholderText("VMID")
-        layout.addWidget(self.vm_id_input)
+        self.vm_id_input.setPlaceholderText("Filter by VMID or name")
+        self.vm_id_input.textChanged.connect(self.filter_guests)
+        filter_layout.addWidget(self.vm_id_input)
 
-        btn_layout = QHBoxLayout()
-        self.list_btn = QPushButton("List Snapshots")
-        self.list_btn.clicked.connect(self.list_snapshots)
-        btn_layout.addWidget(self.list_btn)
+        self.list_btn = QPushButton("Refresh Guests")
+        self.list_btn.clicked.connect(self.refresh_guests)
+        filter_layout.addWidget(self.list_btn)
 
+        self.all_btn = QPushButton("All Snapshots")
+        self.all_btn.clicked.connect(self.load_all_snapshots)
+        filter_layout.addWidget(self.all_btn)
+        layout.addLayout(filter_layout)
+
+        btn_layout = QHBoxLayout()
         self.create_btn = QPushButton("Create Snapshot")
         self.create_btn.clicked.connect(self.create_snapshot)
         btn_layout.addWidget(self.create_btn)
 
+        self.vmstate_cb = QCheckBox("Include RAM (VMs)")
+        btn_layout.addWidget(self.vmstate_cb)
+
         self.restore_btn = QPushButton("Restore Snapshot")
         self.restore_btn.clicked.connect(self.restore_snapshot)
         btn_layout.addWidget(self.restore_btn)
@@ -33,58 +85,229 @@ class SnapshotsTab(QWidget):
 
         layout.addLayout(btn_layout)
 
-        self.snapshot_list = QListWidget()
-        layout.addWidget(self.snapshot_list)
+        # Bulk operations
+        bulk_layout = QHBoxLayout()
+        bulk_layout.addWidget(QLabel("Bulk on:"))
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItems(["Selected guests", "Pool", "Tag"])
+        bulk_layout.addWidget(self.scope_combo)
+
+        self.scope_input = QLineEdit()
+        self.scope_input.setPlaceholderText("Pool or tag name")
+        bulk_layout.addWidget(self.scope_input)
+
+        self.bulk_name_input = QLineEdit()
+        self.bulk_name_input.setPlaceholderText("Snapshot name (e.g. pre-patch-2024-06)")
+        bulk_layout.addWidget(self.bulk_name_input)
+
+        bulk_layout.addWidget(QLabel("Per node:"))
+        self.per_node_spin = QSpinBox()
+        self.per_node_spin.setRange(1, 64)
+        self.per_node_spin.setValue(4)
+        bulk_layout.addWidget(self.per_node_spin)
+
+        bulk_layout.addWidget(QLabel("Per storage:"))
+        self.per_storage_spin = QSpinBox()
+        self.per_storage_spin.setRange(1, 64)
+        self.per_storage_spin.setValue(8)
+        bulk_layout.addWidget(self.per_storage_spin)
+
+        self.bulk_create_btn = QPushButton("Bulk Create")
+        self.bulk_create_btn.clicked.connect(self.bulk_create)
+        bulk_layout.addWidget(self.bulk_create_btn)
+
+        self.bulk_delete_btn = QPushButton("Bulk Delete")
+        self.bulk_delete_btn.clicked.connect(self.bulk_delete)
+        bulk_layout.addWidget(self.bulk_delete_btn)
+        layout.addLayout(bulk_layout)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.snapshot_tree = QTreeWidget()
+        self.snapshot_tree.setColumnCount(4)
+        self.snapshot_tree.setHeaderLabels(["Name", "Date", "RAM", "Description"])
+        self.snapshot_tree.header().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.snapshot_tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.snapshot_tree.itemExpanded.connect(self.on_item_expanded)
+        layout.addWidget(self.snapshot_tree, stretch=2)
+
+        layout.addWidget(QLabel("All snapshots (oldest first):"))
+        self.all_table = QTableWidget()
+        self.all_table.setColumnCount(6)
+        self.all_table.setHorizontalHeaderLabels(["Guest", "Node", "Snapshot", "Date", "Age (days)", "RAM"])
+        self.all_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.all_table, stretch=1)
+
         self.setLayout(layout)
 
-    def list_snapshots(self):
-        self.snapshot_list.clear()
-        vmid_str = self.vm_id_input.text().strip()
-        if not vmid_str.isdigit():
-            QMessageBox.warning(self, "Warning", "Enter a valid VMID.")
-            return
-        vmid = int(vmid_str)
-        node = self.find_vm_node(vmid)
-        if not node:
-            QMessageBox.warning(self, "Warning", f"No node found for VMID {vmid}.")
-            return
+    def refresh_guests(self):
+        """One GET /cluster/resources call for every VM and container."""
+        self.snapshot_tree.clear()
+        self.guests = {}
+        self.guest_items = {}
+        self.snapshot_cache = {}
         try:
-            snaps = self.proxmox.nodes(node).qemu(vmid).snapshot.get()
-            for snap in snaps:
-                self.snapshot_list.addItem(snap['name'])
+            self.resources.refresh(force=True)
+            guests = self.resources.guests()
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to list snapshots: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to list guests: {e}")
+            return
+        for g in sorted(guests, key=lambda g: int(g['vmid'])):
+            vmid = int(g['vmid'])
+            self.guests[vmid] = g
+            item = QTreeWidgetItem([f"{g.get('name', 'N/A')} ({g['type']} {vmid}) on {g['node']}"])
+            item.setData(0, Qt.ItemDataRole.UserRole, (vmid, None))
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            self.snapshot_tree.addTopLevelItem(item)
+            self.guest_items[vmid] = item
+        self.filter_guests()
 
-    def create_snapshot(self):
-        vmid_str = self.vm_id_input.text().strip()
-        if not vmid_str.isdigit():
+    def filter_guests(self):
+        query = self.vm_id_input.text().strip().lower()
+        for item in self.guest_items.values():
+            item.setHidden(bool(query) and query not in item.text(0).lower())
+
+    def fetch_snapshots(self, vmid):
+        """GET /nodes/{node}/{qemu|lxc}/{vmid}/snapshot"""
+        return guest_api(self.proxmox, self.guests[vmid]).snapshot.get()
+
+    def cache_snapshots(self, vmid, snaps):
+        self.snapshot_cache[vmid] = (snaps, snapshot_children(snaps))
+
+    def on_item_expanded(self, item):
+        vmid, snapname = item.data(0, Qt.ItemDataRole.UserRole)
+        if snapname is None and item.childCount() == 0:
+            self.populate_guest(vmid)
+
+    def populate_guest(self, vmid):
+        """Fill a guest's subtree, loading its snapshots only if they are not cached."""
+        item = self.guest_items.get(vmid)
+        if item is None:
             return
-        vmid = int(vmid_str)
-        node = self.find_vm_node(vmid)
-        if not node:
+        if vmid not in self.snapshot_cache:
+            try:
+                self.cache_snapshots(vmid, self.fetch_snapshots(vmid))
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to list snapshots of {vmid}: {e}")
+                return
+        item.takeChildren()
+        _, children = self.snapshot_cache[vmid]
+        self.add_snapshot_items(item, vmid, children, None)
+        item.setChildIndicatorPolicy(
+            QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless
+        )
+
+    def add_snapshot_items(self, parent_item, vmid, children, parent_name):
+        for s in children.get(parent_name, []):
+            name = s.get('name', '')
+            if name == 'current':
+                child = QTreeWidgetItem(["NOW (current state)", "", "", ""])
+                # '' rather than None: not a snapshot, but not a guest item either
+                child.setData(0, Qt.ItemDataRole.UserRole, (vmid, ""))
+            else:
+                snaptime = s.get('snaptime')
+                date_str = QDateTime.fromSecsSinceEpoch(int(snaptime)).toString() if snaptime else ""
+                ram = "yes" if int(s.get('vmstate', 0) or 0) else ""
+                child = QTreeWidgetItem([name, date_str, ram, s.get('description', '').strip()])
+                child.setData(0, Qt.ItemDataRole.UserRole, (vmid, name))
+            parent_item.addChild(child)
+            self.add_snapshot_items(child, vmid, children, name)
+        parent_item.setExpanded(True)
+
+    def invalidate(self, vmid):
+        """Drop the cached snapshots of vmid and reload them if its subtree is open."""
+        self.snapshot_cache.pop(vmid, None)
+        item = self.guest_items.get(vmid)
+        if item is None:
+            return
+        if item.isExpanded():
+            self.populate_guest(vmid)
+        else:
+            item.takeChildren()
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+
+    def load_all_snapshots(self):
+        """Fetch the snapshots of every guest concurrently and list them oldest first."""
+        if not self.guests:
+            self.refresh_guests()
+        missing = [vmid for vmid in self.guests if vmid not in self.snapshot_cache]
+        errors = []
+        for vmid, snaps, error in run_parallel(self.fetch_snapshots, missing, max_workers=16):
+            if error is not None:
+                errors.append(f"{vmid}: {error}")
+                continue
+            self.cache_snapshots(vmid, snaps)
+
+        rows = []
+        for vmid, (snaps, _) in self.snapshot_cache.items():
+            for s in snaps:
+                if s.get('name') != 'current':
+                    rows.append((vmid, s))
+        rows.sort(key=lambda r: int(r[1].get('snaptime', 0) or 0))
+
+        now = time.time()
+        self.all_table.setRowCount(0)
+        for vmid, s in rows:
+            g = self.guests[vmid]
+            row = self.all_table.rowCount()
+            self.all_table.insertRow(row)
+            snaptime = int(s.get('snaptime', 0) or 0)
+            date_str = QDateTime.fromSecsSinceEpoch(snaptime).toString() if snaptime else ""
+            age = f"{(now - snaptime) / 86400:.1f}" if snaptime else ""
+            self.all_table.setItem(row, 0, QTableWidgetItem(f"{g.get('name', 'N/A')} ({vmid})"))
+            self.all_table.setItem(row, 1, QTableWidgetItem(g['node']))
+            self.all_table.setItem(row, 2, QTableWidgetItem(s.get('name', '')))
+            self.all_table.setItem(row, 3, QTableWidgetItem(date_str))
+            self.all_table.setItem(row, 4, QTableWidgetItem(age))
+            self.all_table.setItem(row, 5, QTableWidgetItem("yes" if int(s.get('vmstate', 0) or 0) else ""))
+
+        if errors:
+            QMessageBox.warning(self, "Warning", "Some guests could not be read:\n" + "\n".join(errors[:20]))
+
+    def selected(self):
+        """(vmid, snapshot name or None) of the selected tree item, or (None, None)."""
+        item = self.snapshot_tree.currentItem()
+        if not item:
+            return None, None
+        return item.data(0, Qt.ItemDataRole.UserRole)
+
+    def track(self, vmid, label, start):
+        """Run a snapshot task and refresh the guest's cached snapshots once it is done."""
+        def done(job):
+            self.invalidate(vmid)
+            if job.state == 'failed':
+                QMessageBox.critical(self, "Error", f"{label} failed: {job.error}")
+        self.queue.add(QueueJob(label=label, start=start, serial=f"vm:{vmid}", on_done=done))
+        self.queue.poll()
+        self.poll_timer.start(2000)
+
+    def poll_queue(self):
+        self.queue.poll()
+        if self.queue.is_idle():
+            self.poll_timer.stop()
+
+    def create_snapshot(self):
+        vmid, _ = self.selected()
+        if vmid is None:
+            QMessageBox.warning(self, "Warning", "Select a guest.")
             return
         from PyQt6.QtWidgets import QInputDialog
         snap_name, ok = QInputDialog.getText(self, "Create Snapshot", "Snapshot name:")
         if not ok or not snap_name:
             return
-        try:
-            self.proxmox.nodes(node).qemu(vmid).snapshot.post(snapname=snap_name)
-            QMessageBox.information(self, "Created", f"Created snapshot {snap_name}")
-            self.list_snapshots()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to create snapshot: {e}")
+        params = {"snapname": snap_name}
+        if self.vmstate_cb.isChecked() and self.guests[vmid]['type'] == 'qemu':
+            params["vmstate"] = 1
+        api = guest_api(self.proxmox, self.guests[vmid])
+        self.track(vmid, f"Snapshot {snap_name} of {vmid}", lambda: api.snapshot.post(**params))
+        QMessageBox.information(self, "Created", f"Creating snapshot {snap_name}")
 
     def restore_snapshot(self):
-        item = self.snapshot_list.currentItem()
-        if not item:
+        vmid, snap_name = self.selected()
+        if not snap_name:
             QMessageBox.warning(self, "Warning", "Select a snapshot.")
             return
-        snap_name = item.text()
-        vmid_str = self.vm_id_input.text().strip()
-        vmid = int(vmid_str)
-        node = self.find_vm_node(vmid)
-        if not node:
-            return
         confirm = QMessageBox.question(
             self,
             "Restore",
@@ -92,23 +315,15 @@ class SnapshotsTab(QWidget):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
-            try:
-                self.proxmox.nodes(node).qemu(vmid).snapshot(snap_name).rollback.post()
-                QMessageBox.information(self, "Restored", f"Snapshot {snap_name} restored.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to restore snapshot: {e}")
+            api = guest_api(self.proxmox, self.guests[vmid])
+            self.track(vmid, f"Rollback of {vmid} to {snap_name}", lambda: api.snapshot(snap_name).rollback.post())
+            QMessageBox.information(self, "Restored", f"Restoring snapshot {snap_name}.")
 
     def delete_snapshot(self):
-        item = self.snapshot_list.currentItem()
-        if not item:
+        vmid, snap_name = self.selected()
+        if not snap_name:
             QMessageBox.warning(self, "Warning", "Select a snapshot.")
             return
-        snap_name = item.text()
-        vmid_str = self.vm_id_input.text().strip()
-        vmid = int(vmid_str)
-        node = self.find_vm_node(vmid)
-        if not node:
-            return
         confirm = QMessageBox.question(
             self,
             "Delete",
@@ -116,22 +331,147 @@ class SnapshotsTab(QWidget):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
-            try:
-                self.proxmox.nodes(node).qemu(vmid).snapshot(snap_name).delete()
-                QMessageBox.information(self, "Deleted", f"Snapshot {snap_name} deleted.")
-                self.list_snapshots()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to delete snapshot: {e}")
+            api = guest_api(self.proxmox, self.guests[vmid])
+            self.track(vmid, f"Delete of snapshot {snap_name} on {vmid}", lambda: api.snapshot(snap_name).delete())
+            QMessageBox.information(self, "Deleted", f"Deleting snapshot {snap_name}.")
 
-    def find_vm_node(self, vmid):
-        # naive search for the node that hosts vmid
-        try:
-            for node_info in self.proxmox.nodes.get():
-                node_name = node_info['node']
-                qemus = self.proxmox.nodes(node_name).qemu.get()
-                for vm in qemus:
-                    if vm['vmid'] == vmid:
-                        return node_name
-        except:
+    def update_status(self):
+        counts = self.queue.counts()
+        if counts.get('pending', 0) or counts.get('running', 0):
+            self.status_label.setText(
+                f"Snapshot tasks: pending {counts.get('pending', 0)}, running {counts.get('running', 0)}, "
+                f"ok {counts.get('ok', 0)}, failed {counts.get('failed', 0)}"
+            )
+        elif self.queue.jobs:
+            self.status_label.setText(
+                f"Snapshot tasks finished: ok {counts.get('ok', 0)}, failed {counts.get('failed', 0)}"
+            )
+
+    def bulk_scope(self):
+        """The vmids a bulk operation applies to, or None (after warning) if the scope is empty."""
+        if not self.guests:
+            self.refresh_guests()
+        scope = self.scope_combo.currentText()
+        value = self.scope_input.text().strip()
+        if scope == "Selected guests":
+            vmids = {item.data(0, Qt.ItemDataRole.UserRole)[0] for item in self.snapshot_tree.selectedItems()}
+        elif not value:
+            QMessageBox.warning(self, "Warning", f"Enter a {scope.lower()} name.")
+            return None
+        elif scope == "Pool":
+            vmids = {vmid for vmid, g in self.guests.items() if g.get('pool') == value}
+        else:
+            vmids = {vmid for vmid, g in self.guests.items()
+                     if value in g.get('tags', '').replace(",", ";").split(";")}
+        vmids = sorted(v for v in vmids if not int(self.guests[v].get('template', 0)))
+        if not vmids:
+            QMessageBox.warning(self, "Warning", "No guests match.")
             return None
-        return None
+        return vmids
+
+    def guest_slots(self, vmids):
+        """
+        Limit keys per guest: its node plus every storage holding its disks.
+        GET .../config for all guests in parallel; a guest whose config cannot
+        be read is only limited by its node.
+        """
+        for vmid in vmids:
+            self.queue.set_limit(f"node:{self.guests[vmid]['node']}", self.per_node_spin.value())
+
+        def read_config(vmid):
+            return guest_api(self.proxmox, self.guests[vmid]).config.get()
+
+        shared = {st['storage'] for st in self.resources.storages() if int(st.get('shared', 0) or 0)}
+        slots = {}
+        for vmid, config, error in run_parallel(read_config, vmids, max_workers=16):
+            node = self.guests[vmid]['node']
+            keys = [f"node:{node}"]
+            if error is None:
+                for storage in sorted(config_storages(config)):
+                    # A shared storage is one bottleneck for the whole cluster, a local one is per node.
+                    key = f"storage:{storage}" if storage in shared else f"storage:{node}/{storage}"
+                    self.queue.set_limit(key, self.per_storage_spin.value())
+                    keys.append(key)
+            slots[vmid] = keys
+        return slots
+
+    def bulk_create(self):
+        """POST .../snapshot on every guest in scope."""
+        name = self.bulk_name_input.text().strip()
+        if not name:
+            QMessageBox.warning(self, "Warning", "Enter a snapshot name.")
+            return
+        vmids = self.bulk_scope()
+        if vmids is None:
+            return
+        vmstate = self.vmstate_cb.isChecked()
+        confirm = QMessageBox.question(
+            self,
+            "Bulk Create",
+            f"Create snapshot {name} on {len(vmids)} guest(s)" + (" including RAM" if vmstate else "") + "?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        slots = self.guest_slots(vmids)
+        for vmid in vmids:
+            params = {"snapname": name}
+            if vmstate and self.guests[vmid]['type'] == 'qemu':
+                params["vmstate"] = 1
+            api = guest_api(self.proxmox, self.guests[vmid])
+            self.add_bulk_job(
+                vmid, ("create", vmid, name), lambda api=api, params=params: api.snapshot.post(**params), slots[vmid]
+            )
+        self.queue.poll()
+        self.poll_timer.start(2000)
+
+    def bulk_delete(self):
+        """DELETE .../snapshot/{name} on every guest in scope that has it."""
+        name = self.bulk_name_input.text().strip()
+        if not name:
+            QMessageBox.warning(self, "Warning", "Enter a snapshot name.")
+            return
+        vmids = self.bulk_scope()
+        if vmids is None:
+            return
+
+        missing = [v for v in vmids if v not in self.snapshot_cache]
+        for vmid, snaps, error in run_parallel(self.fetch_snapshots, missing, max_workers=16):
+            if error is None:
+                self.cache_snapshots(vmid, snaps)
+        # Also keep guests whose snapshot is still being created by a queued job.
+        queued = {j.data for j in self.queue.jobs if j.state in ("pending", "running")}
+        targets = [
+            v for v in vmids
+            if ("create", v, name) in queued
+            or any(s.get('name') == name for s in self.snapshot_cache.get(v, ([], {}))[0])
+        ]
+        if not targets:
+            QMessageBox.warning(self, "Warning", f"No guest in scope has a snapshot named {name}.")
+            return
+        confirm = QMessageBox.question(
+            self,
+            "Bulk Delete",
+            f"Delete snapshot {name} on {len(targets)} guest(s)? This cannot be undone.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        slots = self.guest_slots(targets)
+        for vmid in targets:
+            api = guest_api(self.proxmox, self.guests[vmid])
+            self.add_bulk_job(
+                vmid, ("delete", vmid, name), lambda api=api: api.snapshot(name).delete(), slots[vmid]
+            )
+        self.queue.poll()
+        self.poll_timer.start(2000)
+
+    def add_bulk_job(self, vmid, data, start, slots):
+        """data is (action, vmid, snapshot name); jobs of one guest run in order."""
+        action, _, name = data
+        self.queue.add(QueueJob(
+            label=f"{action} snapshot {name} on {vmid}", start=start, slots=slots,
+            serial=f"vm:{vmid}", data=data, on_done=lambda job: self.invalidate(vmid)
+        ))
@@ -0,0 +1,17 @@
+# proxmox_manager/tabs/sparkline.py
+
+BARS = "▁▂▃▄▅▆▇█"
+
+def sparkline(values, width=20):
+    """
+    A one-line text chart of the last width values, e.g. '▁▂▅▇▃'.
+    Small enough to sit in a table cell next to the numbers it summarizes.
+    """
+    values = [v for v in values if v is not None][-width:]
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    if high == low:
+        return BARS[0] * len(values)
+    scale = (len(BARS) - 1) / (high - low)
+    return "".join(BARS[int(round((v - low) * scale))] for v in values)
@@ -0,0 +1,189 @@
+# proxmox_manager/tabs/task_queue.py
+
+import time
+from tabs.concurrency import run_parallel
+
+def upid_node(upid):
+    """'UPID:pve2:000A1B2C:...' -> 'pve2'"""
+    parts = upid.split(":")
+    return parts[1] if len(parts) > 2 else None
+
+def task_succeeded(exitstatus):
+    """vzdump, qmrestore etc. finish with 'OK' or 'WARNINGS: n' when they succeed."""
+    return exitstatus == "OK" or str(exitstatus).startswith("WARNINGS")
+
+def read_task_log(proxmox, upid, start=0, limit=50000):
+    """
+    GET /nodes/{node}/tasks/{upid}/log
+    Returns the log lines from line number start on. PVE only returns 50
+    lines unless a limit is given.
+    """
+    entries = proxmox.nodes(upid_node(upid)).tasks(upid).log.get(start=start, limit=limit)
+    return [e.get('t', '') for e in entries]
+
+class QueueJob:
+    """
+    One unit of work for a TaskQueue.
+
+    start: callable returning the UPID of the task it started, or None if the
+           work already finished synchronously.
+    slots: limit keys this job occupies while running (e.g. 'storage:local').
+    serial: jobs sharing a serial key run one after another, in the order
+            they were added (e.g. 'vm:101' because PVE locks the guest).
+    recover: optional callable returning the UPID of a task that was started
+             even though the start call raised (e.g. a timeout on a busy API).
+    on_done: optional callable, called with the job once it has finished.
+    """
+    def __init__(self, label, start, slots=(), serial=None, recover=None, data=None, on_done=None):
+        self.label = label
+        self.start = start
+        self.slots = list(slots)
+        self.serial = serial
+        self.recover = recover
+        self.data = data
+        self.on_done = on_done
+        self.state = "pending"  # pending, running, ok, failed, cancelled
+        self.upid = None
+        self.error = None
+        self.exitstatus = None
+        self.not_before = 0
+        self.started_at = None
+        self.finished_at = None
+        self.poll_failures = 0
+        self.next_poll = 0
+
+    def finish(self, ok, error=None):
+        self.state = "ok" if ok else "failed"
+        self.error = error
+        self.finished_at = time.time()
+        if self.on_done:
+            self.on_done(self)
+
+class TaskQueue:
+    """
+    Runs QueueJobs with per-key concurrency limits and tracks the PVE tasks
+    they start until they stop.
+
+    The queue does no threading of its own: the owning tab calls poll() from a
+    QTimer (the same way SchedulerTab used to drive its jobs). Every poll checks
+    the running tasks and starts whatever the limits allow, both in parallel.
+    A task is only marked failed from its exitstatus, never because a status
+    request failed, so tracking stays correct while the API is slow.
+    """
+    def __init__(self, proxmox, limits=None, default_limit=None, max_workers=8, on_change=None):
+        self.proxmox = proxmox
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.max_workers = max_workers
+        self.on_change = on_change
+        self.jobs = []
+
+    def add(self, job):
+        self.jobs.append(job)
+        return job
+
+    def set_limit(self, key, limit):
+        self.limits[key] = limit
+
+    def limit_for(self, key):
+        return self.limits.get(key, self.default_limit)
+
+    def running(self):
+        return [j for j in self.jobs if j.state == "running"]
+
+    def pending(self):
+        return [j for j in self.jobs if j.state == "pending"]
+
+    def is_idle(self):
+        return not any(j.state in ("pending", "running") for j in self.jobs)
+
+    def counts(self):
+        counts = {}
+        for j in self.jobs:
+            counts[j.state] = counts.get(j.state, 0) + 1
+        return counts
+
+    def cancel_pending(self):
+        for j in self.pending():
+            j.state = "cancelled"
+        self.changed()
+
+    def changed(self):
+        if self.on_change:
+            self.on_change()
+
+    def poll(self):
+        """Check running tasks, then start pending jobs that fit the limits."""
+        self.poll_running()
+        self.start_ready()
+        self.changed()
+
+    def poll_running(self):
+        now = time.time()
+        due = [j for j in self.running() if j.upid and j.next_poll <= now]
+        for job, status, error in run_parallel(self.task_status, due, self.max_workers):
+            if error is not None:
+                # Back off on this task but keep it running; the next poll retries.
+                job.poll_failures += 1
+                job.next_poll = now + min(30, 2 ** job.poll_failures)
+                continue
+            job.poll_failures = 0
+            if status.get('status') == 'stopped':
+                job.exitstatus = status.get('exitstatus', '')
+                ok = task_succeeded(job.exitstatus)
+                job.finish(ok, None if ok else job.exitstatus)
+
+    def task_status(self, job):
+        """GET /nodes/{node}/tasks/{upid}/status"""
+        return self.proxmox.nodes(upid_node(job.upid)).tasks(job.upid).status.get()
+
+    def start_ready(self):
+        in_use = {}
+        busy_serial = set()
+        for j in self.running():
+            for key in j.slots:
+                in_use[key] = in_use.get(key, 0) + 1
+            if j.serial is not None:
+                busy_serial.add(j.serial)
+
+        now = time.time()
+        ready = []
+        for j in self.pending():
+            if j.serial is not None and j.serial in busy_serial:
+                continue
+            fits = all(
+                self.limit_for(key) is None or in_use.get(key, 0) < self.limit_for(key)
+                for key in j.slots
+            )
+            if j.serial is not None:
+                # Later jobs with the same serial key must wait for this one.
+                busy_serial.add(j.serial)
+            if not fits or j.not_before > now:
+                continue
+            for key in j.slots:
+                in_use[key] = in_use.get(key, 0) + 1
+            j.started_at = now
+            ready.append(j)
+
+        for job, upid, error in run_parallel(self.start_job, ready, self.max_workers):
+            if error is not None:
+                upid = self.recover_job(job)
+                if upid is None:
+                    job.finish(False, str(error))
+                    continue
+            if upid:
+                job.upid = upid
+                job.state = "running"
+            else:
+                job.finish(True)
+
+    def start_job(self, job):
+        return job.start()
+
+    def recover_job(self, job):
+        if not job.recover:
+            return None
+        try:
+            return job.recover()
+        except Exception:
+            return None
@@ -6,6 +6,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from tabs.vmid_allocator import get_vmid_allocator
+
 class VmDetailsTab(QWidget):
     """
     A tab for advanced VM controls: load a specific VM’s config, change CPU/memory,
@@ -103,7 +105,7 @@ class VmDetailsTab(QWidget):
         self.clone_label = QLabel("Clone to new VMID:")
         clone_layout.addWidget(self.clone_label)
         self.clone_vmid_input = QLineEdit()
-        self.clone_vmid_input.setPlaceholderText("e.g. 200")
+        self.clone_vmid_input.setPlaceholderText("New VMID (empty = next free)")
         clone_layout.addWidget(self.clone_vmid_input)
         self.clone_btn = QPushButton("Clone VM")
         self.clone_btn.clicked.connect(self.clone_vm)
@@ -229,7 +231,10 @@ class VmDetailsTab(QWidget):
             self.proxmox.nodes(node).qemu(vmid).migrate.post(
                 target=target_node
             )
-            QMessageBox.information(self, "Migrating", f"VM {vmid} migrating to {target_node}.")
+            QMessageBox.information(
+                self, "Migrating",
+                f"VM {vmid} migrating to {target_node}. Follow its progress on the Migration Monitor page."
+            )
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to migrate VM: {e}")
 
@@ -241,22 +246,34 @@ class VmDetailsTab(QWidget):
         node = self.node_input.text().strip()
         vmid_str = self.vmid_input.text().strip()
         cloneid_str = self.clone_vmid_input.text().strip()
-        if not (vmid_str.isdigit() and cloneid_str.isdigit()):
+        if not vmid_str.isdigit() or (cloneid_str and not cloneid_str.isdigit()):
             return
         vmid = int(vmid_str)
-        new_vmid = int(cloneid_str)
         confirm = QMessageBox.question(
             self,
             "Clone",
-            f"Clone VM {vmid} to new VMID {new_vmid}?",
+            f"Clone VM {vmid} to new VMID {cloneid_str or '(next free)'}?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
-        if confirm == QMessageBox.StandardButton.Yes:
-            try:
-                self.proxmox.nodes(node).qemu(vmid).clone.post(
-                    newid=new_vmid,
-                    name=f"clone-{new_vmid}"
-                )
-                QMessageBox.information(self, "Cloned", f"Cloned VM {vmid} to {new_vmid}.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to clone VM: {e}")
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+
+        allocator = get_vmid_allocator(self.proxmox)
+        new_vmid = None
+        try:
+            if cloneid_str:
+                if not allocator.reserve(int(cloneid_str)):
+                    QMessageBox.warning(self, "Warning", f"VMID {cloneid_str} is already in use.")
+                    return
+                new_vmid = int(cloneid_str)
+            else:
+                new_vmid = allocator.allocate()[0]
+            self.proxmox.nodes(node).qemu(vmid).clone.post(
+                newid=new_vmid,
+                name=f"clone-{new_vmid}"
+            )
+            QMessageBox.information(self, "Cloned", f"Cloned VM {vmid} to {new_vmid}.")
+        except Exception as e:
+            if new_vmid is not None:
+                allocator.release([new_vmid])
+            QMessageBox.critical(self, "Error", f"Failed to clone VM: {e}")
@@ -12,6 +12,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from tabs.vmid_allocator import get_vmid_allocator
+
 class VmTab(QWidget):
     def __init__(self, proxmox):
         super().__init__()
@@ -160,17 +162,19 @@ class VmTab(QWidget):
         vmid = parts[1][:-1]
         node = vm_info.split(" on ")[-1]
 
-        new_id, ok = self.simple_input_dialog("Quick Clone", "Enter new VM ID:")
-        if not ok or not new_id.isdigit():
-            return
+        allocator = get_vmid_allocator(self.proxmox)
+        new_id = None
         try:
+            new_id = allocator.allocate()[0]
             self.proxmox.nodes(node).qemu(vmid).clone.post(
-                newid=int(new_id),
+                newid=new_id,
                 name=f"clone-of-{vmid}"
             )
             QMessageBox.information(self, "Cloned", f"Cloned VM {vmid} to {new_id}")
             self.refresh_vms()
         except Exception as e:
+            if new_id is not None:
+                allocator.release([new_id])
             QMessageBox.critical(self, "Error", f"Failed to clone VM: {e}")
 
     def migrate_vm(self):
@@ -0,0 +1,96 @@
+# proxmox_manager/tabs/vmid_allocator.py
+
+import threading
+
+from tabs.cluster_resources import get_cluster_resources
+from tabs.local_store import get_local_store
+
+# {name: [first, last]} - VMID ranges per pool or team
+RANGES_SETTING = "vmid_ranges"
+MAX_VMID = 999999999
+
+class VmidAllocator:
+    """
+    Hands out VMIDs to concurrent create, clone and restore jobs.
+
+    /cluster/nextid only reports the lowest free ID, so two jobs asking at
+    the same time get the same answer. The allocator seeds from the IDs in
+    /cluster/resources and keeps its own set of reserved IDs, so every ID it
+    returns is unique until released. A reservation ends when the job fails
+    (release) or once the guest shows up in /cluster/resources.
+    Named ranges (per pool or team) are kept in the local store.
+    """
+    def __init__(self, proxmox, resources, store=None):
+        self.proxmox = proxmox
+        self.resources = resources
+        self.store = store or get_local_store()
+        self.reserved = set()
+        self.lock = threading.Lock()
+
+    def ranges(self):
+        return {name: tuple(r) for name, r in self.store.get_setting(RANGES_SETTING, {}).items()}
+
+    def set_range(self, name, first, last):
+        if not 100 <= first <= last <= MAX_VMID:
+            raise ValueError(f"Invalid VMID range {first}-{last}")
+        ranges = self.store.get_setting(RANGES_SETTING, {})
+        ranges[name] = [first, last]
+        self.store.put_setting(RANGES_SETTING, ranges)
+
+    def remove_range(self, name):
+        ranges = self.store.get_setting(RANGES_SETTING, {})
+        ranges.pop(name, None)
+        self.store.put_setting(RANGES_SETTING, ranges)
+
+    def used(self):
+        """IDs in use in the cluster; reservations that reached the cluster are dropped."""
+        used = self.resources.used_vmids()
+        self.reserved -= used
+        return used
+
+    def allocate(self, count=1, scope=None):
+        """
+        Reserve count free VMIDs, lowest first: within the named range if
+        scope has one, otherwise counting up from /cluster/nextid.
+        Raises ValueError when the range has too few free IDs.
+        """
+        ranges = self.ranges()
+        if scope in ranges:
+            first, last = ranges[scope]
+        else:
+            first, last = int(self.proxmox.cluster.nextid.get()), MAX_VMID
+        self.resources.refresh(force=True)
+        with self.lock:
+            taken = self.used() | self.reserved
+            vmids = []
+            vmid = first
+            while len(vmids) < count:
+                if vmid > last:
+                    raise ValueError(f"VMID range {scope} ({first}-{last}) has fewer than {count} free IDs")
+                if vmid not in taken:
+                    vmids.append(vmid)
+                vmid += 1
+            self.reserved.update(vmids)
+        return vmids
+
+    def reserve(self, vmid):
+        """Reserve one specific VMID; False if it is in use or already reserved."""
+        with self.lock:
+            if vmid in self.used() or vmid in self.reserved:
+                return False
+            self.reserved.add(vmid)
+            return True
+
+    def release(self, vmids):
+        """Give back reservations of jobs that failed or were never run."""
+        with self.lock:
+            self.reserved -= set(vmids)
+
+_shared = {}
+
+def get_vmid_allocator(proxmox):
+    """Return the VmidAllocator shared by every tab using this connection."""
+    key = id(proxmox)
+    if key not in _shared:
+        _shared[key] = VmidAllocator(proxmox, get_cluster_resources(proxmox))
+    return _shared[key]
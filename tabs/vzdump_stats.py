@@ -0,0 +1,167 @@
+# proxmox_manager/tabs/vzdump_stats.py
+"""
+Parse vzdump task logs into per-guest backup records and aggregate them.
+
+A vzdump task log contains one block per guest, e.g.
+
+    INFO: Starting Backup of VM 100 (qemu)
+    INFO: Backup started at 2024-05-01 01:00:02
+    ...
+    INFO: transferred 32.00 GiB in 171 seconds (191.6 MiB/s)
+    INFO: archive file size: 6.12GB
+    INFO: Finished Backup of VM 100 (00:02:55)
+
+Containers report 'Total bytes written: ...' instead of 'transferred', and
+PBS backups have no archive file size (the data is deduplicated).
+"""
+
+import re
+import time
+import statistics
+
+STORAGE_RE = re.compile(r"--storage\s+(\S+)")
+START_RE = re.compile(r"Starting Backup of VM (\d+) \((qemu|lxc)\)")
+STARTED_AT_RE = re.compile(r"Backup started at (\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)")
+TRANSFERRED_RE = re.compile(r"transferred ([\d.]+ ?[KMGTP]?i?B) in (\d+) seconds")
+WRITTEN_RE = re.compile(r"Total bytes written: (\d+)")
+ARCHIVE_SIZE_RE = re.compile(r"archive file size: ([\d.]+ ?[KMGTP]?i?B)")
+REUSED_RE = re.compile(r"reused ([\d.]+ ?[KMGTP]?i?B)")
+FINISHED_RE = re.compile(r"Finished Backup of VM (\d+) \((\d+):(\d\d):(\d\d)\)")
+FAILED_RE = re.compile(r"Backup of VM (\d+) failed")
+
+UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4, "P": 1024**5}
+
+def parse_size(text):
+    """'6.12GB', '32.00 GiB', '512 MiB' -> bytes. PVE prints binary units either way."""
+    m = re.match(r"([\d.]+)\s*([KMGTP]?)i?B", text.strip())
+    if not m:
+        return 0
+    return int(float(m.group(1)) * UNITS[m.group(2)])
+
+def parse_vzdump_log(lines, node=None, upid=None):
+    """
+    Turn the lines of one vzdump task log into a list of per-guest records:
+    {'vmid', 'type', 'node', 'storage', 'upid', 'starttime', 'ok', 'duration',
+     'transferred', 'archive_size', 'reused', 'rate', 'ratio'}
+    Sizes are bytes, duration is seconds and rate is bytes/second.
+    starttime is epoch seconds (node local time), or None if not logged.
+    """
+    storage = None
+    records = []
+    current = None
+
+    def close(rec):
+        if rec['transferred'] and rec['duration']:
+            rec['rate'] = rec['transferred'] / rec['duration']
+        if rec['transferred'] and rec['archive_size']:
+            rec['ratio'] = rec['transferred'] / rec['archive_size']
+        records.append(rec)
+
+    for line in lines:
+        if storage is None:
+            m = STORAGE_RE.search(line)
+            if m:
+                storage = m.group(1)
+
+        m = START_RE.search(line)
+        if m:
+            if current:
+                close(current)
+            current = {
+                "vmid": int(m.group(1)), "type": m.group(2), "node": node,
+                "storage": storage, "upid": upid, "starttime": None, "ok": False,
+                "duration": 0, "transferred": 0, "archive_size": 0, "reused": 0,
+                "rate": 0.0, "ratio": 0.0,
+            }
+            continue
+        if not current:
+            continue
+
+        m = STARTED_AT_RE.search(line)
+        if m:
+            current['starttime'] = time.mktime(time.strptime(m.group(1), "%Y-%m-%d %H:%M:%S"))
+            continue
+        m = TRANSFERRED_RE.search(line)
+        if m:
+            current['transferred'] = parse_size(m.group(1))
+            current['duration'] = current['duration'] or int(m.group(2))
+            continue
+        m = WRITTEN_RE.search(line)
+        if m:
+            current['transferred'] = int(m.group(1))
+            continue
+        m = ARCHIVE_SIZE_RE.search(line)
+        if m:
+            current['archive_size'] = parse_size(m.group(1))
+            continue
+        m = REUSED_RE.search(line)
+        if m:
+            current['reused'] = parse_size(m.group(1))
+            continue
+        m = FINISHED_RE.search(line)
+        if m and int(m.group(1)) == current['vmid']:
+            h, mi, s = int(m.group(2)), int(m.group(3)), int(m.group(4))
+            current['duration'] = h * 3600 + mi * 60 + s
+            current['ok'] = True
+            close(current)
+            current = None
+            continue
+        m = FAILED_RE.search(line)
+        if m and int(m.group(1)) == current['vmid']:
+            close(current)
+            current = None
+
+    if current:
+        close(current)
+    return records
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    idx = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+def trend(points):
+    """
+    Least-squares slope of (day, y) points, or 0.0 if they span less than a
+    day (a slope within one backup window is noise, not a trend).
+    """
+    if len(points) < 2:
+        return 0.0
+    xs, ys = zip(*points)
+    if max(xs) - min(xs) < 1.0:
+        return 0.0
+    return statistics.linear_regression(xs, ys).slope
+
+def aggregate(records, key):
+    """
+    Group successful records by key ('vmid', 'node' or 'storage') and return
+    one summary dict per group, slowest total backup time first.
+    Records with a 'starttime' feed the duration trend, in seconds per day.
+    """
+    groups = {}
+    for r in records:
+        if r['ok']:
+            groups.setdefault(r.get(key), []).append(r)
+
+    summaries = []
+    for group, recs in groups.items():
+        durations = [r['duration'] for r in recs]
+        rates = [r['rate'] for r in recs if r['rate']]
+        ratios = [r['ratio'] for r in recs if r['ratio']]
+        sizes = [r['archive_size'] or r['transferred'] for r in recs]
+        points = [(r['starttime'] / 86400.0, r['duration']) for r in recs if r.get('starttime')]
+        summaries.append({
+            "key": group,
+            "count": len(recs),
+            "total_duration": sum(durations),
+            "avg_duration": statistics.fmean(durations),
+            "p95_duration": percentile(durations, 95),
+            "avg_rate": statistics.fmean(rates) if rates else 0.0,
+            "total_size": sum(sizes),
+            "avg_size": statistics.fmean(sizes),
+            "avg_ratio": statistics.fmean(ratios) if ratios else 0.0,
+            "duration_trend": trend(points),
+        })
+    summaries.sort(key=lambda s: -s['total_duration'])
+    return summaries